@@ -0,0 +1,75 @@
+"""
+Benchmark how long the assignment MIPs take to build, without solving them.
+
+Run from the repository root:
+    python -m benchmarks.bench_assignment_build --limit 250 [--matrix] [--aggregate]
+"""
+import argparse
+import time
+
+import config
+from main import prepare_model_input
+from src.business_model.mip.assignment_model.assignement_demands import (
+    build_assign_orders_model,
+)
+from src.business_model.mip.assignment_model.order_assignment import (
+    build_assign_orders_with_truck_model,
+    build_assignment_orders_to_trucks_days_model,
+)
+from src.serializer.serialize_problem_data import load_problem_data
+
+BUILDERS = [
+    build_assign_orders_with_truck_model,
+    build_assignment_orders_to_trucks_days_model,
+    build_assign_orders_model,
+]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", default=config.ORDER_LARGE_CSV)
+    parser.add_argument("--time-format", default=config.ORDER_LARGE_DATE)
+    parser.add_argument(
+        "--limit", type=int, default=250, help="number of demands to build the models for"
+    )
+    parser.add_argument(
+        "--matrix", action="store_true", help="also build with the sparse-matrix builders"
+    )
+    parser.add_argument(
+        "--aggregate", action="store_true", help="collapse identical demands into classes"
+    )
+    args = parser.parse_args()
+
+    problem_data = load_problem_data(
+        order_csv=args.orders,
+        truck_csv=config.TRUCK_CSV,
+        distance_csv=config.DISTANCE_CSV,
+        time_format=args.time_format,
+        cache_dir=config.INPUT_CACHE_DIR,
+    )
+    demands = problem_data.demands[: args.limit]
+    model_input = prepare_model_input(demands, problem_data.trucks, problem_data.distances)
+    print(
+        f"demands: {len(demands)}, trucks: {len(problem_data.trucks)}, "
+        f"horizon: {len(model_input.planning_horizon)} days"
+    )
+
+    for build in BUILDERS:
+        for use_matrix_api in [False, True] if args.matrix else [False]:
+            start = time.perf_counter()
+            built = build(
+                model_input, use_matrix_api=use_matrix_api, aggregate_demands=args.aggregate
+            )
+            built.model.update()
+            elapsed = time.perf_counter() - start
+            m = built.model
+            label = build.__name__ + (" [matrix]" if use_matrix_api else "")
+            print(
+                f"{label:55s}{elapsed:8.2f} s  "
+                f"vars={m.NumVars} constrs={m.NumConstrs} nz={m.NumNZs}"
+            )
+            m.dispose()
+
+
+if __name__ == "__main__":
+    main()
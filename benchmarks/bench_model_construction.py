@@ -0,0 +1,67 @@
+"""
+Benchmark building the Demand objects of the order file: the model
+constructor per row, model_construct per row and the bulk build_models.
+
+Run from the repository root:
+    python -m benchmarks.bench_model_construction
+"""
+import argparse
+import statistics
+import time
+
+import pandas as pd
+
+import config
+from src.data_model.bulk import build_models
+from src.data_model.demand import Demand
+from src.serializer.serialize_order import (
+    get_factory_list_from_order_data_frame,
+    normalize_order_data_frame,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", default=config.ORDER_LARGE_CSV)
+    parser.add_argument("--time-format", default=config.ORDER_LARGE_DATE)
+    parser.add_argument("--repeat", type=int, default=40)
+    args = parser.parse_args()
+
+    order_df = pd.read_csv(args.orders, encoding="cp1252")
+    factories = get_factory_list_from_order_data_frame(order_df)
+    normalized = normalize_order_data_frame(order_df, args.time_format)
+    columns = dict(
+        demand_id=normalized["item_id"].tolist(),
+        weight=normalized["weight"].tolist(),
+        size_area=normalized["area_size"].tolist(),
+        destination=[factories[name] for name in normalized["destination"].tolist()],
+        available_time=normalized["available_time"].dt.to_pydatetime().tolist(),
+        due_time=normalized["due_time"].dt.to_pydatetime().tolist(),
+    )
+    names = list(columns)
+
+    builders = {
+        "constructor": lambda: [Demand(**dict(zip(names, row))) for row in zip(*columns.values())],
+        "model_construct": lambda: [
+            Demand.model_construct(**dict(zip(names, row))) for row in zip(*columns.values())
+        ],
+        "build_models": lambda: build_models(Demand, **columns),
+    }
+    # interleave the builders so that machine noise hits all of them alike
+    timings = {name: [] for name in builders}
+    for _ in range(args.repeat):
+        for name, build in builders.items():
+            start = time.perf_counter()
+            build()
+            timings[name].append(time.perf_counter() - start)
+
+    print(f"demands: {len(normalized)}")
+    for name, values in timings.items():
+        print(
+            f"{name:16s}: median {statistics.median(values) * 1000:6.1f} ms, "
+            f"best {min(values) * 1000:6.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark the columnar order ingestion against the previous row-by-row parser.
+
+Run from the repository root:
+    python -m benchmarks.bench_order_ingestion
+"""
+import argparse
+import time
+from datetime import datetime
+
+import pandas as pd
+
+import config
+from src.data_model.demand import Demand
+from src.serializer.serialize_distance import serialize_distance_from_data_frame
+from src.serializer.serialize_order import (
+    create_factory_from_order_data,
+    get_demands_from_order_data_frame,
+    get_factory_list_from_order_data_frame,
+    map_danger_type,
+)
+from src.utils.distance_cal import compute_travel_days
+
+
+def legacy_get_demands(order_data: pd.DataFrame, distances, time_format: str) -> list[Demand]:
+    """Row-by-row reference implementation (iterrows + strptime per row)."""
+    factories = get_factory_list_from_order_data_frame(order_data)
+    demands = []
+    for _, row in order_data.iterrows():
+        try:
+            available = datetime.strptime(row["Available_Time"], time_format)
+            due = datetime.strptime(row["Deadline"], time_format)
+        except (ValueError, TypeError):
+            continue
+        if due < available:
+            continue
+        map_danger_type(row["Danger_Type"])
+        destination = factories.get(row["Destination"])
+        demands.append(
+            Demand(
+                demand_id=row["Item_ID"],
+                weight=row["Weight"] / 1000000,
+                size_area=row["Area"] / 10000,
+                destination=destination,
+                available_time=available,
+                due_time=due,
+                travel_days=compute_travel_days(
+                    distance_km=distances[config.DEPOT_ID][destination.id],
+                    truck_speed_kmph=40,
+                    unload_hours=1.0,
+                    load_hours=0.0,
+                ),
+            )
+        )
+    return demands
+
+
+def best_of(repeat: int, fn, *args):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", default=config.ORDER_LARGE_CSV)
+    parser.add_argument("--time-format", default=config.ORDER_LARGE_DATE)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    order_df = pd.read_csv(args.orders, encoding="cp1252")
+    factories = create_factory_from_order_data(order_df)
+    distances = serialize_distance_from_data_frame(
+        pd.read_csv(config.DISTANCE_CSV), factories
+    )
+
+    legacy_time, legacy = best_of(
+        args.repeat, legacy_get_demands, order_df, distances, args.time_format
+    )
+    columnar_time, columnar = best_of(
+        args.repeat, get_demands_from_order_data_frame, order_df, distances, args.time_format
+    )
+
+    assert [d.model_dump() for d in legacy] == [d.model_dump() for d in columnar]
+
+    print(f"rows: {len(order_df)}, demands: {len(columnar)}")
+    print(f"row-by-row : {legacy_time * 1000:8.1f} ms")
+    print(f"columnar   : {columnar_time * 1000:8.1f} ms")
+    print(f"speed-up   : {legacy_time / columnar_time:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,4 +7,5 @@ ORDER_SMALL_DATE = "%Y-%m-%d %H:%M:%S"
 ORDER_LARGE_DATE = "%d/%m/%Y %H.%M"
 ORDER_LARGE_CSV = 'data/order_large_main.csv'
 TRUCK_CSV = 'data/truck.csv'
-DISTANCE_CSV = 'data/distance.csv'
\ No newline at end of file
+DISTANCE_CSV = 'data/distance.csv'
+INPUT_CACHE_DIR = '.cache/inputs'
\ No newline at end of file
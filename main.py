@@ -5,24 +5,13 @@ from src.business_model.mip.assignment_model.order_assignment import (
     assignment_orders_to_trucks_days,
 )
 from src.business_model.mip.capacited_vrp_model.capacited_vrp_model import solve_cvrp_gg
-from src.serializer.serialize_order import (
-    create_factory_from_order_data,
-    get_factory_list_from_order_data_frame,
-    get_demands_from_order_data_frame,
-)
-
 from src.serializer.serialize_cvrp_input import create_cvrp_input_from_assignment_output
-from src.serializer.serializer_truck import create_truck_from_data_frame
-from src.serializer.serialize_distance import serialize_distance_from_data_frame
+from src.serializer.serialize_problem_data import load_problem_data
 from src.data_model.assignment_Input import AssignmentInput
 from src.data_model.assignment_output import AssignmentOutput
-from src.data_model.factory import Factory
-from src.data_model.demand import Demand
-from src.data_model.truck import Truck
 from src.data_model.cvrp_input import CVRPInput
 from src.data_model.cvrp_output import CVRPOutput
-from src.data_model.order import Order
-from typing import Dict
+from src.data_model.problem_data import ProblemData
 import pandas as pd
 
 order_data = config.ORDER_LARGE_CSV
@@ -35,34 +24,14 @@ time_format = (
 run_first: bool = False
 
 
-def read_and_serialize_order() -> list[Order]:
-    return pd.read_csv(order_data, encoding="cp1252")
-
-
-def read_and_serialize_demand(distances: dict[tuple[int, int], float]) -> list[Demand]:
-    order_df = pd.read_csv(order_data, encoding="cp1252")
-    demands = get_demands_from_order_data_frame(order_df, distances, time_format)
-    return demands
-
-
-def read_and_serialize_truck() -> list[Truck]:
-    truck_df = pd.read_csv(config.TRUCK_CSV)
-    trucks: Dict[str, Truck] = create_truck_from_data_frame(truck_df)
-    return list(trucks.values())
-
-
-def read_and_serialize_factory() -> dict[str, Factory]:
-    order_df = pd.read_csv(order_data, encoding="cp1252")
-    factories: Dict[str, Factory] = get_factory_list_from_order_data_frame(order_df)
-    return factories
-
-
-def read_and_serialize_distance(
-    factories: dict[int, Factory],
-) -> dict[tuple[int, int], float]:
-    distance_df = pd.read_csv(config.DISTANCE_CSV)
-    distances = serialize_distance_from_data_frame(distance_df, factories)
-    return distances
+def read_problem_data() -> ProblemData:
+    return load_problem_data(
+        order_csv=order_data,
+        truck_csv=config.TRUCK_CSV,
+        distance_csv=config.DISTANCE_CSV,
+        time_format=time_format,
+        cache_dir=config.INPUT_CACHE_DIR,
+    )
 
 
 def prepare_model_input(demands, trucks, distances) -> AssignmentInput:
@@ -84,12 +53,10 @@ def prepare_model_input(demands, trucks, distances) -> AssignmentInput:
 
 
 def run_assignment():
-    orders = read_and_serialize_order()
-    factories = create_factory_from_order_data(orders)
-    distances = read_and_serialize_distance(factories)
-
-    demands = read_and_serialize_demand(distances)
-    trucks = read_and_serialize_truck()
+    problem_data = read_problem_data()
+    distances = problem_data.distances
+    demands = problem_data.demands
+    trucks = problem_data.trucks
 
     print(f"Total demands: {len(demands)}")
     print(f"Total trucks: {len(trucks)}")
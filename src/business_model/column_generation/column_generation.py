@@ -0,0 +1,347 @@
+"""
+Column generation for a day's routes.
+
+The restricted master is a set-partitioning LP over routes: every customer
+is covered once, and a truck type runs at most as many routes as it has
+trucks. Routes cost what total_cost charges for them: the type's cost per
+km plus the handling cost of every stop. New routes come from pricing, an
+elementary shortest path problem with resource constraints per truck type
+(weight, area, stops up to config.MAX_STOPS and, optionally, time windows)
+solved by labelling with dominance. A heuristic pass with relaxed dominance
+runs first; the exact pass then proves that no route has a negative
+reduced cost, which makes the LP value a lower bound.
+
+The integer master is finally solved over the generated routes (price and
+branch: no branching on new columns), so optimality is proven when its
+objective meets the LP bound.
+"""
+import gurobipy as gp
+from gurobipy import GRB
+from src.data_model.cvrp_input import CVRPInput
+from src.data_model.cvrp_output import CVRPOutput
+from src.data_model.route_table import RouteTable
+from src.data_model.truck_type import TruckType, group_truck_types
+from src.serializer.serialize_cvrp_output import (
+    create_cvrp_output_from_routes,
+    routes_from_cvrp_output,
+)
+from src.business_model.mip.capacited_vrp_model.arc_set import sparse_arcs
+from src.business_model.heuristic.savings_routing import assign_routes, savings_routes
+from src.business_model.solve_control import SolveControl
+from typing import List, Tuple
+import bisect
+import numpy as np
+import config
+
+EPS = 1e-6
+
+
+class _Label:
+    """A path from the depot: reduced cost so far and the resources it uses."""
+
+    __slots__ = ("node", "cost", "weight", "area", "time", "visited", "path", "alive")
+
+    def __init__(self, node, cost, weight, area, time, visited, path):
+        self.node = node
+        self.cost = cost
+        self.weight = weight
+        self.area = area
+        self.time = time
+        self.visited = visited
+        self.path = path
+        self.alive = True
+
+    def dominates(self, other: "_Label", elementary: bool) -> bool:
+        return (
+            self.cost <= other.cost + 1e-9
+            and self.weight <= other.weight + 1e-9
+            and self.area <= other.area + 1e-9
+            and self.time <= other.time + 1e-9
+            and len(self.path) <= len(other.path)
+            and (not elementary or self.visited & ~other.visited == 0)
+        )
+
+
+class RoutePricing:
+    """
+    Pricing for one truck type. successors are the arcs sparse_arcs keeps
+    for the type; with time_windows a customer must be reached by its due
+    minute, waiting until its ready minute, after the service time at every
+    earlier stop and travel at the type's speed.
+    """
+
+    def __init__(
+        self,
+        table: RouteTable,
+        truck_type: TruckType,
+        successors: List[List[int]],
+        time_windows: bool = False,
+    ):
+        self.table = table
+        self.truck_type = truck_type
+        self.successors = successors
+        self.time_windows = time_windows
+        self.capacity = truck_type.capacity
+        inner_size = truck_type.inner_size
+        self.inner_size = np.inf if inner_size is None or np.isnan(inner_size) else inner_size
+        self.arc_cost = (truck_type.cost * table.distance).tolist()
+        self.travel_time = (table.distance / truck_type.speed * 60).tolist()
+        self.weight = table.weight.tolist()
+        self.area = table.area.tolist()
+        self.ready = table.ready.tolist()
+        self.due = table.due.tolist()
+
+    def route_cost(self, route: List[int]) -> float:
+        return (
+            self.truck_type.cost * self.table.route_distance(route)
+            + config.SERVICE_COST_PER_STOP * len(route)
+        )
+
+    def is_feasible(self, route: List[int]) -> bool:
+        if (
+            len(route) > self.table.max_stops
+            or sum(self.weight[p] for p in route) > self.capacity + 1e-9
+            or sum(self.area[p] for p in route) > self.inner_size + 1e-9
+        ):
+            return False
+        if self.time_windows:
+            t, i = 0.0, 0
+            for j in route:
+                t = max(self.ready[j], t + (config.SERVICE_TIME_PER_STOP if i else 0.0) + self.travel_time[i][j])
+                if t > self.due[j] + 1e-9:
+                    return False
+                i = j
+        return True
+
+    def _insert(self, bucket: List[_Label], costs: List[float], label: _Label, elementary: bool) -> bool:
+        """
+        Add label to the node's bucket, kept in cost order, unless a label
+        there dominates it; labels it dominates are dropped. Only cheaper
+        labels can dominate it and only dearer ones can be dominated.
+        """
+        at = bisect.bisect_right(costs, label.cost + 1e-9)
+        for other in bucket[:at]:
+            if other.dominates(label, elementary):
+                return False
+        at = bisect.bisect_left(costs, label.cost - 1e-9)
+        kept = []
+        for other in bucket[at:]:
+            if label.dominates(other, elementary):
+                other.alive = False
+            else:
+                kept.append(other)
+        if len(kept) < len(bucket) - at:
+            bucket[at:] = kept
+            costs[at:] = [other.cost for other in kept]
+        at = bisect.bisect_right(costs, label.cost)
+        bucket.insert(at, label)
+        costs.insert(at, label.cost)
+        return True
+
+    def price(
+        self, duals: List[float], fleet_dual: float, elementary: bool = True, max_columns: int = 20
+    ) -> List[Tuple[float, List[int]]]:
+        """
+        Up to max_columns routes of negative reduced cost, most negative
+        first. duals are the customers' cover duals by node position.
+        elementary=False relaxes dominance to ignore the visited sets, which
+        is fast but may miss routes.
+
+        Labels are also dropped when no completion can reach a negative
+        reduced cost: a further stop j changes it by at least its cheapest
+        arc in plus service cost minus its dual, so at most the best such
+        gains of the stops left can be won back.
+        """
+        service_cost = config.SERVICE_COST_PER_STOP
+        service_time = config.SERVICE_TIME_PER_STOP
+        max_stops = self.table.max_stops
+        arc_cost = np.asarray(self.arc_cost)
+        np.fill_diagonal(arc_cost, np.inf)
+        cheapest_in = arc_cost[:, 1:].min(axis=0)
+        gains = np.sort(np.maximum(np.asarray(duals[1:]) - service_cost - cheapest_in, 0.0))[::-1]
+        # best gain of up to s more stops
+        best_gain = np.concatenate([[0.0], np.cumsum(gains[:max_stops])]).tolist()
+        best_gain += [best_gain[-1]] * (max_stops + 1 - len(best_gain))
+        buckets: List[List[_Label]] = [[] for _ in range(len(self.table))]
+        bucket_costs: List[List[float]] = [[] for _ in range(len(self.table))]
+        frontier = [_Label(0, 0.0, 0.0, 0.0, 0.0, 0, ())]
+        found: List[Tuple[float, List[int]]] = []
+        for _ in range(self.table.max_stops):
+            extended: List[_Label] = []
+            for label in frontier:
+                if not label.alive:
+                    continue
+                i = label.node
+                for j in self.successors[i]:
+                    if j == 0 or label.visited >> j & 1:
+                        continue
+                    weight = label.weight + self.weight[j]
+                    area = label.area + self.area[j]
+                    if weight > self.capacity + 1e-9 or area > self.inner_size + 1e-9:
+                        continue
+                    time = 0.0
+                    if self.time_windows:
+                        time = max(
+                            self.ready[j],
+                            label.time + (service_time if i else 0.0) + self.travel_time[i][j],
+                        )
+                        if time > self.due[j] + 1e-9:
+                            continue
+                    cost = label.cost + self.arc_cost[i][j] + service_cost - duals[j]
+                    if cost - best_gain[max_stops - len(label.path) - 1] - fleet_dual >= -EPS:
+                        continue
+                    new = _Label(
+                        j, cost, weight, area, time, label.visited | 1 << j, label.path + (j,)
+                    )
+                    if self._insert(buckets[j], bucket_costs[j], new, elementary):
+                        extended.append(new)
+            for label in extended:
+                if not label.alive:
+                    continue
+                reduced_cost = label.cost + self.arc_cost[label.node][0] - fleet_dual
+                if reduced_cost < -EPS:
+                    found.append((reduced_cost, list(label.path)))
+            frontier = extended
+        found.sort(key=lambda column: column[0])
+        return found[:max_columns]
+
+
+def solve_cvrp_column_generation(
+    input_data: CVRPInput,
+    time_windows: bool = False,
+    solve_control: SolveControl | None = None,
+    max_iterations: int = 500,
+    max_columns: int = 20,
+    start: CVRPOutput | None = None,
+) -> CVRPOutput:
+    """
+    Route the day by column generation. Every pricing round adds up to
+    max_columns routes per truck type; after max_iterations rounds the LP
+    value is no longer a proven bound and best_bound is None. The integer
+    master runs under solve_control. is_success is False when the routes
+    cannot cover every customer with the fleet.
+
+    The routes of start, the output of any solver, join the first columns,
+    and the integer master starts from them when they are all feasible.
+    """
+    table = RouteTable.from_cvrp_input(input_data)
+    customers = list(table.customers)
+    truck_types = group_truck_types(table.trucks)
+    truck_position = {t.id: p for p, t in enumerate(table.trucks)}
+
+    pricing = []
+    for truck_type, arcs in zip(
+        truck_types,
+        sparse_arcs(table.distance, table.weight, [t.capacity for t in truck_types]),
+    ):
+        successors: List[List[int]] = [[] for _ in range(len(table))]
+        for i, j in arcs:
+            if np.isfinite(table.distance[i, j]):
+                successors[i].append(j)
+        pricing.append(RoutePricing(table, truck_type, successors, time_windows))
+
+    m = gp.Model("CVRP_CG")
+    m.Params.OutputFlag = 0
+    cover = {p: m.addConstr(gp.LinExpr() == 1, name=f"cover_{p}") for p in customers}
+    fleet = [
+        m.addConstr(gp.LinExpr() <= t.count, name=f"fleet_{k}") for k, t in enumerate(truck_types)
+    ]
+    # leaving a customer uncovered costs more than any route could
+    uncovered_cost = 10.0 * sum(
+        pricing[k].route_cost([p]) for k in range(len(truck_types)) for p in customers
+        if np.isfinite(table.distance[0, p]) and np.isfinite(table.distance[p, 0])
+    ) + 1.0
+    uncovered = {
+        p: m.addVar(obj=uncovered_cost, column=gp.Column([1.0], [cover[p]]), name=f"uncovered_{p}")
+        for p in customers
+    }
+
+    columns: List[Tuple[int, List[int]]] = []
+    route_vars: List[gp.Var] = []
+    seen = set()
+
+    def add_column(k: int, route: List[int]) -> None:
+        if (k, tuple(route)) in seen:
+            return
+        seen.add((k, tuple(route)))
+        columns.append((k, route))
+        route_vars.append(
+            m.addVar(
+                obj=pricing[k].route_cost(route),
+                column=gp.Column([1.0] * (len(route) + 1), [cover[p] for p in route] + [fleet[k]]),
+                name=f"route_{len(columns) - 1}",
+            )
+        )
+
+    # start from every single-stop route, the savings routes and those of start
+    type_of = {t.id: k for k, truck_type in enumerate(truck_types) for t in truck_type.trucks}
+    start_columns = []
+    if start is not None:
+        for truck, route in routes_from_cvrp_output(table, start):
+            k = type_of[table.trucks[truck].id]
+            if pricing[k].is_feasible(route):
+                add_column(k, route)
+                start_columns.append(columns.index((k, route)))
+    start_routes = [[p] for p in customers]
+    start_routes += [route for _, route in assign_routes(table, savings_routes(table))[0]]
+    for k in range(len(truck_types)):
+        for route in start_routes:
+            if pricing[k].is_feasible(route) and np.isfinite(pricing[k].route_cost(route)):
+                add_column(k, route)
+
+    lp_bound = None
+    rounds = 0
+    while rounds < max_iterations:
+        rounds += 1
+        m.optimize()
+        if m.Status != GRB.OPTIMAL:
+            break
+        duals = [0.0] * len(table)
+        for p, constr in cover.items():
+            duals[p] = constr.Pi
+        added = 0
+        for elementary in (False, True):
+            for k in range(len(truck_types)):
+                for _, route in pricing[k].price(duals, fleet[k].Pi, elementary, max_columns):
+                    before = len(columns)
+                    add_column(k, route)
+                    added += len(columns) - before
+            if added:
+                break
+        if not added:
+            # exact pricing found no improving route: the LP is optimal
+            lp_bound = m.ObjVal
+            break
+    print(f"Column generation: {len(columns)} routes after {rounds} rounds, LP bound {lp_bound}")
+
+    for var in route_vars + list(uncovered.values()):
+        var.VType = GRB.BINARY
+    if start is not None and len(start_columns) == len(start.routes):
+        for c, var in enumerate(route_vars):
+            var.Start = 1.0 if c in start_columns else 0.0
+        for var in uncovered.values():
+            var.Start = 0.0
+    solved = (solve_control or SolveControl()).optimize(m)
+    if not solved.has_solution:
+        print("No feasible solution found for CVRP")
+        return CVRPOutput(routes=[], total_cost=0.0, is_success=False)
+
+    chosen = [columns[c] for c, x in enumerate(m.getAttr(GRB.Attr.X, route_vars)) if x > 0.5]
+    routes = []
+    for k, truck_type in enumerate(truck_types):
+        type_routes = [route for kk, route in chosen if kk == k]
+        routes += [
+            (truck_position[truck.id], route) for truck, route in zip(truck_type.trucks, type_routes)
+        ]
+    is_success = all(var.X < 0.5 for var in uncovered.values())
+
+    mip_gap = None
+    if lp_bound is not None and is_success:
+        mip_gap = max(0.0, solved.objective_value - lp_bound) / abs(solved.objective_value)
+    return create_cvrp_output_from_routes(
+        table,
+        sorted(routes),
+        best_bound=lp_bound if is_success else None,
+        mip_gap=mip_gap,
+        is_success=is_success,
+    )
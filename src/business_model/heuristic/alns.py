@@ -0,0 +1,341 @@
+"""
+Adaptive large neighbourhood search for a day's routes.
+
+Every iteration removes a number of customers with a destroy operator
+(random, worst-cost, related/Shaw or route removal) and reinserts them
+with a repair operator (greedy or regret-k insertion). Operators are drawn
+by roulette with weights that adapt to their recent success; a new
+solution is accepted by simulated annealing, with a temperature that
+cools over the wall-clock budget. The best solution is polished by the
+local search at the end.
+
+Customers that fit nowhere stay unrouted at a penalty, so the search also
+works from and through incomplete plans.
+"""
+from src.data_model.cvrp_input import CVRPInput
+from src.data_model.cvrp_output import ConvergencePoint, CVRPOutput
+from src.data_model.route_table import RouteTable
+from src.serializer.serialize_cvrp_output import Route, create_cvrp_output_from_routes
+from src.business_model.heuristic.savings_routing import assign_routes, savings_routes
+from src.business_model.heuristic.local_search import improve_routes
+from typing import Callable, List
+import numpy as np
+import math
+import time
+import config
+
+# operator scores: new best, improved current, accepted worse
+SCORES = (33.0, 9.0, 13.0)
+REACTION = 0.1
+SEGMENT = 100
+EPS = 1e-9
+
+
+class _Plan:
+    """Routes per truck position plus the customers left out."""
+
+    def __init__(self, table: RouteTable, routes: List[List[int]], unrouted: List[int]):
+        self.table = table
+        self.routes = routes
+        self.unrouted = unrouted
+
+    def copy(self) -> "_Plan":
+        return _Plan(self.table, [list(r) for r in self.routes], list(self.unrouted))
+
+    def route_cost(self, r: int) -> float:
+        return self.table.cost[r] * self.table.route_distance(self.routes[r])
+
+
+class ALNS:
+    """
+    The search state of one day: the plan, operator weights and the trace.
+    Costs are total_cost terms, travel plus handling, with penalty for every
+    unrouted customer.
+    """
+
+    def __init__(self, table: RouteTable, seed: int = 0):
+        self.table = table
+        self.rng = np.random.default_rng(seed)
+        self.d = table.distance.tolist()
+        self.weight = table.weight.tolist()
+        self.area = table.area.tolist()
+        finite = table.distance[np.isfinite(table.distance)]
+        max_distance = float(finite.max()) if finite.size else 1.0
+        self.penalty = 10.0 * max(table.cost.max(initial=1.0), 1.0) * max(2 * max_distance, 1.0)
+
+        # Shaw relatedness: normalised distance plus normalised weight difference
+        weight = table.weight
+        spread = max(float(weight.max(initial=0.0) - weight.min(initial=0.0)), EPS)
+        distance = np.where(np.isfinite(table.distance), table.distance, max_distance)
+        self.relatedness = (distance + distance.T) / (2 * max(max_distance, EPS)) + np.abs(
+            weight[:, None] - weight[None, :]
+        ) / spread
+
+        self.destroy_ops: List[Callable[[_Plan, int], List[int]]] = [
+            self.random_removal,
+            self.worst_removal,
+            self.related_removal,
+            self.route_removal,
+        ]
+        self.repair_ops: List[Callable[[_Plan, List[int]], None]] = [
+            lambda plan, removed: self.insert(plan, removed, 1),
+            lambda plan, removed: self.insert(plan, removed, 2),
+            lambda plan, removed: self.insert(plan, removed, 3),
+        ]
+
+    def cost(self, plan: _Plan) -> float:
+        served = len(self.table) - 1 - len(plan.unrouted)
+        return (
+            sum(plan.route_cost(r) for r in range(len(plan.routes)))
+            + config.SERVICE_COST_PER_STOP * served
+            + self.penalty * len(plan.unrouted)
+        )
+
+    # destroy operators: remove q customers from the routes and return them
+
+    def _remove(self, plan: _Plan, customers: List[int]) -> List[int]:
+        drop = set(customers)
+        for r, route in enumerate(plan.routes):
+            if drop.intersection(route):
+                plan.routes[r] = [p for p in route if p not in drop]
+        return list(customers)
+
+    def _routed(self, plan: _Plan) -> List[int]:
+        return [p for route in plan.routes for p in route]
+
+    def random_removal(self, plan: _Plan, q: int) -> List[int]:
+        routed = self._routed(plan)
+        chosen = self.rng.choice(len(routed), size=min(q, len(routed)), replace=False)
+        return self._remove(plan, [routed[k] for k in chosen.tolist()])
+
+    def worst_removal(self, plan: _Plan, q: int, power: float = 3.0) -> List[int]:
+        """Customers whose removal saves most, with some randomisation."""
+        d = self.d
+        removed = []
+        for _ in range(q):
+            gains = []
+            for r, route in enumerate(plan.routes):
+                path = [0] + route + [0]
+                for k in range(1, len(path) - 1):
+                    a, p, b = path[k - 1], path[k], path[k + 1]
+                    gains.append((self.table.cost[r] * (d[a][p] + d[p][b] - d[a][b]), p))
+            if not gains:
+                break
+            gains.sort(reverse=True)
+            _, p = gains[int(self.rng.random() ** power * len(gains))]
+            removed += self._remove(plan, [p])
+        return removed
+
+    def related_removal(self, plan: _Plan, q: int, power: float = 6.0) -> List[int]:
+        """A random customer and the customers most related to the ones removed so far."""
+        routed = self._routed(plan)
+        if not routed:
+            return []
+        removed = [routed[int(self.rng.integers(len(routed)))]]
+        rest = [p for p in routed if p != removed[0]]
+        while len(removed) < q and rest:
+            anchor = removed[int(self.rng.integers(len(removed)))]
+            rest.sort(key=lambda p: self.relatedness[anchor, p])
+            removed.append(rest.pop(int(self.rng.random() ** power * len(rest))))
+        return self._remove(plan, removed)
+
+    def route_removal(self, plan: _Plan, q: int) -> List[int]:
+        """Whole routes, in random order, until q customers are out."""
+        used = [r for r, route in enumerate(plan.routes) if route]
+        removed: List[int] = []
+        for r in self.rng.permutation(used).tolist():
+            if len(removed) >= q:
+                break
+            removed += plan.routes[r]
+        return self._remove(plan, removed)
+
+    # repair operator
+
+    def _best_insertion(self, plan: _Plan, p: int, r: int) -> tuple[float, int]:
+        """Cheapest (cost increase, position) of p in route r, (inf, -1) when it does not fit."""
+        route = plan.routes[r]
+        table = self.table
+        if len(route) + 1 > table.max_stops:
+            return math.inf, -1
+        if sum(self.weight[c] for c in route) + self.weight[p] > table.capacity[r] + EPS:
+            return math.inf, -1
+        if sum(self.area[c] for c in route) + self.area[p] > table.inner_size[r] + EPS:
+            return math.inf, -1
+        d = self.d
+        path = [0] + route + [0]
+        best, at = math.inf, -1
+        for t in range(len(path) - 1):
+            a, b = path[t], path[t + 1]
+            delta = d[a][p] + d[p][b] - d[a][b]
+            if delta < best:
+                best, at = delta, t
+        return table.cost[r] * best, at
+
+    def insert(self, plan: _Plan, customers: List[int], k: int) -> None:
+        """
+        Insert customers one at a time: with k = 1 the one with the cheapest
+        insertion, otherwise the one with the largest regret, the sum of the
+        differences between its best insertion and its next k - 1 best
+        routes. Insertion costs are cached per (customer, route) and only
+        recomputed for the route that changed.
+        """
+        pending = list(customers) + plan.unrouted
+        plan.unrouted = []
+        K = len(plan.routes)
+        cost = np.empty((len(pending), K))
+        position = np.empty((len(pending), K), dtype=np.int64)
+        for row, p in enumerate(pending):
+            for r in range(K):
+                cost[row, r], position[row, r] = self._best_insertion(plan, p, r)
+        open_rows = np.ones(len(pending), dtype=bool)
+        while open_rows.any():
+            best = cost.min(axis=1)
+            candidates = open_rows & np.isfinite(best)
+            if not candidates.any():
+                break
+            if k == 1 or K == 1:
+                row = int(np.flatnonzero(candidates)[np.argmin(best[candidates])])
+            else:
+                smallest = np.sort(cost[candidates], axis=1)[:, :k]
+                regret = (smallest[:, 1:] - smallest[:, :1]).sum(axis=1)
+                # largest regret first, cheapest insertion on ties
+                order = np.lexsort((best[candidates], -regret))
+                row = int(np.flatnonzero(candidates)[order[0]])
+            r = int(np.argmin(cost[row]))
+            plan.routes[r].insert(int(position[row, r]), pending[row])
+            open_rows[row] = False
+            cost[row] = math.inf
+            for other in np.flatnonzero(open_rows).tolist():
+                cost[other, r], position[other, r] = self._best_insertion(plan, pending[other], r)
+        plan.unrouted = [p for row, p in enumerate(pending) if open_rows[row]]
+
+    # search
+
+    def _pick(self, weights: np.ndarray) -> int:
+        return int(self.rng.choice(len(weights), p=weights / weights.sum()))
+
+    def run(
+        self,
+        plan: _Plan,
+        time_limit: float,
+        max_iterations: int | None = None,
+    ) -> tuple[_Plan, List[ConvergencePoint]]:
+        """The best plan found within time_limit seconds (and max_iterations), and the trace."""
+        started = time.perf_counter()
+        n = len(self.table) - 1
+        current, current_cost = plan, self.cost(plan)
+        best, best_cost = plan.copy(), current_cost
+        trace = [ConvergencePoint(iteration=0, runtime=0.0, current_cost=current_cost, best_cost=best_cost)]
+        if n == 0:
+            return best, trace
+
+        # a 5% worse plan is accepted with probability 1/2 at the start,
+        # 1/2 of a 0.01% worse one at the end
+        start_temperature = 0.05 * current_cost / math.log(2)
+        end_temperature = 0.0001 * current_cost / math.log(2)
+        min_q = min(n, 2)
+        max_q = max(min_q, min(n, int(0.35 * n) + 1, 60))
+
+        destroy_weights = np.ones(len(self.destroy_ops))
+        repair_weights = np.ones(len(self.repair_ops))
+        destroy_scores = np.zeros_like(destroy_weights)
+        repair_scores = np.zeros_like(repair_weights)
+        destroy_uses = np.zeros_like(destroy_weights)
+        repair_uses = np.zeros_like(repair_weights)
+
+        iteration = 0
+        while max_iterations is None or iteration < max_iterations:
+            elapsed = time.perf_counter() - started
+            if elapsed >= time_limit:
+                break
+            iteration += 1
+            temperature = start_temperature * (end_temperature / start_temperature) ** (
+                elapsed / time_limit
+            )
+
+            destroy, repair = self._pick(destroy_weights), self._pick(repair_weights)
+            candidate = current.copy()
+            q = int(self.rng.integers(min_q, max_q + 1))
+            removed = self.destroy_ops[destroy](candidate, q)
+            self.repair_ops[repair](candidate, removed)
+            candidate_cost = self.cost(candidate)
+
+            score = 0.0
+            if candidate_cost < best_cost - EPS:
+                best, best_cost = candidate.copy(), candidate_cost
+                current, current_cost = candidate, candidate_cost
+                score = SCORES[0]
+                trace.append(
+                    ConvergencePoint(
+                        iteration=iteration,
+                        runtime=time.perf_counter() - started,
+                        current_cost=current_cost,
+                        best_cost=best_cost,
+                    )
+                )
+            elif candidate_cost < current_cost - EPS:
+                current, current_cost = candidate, candidate_cost
+                score = SCORES[1]
+            elif temperature > 0 and self.rng.random() < math.exp(
+                -(candidate_cost - current_cost) / temperature
+            ):
+                current, current_cost = candidate, candidate_cost
+                score = SCORES[2]
+            destroy_scores[destroy] += score
+            repair_scores[repair] += score
+            destroy_uses[destroy] += 1
+            repair_uses[repair] += 1
+
+            if iteration % SEGMENT == 0:
+                for weights, scores, uses in (
+                    (destroy_weights, destroy_scores, destroy_uses),
+                    (repair_weights, repair_scores, repair_uses),
+                ):
+                    used = uses > 0
+                    weights[used] = (1 - REACTION) * weights[used] + REACTION * scores[used] / uses[used]
+                    np.maximum(weights, 0.01, out=weights)
+                    scores[:] = 0
+                    uses[:] = 0
+                trace.append(
+                    ConvergencePoint(
+                        iteration=iteration,
+                        runtime=time.perf_counter() - started,
+                        current_cost=current_cost,
+                        best_cost=best_cost,
+                    )
+                )
+        return best, trace
+
+
+def solve_cvrp_alns(
+    input_data: CVRPInput,
+    time_limit: float = 10.0,
+    seed: int = 0,
+    max_iterations: int | None = None,
+) -> CVRPOutput:
+    """
+    Route the day by ALNS from the savings plan, within time_limit seconds
+    of wall-clock time (and max_iterations, if given). The result depends
+    on seed only, given the same number of iterations. is_success is False
+    when some customers fit on no truck.
+    """
+    table = RouteTable.from_cvrp_input(input_data)
+    routes, unrouted = assign_routes(table, savings_routes(table))
+    per_truck: List[List[int]] = [[] for _ in table.trucks]
+    for truck, route in routes:
+        per_truck[truck] = route
+
+    search = ALNS(table, seed)
+    start = _Plan(table, per_truck, unrouted)
+    if unrouted:
+        search.insert(start, [], 2)
+    best, trace = search.run(start, time_limit, max_iterations)
+
+    polished: List[Route] = improve_routes(
+        table, [(r, route) for r, route in enumerate(best.routes) if route]
+    )
+    output = create_cvrp_output_from_routes(table, polished, is_success=not best.unrouted)
+    output.convergence_trace = trace
+    if best.unrouted:
+        print(f"ALNS left {len(best.unrouted)} customers unrouted")
+    return output
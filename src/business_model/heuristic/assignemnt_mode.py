@@ -1,78 +1,240 @@
+"""
+Day-by-day heuristic assignment: on every horizon day a small MIP spreads
+the demands that can still start that day over the trucks.
+
+A day depends on the earlier days that share a candidate demand with it,
+since those may take its demands first. Days are grouped into waves whose
+days depend only on earlier waves; the days of a wave are solved
+concurrently in a process pool. Every worker keeps one Gurobi environment
+with its own thread budget and one day model, whose coefficients are
+changed from day to day rather than rebuilt.
+"""
 import gurobipy as gp
 from gurobipy import GRB
 from src.data_model.assignment_demand import OrderAssignment
 from src.data_model.assignment_Input import AssignmentInput
 from src.data_model.assignment_output import AssignmentOutput
 from src.data_model.demand import Demand
+from src.data_model.demand_table import DemandTable
 from src.data_model.truck import Truck
-from datetime import date, datetime
-from typing import List, Dict
-from collections import defaultdict
-
+from src.business_model.solution_values import nonzero_values
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from datetime import date
+from typing import List, Tuple
+import multiprocessing
+import numpy as np
+import config
 
 
 def assign_item_to_truck_day(item, truck_id, day, assignments):
     assignments[day][truck_id].append(item)
-    item.assigned = True
 
 
-def assignment_orders_to_trucks_days(input_data: AssignmentInput) -> AssignmentOutput:
+class _DayModel:
+    """
+    The day MIP for a fixed fleet and destination set, for up to `slots`
+    demands: a day's demands take the first slots and the other slots are
+    fixed to 0. The model grows when a day brings more demands.
+    """
+
+    def __init__(self, env: gp.Env, capacity: List[float], inner_size: List[float], n_destinations: int):
+        self.env = env
+        self.capacity = capacity
+        self.inner_size = inner_size
+        self.n_destinations = n_destinations
+        self.m: gp.Model | None = None
+        self.slots = 0
+
+    def _build(self, slots: int) -> None:
+        self.dispose()
+        K = len(self.capacity)
+        m = gp.Model("Day", env=self.env)
+        self.x = m.addVars(slots, K, ub=0, vtype=GRB.BINARY, name="x")
+        self.u = m.addVars(self.n_destinations, lb=0, ub=K, vtype=GRB.INTEGER, name="u")
+        load = m.addVars(K, lb=0, ub=self.capacity, name="load")
+        dev = m.addVars(K, lb=0, name="dev")
+
+        # demand coefficients are set per day by solve()
+        self.load_rows = m.addConstrs((load[k] == 0 for k in range(K)), name="load")
+        self.area_rows = m.addConstrs(
+            (gp.LinExpr() <= self.inner_size[k] for k in range(K)), name="area"
+        )
+        m.addConstrs((self.x.sum(s, "*") <= 1 for s in range(slots)), name="once")
+        self.link_rows = m.addConstrs(
+            (self.x[s, k] <= 0 for s in range(slots) for k in range(K)), name="visit"
+        )
+        self.stops_row = m.addConstr(gp.LinExpr() <= config.MAX_STOPS, name="stops")
+        self.pos_dev = m.addConstrs((load[k] - dev[k] <= 0 for k in range(K)), name="pos_dev")
+        self.neg_dev = m.addConstrs((-load[k] - dev[k] <= 0 for k in range(K)), name="neg_dev")
+        m.setObjective(dev.sum(), GRB.MINIMIZE)
+        m.update()
+
+        self.m = m
+        self.slots = slots
+        self.used = 0
+        self.slot_destination: List[int | None] = [None] * slots
+
+    def solve(
+        self, weight: List[float], area: List[float], destination: List[int], avg_load: float
+    ) -> List[Tuple[int, int]]:
+        """(slot, truck position) of the demands the day's solution assigns."""
+        n = len(weight)
+        if n > self.slots:
+            self._build(max(n, 2 * self.slots))
+        m, x, u = self.m, self.x, self.u
+        K = len(self.capacity)
+
+        for s in range(n):
+            for k in range(K):
+                m.chgCoeff(self.load_rows[k], x[s, k], -weight[s])
+                m.chgCoeff(self.area_rows[k], x[s, k], area[s])
+            if self.slot_destination[s] != destination[s]:
+                for k in range(K):
+                    if self.slot_destination[s] is not None:
+                        m.chgCoeff(self.link_rows[s, k], u[self.slot_destination[s]], 0.0)
+                    m.chgCoeff(self.link_rows[s, k], u[destination[s]], -1.0)
+                self.slot_destination[s] = destination[s]
+        # the stop rule counts the destinations of the day's demands
+        stops = set(destination)
+        for p in range(self.n_destinations):
+            m.chgCoeff(self.stops_row, u[p], 1.0 if p in stops else 0.0)
+        for k in range(K):
+            self.pos_dev[k].RHS = avg_load
+            self.neg_dev[k].RHS = -avg_load
+
+        changed = range(min(n, self.used), max(n, self.used))
+        m.setAttr(
+            GRB.Attr.UB, [x[s, k] for s in changed for k in range(K)],
+            [1.0 if s < n else 0.0 for s in changed for _ in range(K)],
+        )
+        self.used = n
+
+        m.optimize()
+        if m.SolCount == 0:
+            return []
+        return list(nonzero_values(m, x))
+
+    def dispose(self) -> None:
+        if self.m is not None:
+            self.m.dispose()
+            self.m = None
+
+
+# the day model of a pool worker
+_day_model: _DayModel | None = None
+
+
+def _init_worker(capacity, inner_size, n_destinations, threads):
+    global _day_model
+    env = gp.Env(params={"OutputFlag": 0, "Threads": threads})
+    _day_model = _DayModel(env, capacity, inner_size, n_destinations)
+
+
+def _solve_day(task) -> List[Tuple[int, int]]:
+    return _day_model.solve(*task)
+
+
+def day_waves(table: DemandTable) -> List[List[int]]:
+    """
+    Horizon days with candidate demands, in waves: a day comes after every
+    earlier day some of its demands can also start on. Start days form
+    ranges, so those are the days from the earliest availability of the
+    day's demands on.
+    """
+    level = []
+    for day_idx in range(len(table.planning_horizon)):
+        rows = table.rows_starting_on(day_idx)
+        if not rows:
+            level.append(-1)
+            continue
+        first = int(table.available_idx[rows].min())
+        level.append(max(level[first:day_idx], default=-1) + 1)
+
+    waves: List[List[int]] = [[] for _ in range(max(level, default=-1) + 1)]
+    for day_idx, wave in enumerate(level):
+        if wave >= 0:
+            waves[wave].append(day_idx)
+    return waves
+
+
+def assignment_orders_to_trucks_days(
+    input_data: AssignmentInput, workers: int = 1, threads_per_worker: int = 1
+) -> AssignmentOutput:
+    """
+    Assign the demands day by day. With workers > 1 the days of a wave are
+    solved in that many processes; each solve uses threads_per_worker
+    threads.
+    """
     demands: list[Demand] = input_data.demands
     trucks: list[Truck] = input_data.trucks
     planning_horizon: list[date] = input_data.planning_horizon
-    
+
     truck_map = {t.id: t for t in trucks}
     truck_ids = [t.id for t in trucks]
+    capacity = [float(t.capacity) for t in trucks]
+    inner_size = [
+        GRB.INFINITY if t.inner_size is None or np.isnan(t.inner_size) else float(t.inner_size)
+        for t in trucks
+    ]
 
+    assignments = {day: {t.id: [] for t in trucks} for day in planning_horizon}
 
-    dest_to_demands = defaultdict(list)
-    for d in demands:
-        dest_to_demands[d.destination].append(d)
+    demand_table = DemandTable.from_demands(demands, planning_horizon)
+    weight = demand_table.weight.tolist()
+    area = demand_table.area.tolist()
+    destination = demand_table.destination.tolist()
+    # demands not assigned yet, indexed by table row
+    is_open = np.ones(len(demand_table), dtype=bool)
+    worker_args = (capacity, inner_size, len(demand_table.destinations), threads_per_worker)
 
-    assignments = {day: {t.id: [] for t in trucks} for day in planning_horizon}
+    with ExitStack() as stack:
+        if workers > 1:
+            executor = stack.enter_context(
+                ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=worker_args,
+                )
+            )
 
-    remaining_items = list(demands)
-    for day_idx, day in enumerate(planning_horizon):
-        feasible_items = [m for m in remaining_items if day in m.feasible_dates(planning_horizon)]
+            def solve_days(tasks):
+                return list(executor.map(_solve_day, tasks))
 
+        else:
+            env = stack.enter_context(
+                gp.Env(params={"OutputFlag": 0, "Threads": threads_per_worker})
+            )
+            day_model = _DayModel(env, *worker_args[:3])
+            stack.callback(day_model.dispose)
 
-        total_weight = sum(m.weight for m in feasible_items)
-        AvgLoad = total_weight / len(truck_ids) if truck_ids else 0
-        
-        if not feasible_items:
-            continue
-        
-        # Build mini-MIP for this day
-        mini = gp.Model(f"Day_{day_idx}")
-        
-        x = mini.addVars([m.demand_id for m in feasible_items], truck_ids, vtype=GRB.BINARY)
-        u = mini.addVars([m.destination.id for m in feasible_items], lb=0, ub=len(truck_ids), vtype=GRB.INTEGER)
-       
-        for t_id in truck_ids:
-            mini.addConstr(gp.quicksum(x[m.demand_id, t_id] * m.weight for m in feasible_items) <= truck_map[t_id].capacity)
-            mini.addConstr(gp.quicksum(x[m.demand_id, t_id] * m.size_area for m in feasible_items) <= truck_map[t_id].inner_size)
-            
-            for m in feasible_items:
-                mini.addConstr(u[m.destination.id] >= x[m.demand_id, t_id])
-            mini.addConstr(gp.quicksum(u[m.destination.id] for m in feasible_items) <= 5)
-        
-        
-        T_dev = mini.addVars(truck_ids, lb=0, name="dev")
-
-        for t_id in truck_ids:
-            total_load = gp.quicksum(x[m.demand_id, t_id] * m.weight for m in feasible_items)
-            mini.addConstr(total_load - AvgLoad <= T_dev[t_id])
-            mini.addConstr(AvgLoad - total_load <= T_dev[t_id])
-
-        mini.setObjective(gp.quicksum(T_dev[t_id] for t_id in truck_ids), GRB.MINIMIZE)
-        
-        mini.optimize()
-        
-        for m in feasible_items:
-            for t_id in truck_ids:
-                if x[m.demand_id, t_id].X > 0.5:
-                    assign_item_to_truck_day(m, t_id, day, assignments)
-                    remaining_items.remove(m)
+            def solve_days(tasks):
+                return [day_model.solve(*task) for task in tasks]
+
+        for wave in day_waves(demand_table):
+            day_rows = []
+            tasks = []
+            for day_idx in wave:
+                rows = np.asarray(demand_table.rows_starting_on(day_idx), dtype=np.int64)
+                rows = rows[is_open[rows]].tolist()
+                if not rows:
+                    continue
+                total_weight = sum(weight[i] for i in rows)
+                day_rows.append((day_idx, rows))
+                tasks.append((
+                    [weight[i] for i in rows],
+                    [area[i] for i in rows],
+                    [destination[i] for i in rows],
+                    total_weight / len(truck_ids) if truck_ids else 0,
+                ))
+
+            for (day_idx, rows), chosen in zip(day_rows, solve_days(tasks)):
+                for slot, k in chosen:
+                    assign_item_to_truck_day(
+                        demands[rows[slot]], truck_ids[k], planning_horizon[day_idx], assignments
+                    )
+                    is_open[rows[slot]] = False
 
     daily_loads = {}
     daily_slack = {}
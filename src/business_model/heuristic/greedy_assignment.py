@@ -0,0 +1,161 @@
+"""
+Greedy constructive assignment of demands to trucks and start days.
+
+Usable on its own (assign_orders_greedy) or as a MIP start for the
+truck-indexed assignment models (set_greedy_start).
+"""
+from src.data_model.assignment_demand import OrderAssignment
+from src.data_model.assignment_Input import AssignmentInput
+from src.data_model.assignment_output import AssignmentOutput
+from src.data_model.demand_table import DemandTable
+from src.data_model.truck import Truck
+from src.business_model.mip.assignment_model.assignment_summary import daily_summary
+from src.business_model.mip.assignment_model.built_model import BuiltAssignmentModel
+from typing import Dict, List, Tuple
+import numpy as np
+import config
+
+
+def _window_max(load: np.ndarray, first: int, last: int, td: int) -> np.ndarray:
+    """Per truck and start s in [first, last], the max of load over the trip days [s, s + td)."""
+    H = load.shape[1]
+    result = np.zeros((load.shape[0], last - first + 1))
+    for offset in range(td):
+        days = load[:, first + offset : min(last + offset, H - 1) + 1]
+        np.maximum(result[:, : days.shape[1]], days, out=result[:, : days.shape[1]])
+    return result
+
+
+def greedy_assignment(
+    table: DemandTable, trucks: List[Truck], preference: np.ndarray | None = None
+) -> List[Tuple[int, int, int]]:
+    """
+    (row, start day index, truck position) for every item the greedy placed;
+    a class of an aggregated table appears once per item.
+
+    Items go in order of their last feasible start day, heaviest first, each
+    on its earliest start day with a truck that has room for its weight and
+    area on every day of its trip and either already stops at its destination
+    that day or has fewer than config.MAX_STOPS stops. Among those trucks the
+    best fit, i.e. the one left with the least relative weight and area room,
+    wins. Items that fit nowhere are left out.
+
+    preference, shaped (rows, trucks, horizon days), overrides the earliest
+    start: an item takes the (truck, start) with room and the highest
+    preference, and every placement lowers that entry by one, so the items of
+    a class spread over the slots in preference order.
+    """
+    H = len(table.planning_horizon)
+    K = len(trucks)
+    capacity = np.array([t.capacity for t in trucks], dtype=float)
+    inner_size = np.array(
+        [np.inf if t.inner_size is None else t.inner_size for t in trucks], dtype=float
+    )
+    inner_size[np.isnan(inner_size)] = np.inf
+    weight_load = np.zeros((K, H))
+    area_load = np.zeros((K, H))
+    n_stops = np.zeros((K, H), dtype=np.int64)
+    visits = np.zeros((len(table.destinations), K, H), dtype=bool)
+
+    weight = table.weight.tolist()
+    area = table.area.tolist()
+    travel_days = table.travel_days.tolist()
+    destination = table.destination.tolist()
+    order = np.lexsort((-table.weight, table.available_idx, table.last_start_idx))
+
+    placed = []
+    for i in order[table.is_feasible[order]].tolist():
+        first, last = int(table.available_idx[i]), int(table.last_start_idx[i])
+        td = travel_days[i]
+        for _ in range(int(table.count[i])):
+            # (truck, start) grids over all feasible starts of the item at once
+            weight_room = capacity[:, None] - _window_max(weight_load, first, last, td) - weight[i]
+            area_room = inner_size[:, None] - _window_max(area_load, first, last, td) - area[i]
+            stop_ok = visits[destination[i], :, first : last + 1] | (
+                n_stops[:, first : last + 1] < config.MAX_STOPS
+            )
+            fits = (weight_room >= -1e-9) & (area_room >= -1e-9) & stop_ok
+            if preference is not None:
+                score = np.where(fits, preference[i, :, first : last + 1], -np.inf)
+                fits &= score >= score.max() - 1e-9
+            open_starts = np.flatnonzero(fits.any(axis=0))
+            if not len(open_starts):
+                break
+            col = int(open_starts[0])
+            s_idx = first + col
+            # an unbounded area leaves no area room to compare
+            room = weight_room[:, col] / capacity + np.where(
+                np.isinf(inner_size), 0.0, area_room[:, col] / inner_size
+            )
+            candidates = np.flatnonzero(fits[:, col])
+            k = int(candidates[np.argmin(room[candidates])])
+
+            days = slice(s_idx, min(s_idx + td, H))
+            weight_load[k, days] += weight[i]
+            area_load[k, days] += area[i]
+            if not visits[destination[i], k, s_idx]:
+                visits[destination[i], k, s_idx] = True
+                n_stops[k, s_idx] += 1
+            if preference is not None:
+                preference[i, k, s_idx] -= 1
+            placed.append((i, s_idx, k))
+    return placed
+
+
+def set_greedy_start(built: BuiltAssignmentModel) -> int:
+    """
+    Feed the greedy assignment to a built truck-indexed model as MIP start
+    through the Start attribute of x, and return the number of items placed.
+    The start is complete when every assignable item was placed; otherwise
+    only the placed items are set and Gurobi completes the rest.
+    """
+    truck_types = built.truck_types
+    trucks = [truck for t in truck_types for truck in t.trucks]
+    type_of = [t.id for t in truck_types for _ in t.trucks]
+
+    start: Dict[tuple, int] = {}
+    placed = greedy_assignment(built.demand_table, trucks)
+    for i, s_idx, k in placed:
+        key = (i, s_idx, type_of[k])
+        start[key] = start.get(key, 0) + 1
+
+    table = built.demand_table
+    complete = len(placed) == int(table.count[table.is_feasible].sum())
+    for key, var in built.x.items():
+        if key in start:
+            var.Start = start[key]
+        elif complete:
+            var.Start = 0
+    return len(placed)
+
+
+def assign_orders_greedy(input_data: AssignmentInput) -> AssignmentOutput:
+    """
+    Assign the demands with the greedy heuristic alone. is_success is False
+    when some demand could not be placed; the others are still returned.
+    """
+    planning_horizon = input_data.planning_horizon
+    H = len(planning_horizon)
+    table = DemandTable.from_demands(input_data.demands, planning_horizon)
+    demands = table.to_demands()
+
+    assignments = [
+        OrderAssignment(
+            demand=demands[i],
+            assigned_date=planning_horizon[s_idx],
+            truck=input_data.trucks[k],
+        )
+        for i, s_idx, k in greedy_assignment(table, input_data.trucks)
+    ]
+    daily_loads, daily_slack, daily_balance = daily_summary(
+        assignments, input_data.trucks, planning_horizon, table.total_weight / H
+    )
+
+    return AssignmentOutput(
+        assignments=assignments,
+        daily_loads=daily_loads,
+        daily_slack=daily_slack,
+        daily_balance=daily_balance,
+        objective_value=input_data.w_balance * sum(daily_balance.values()),
+        is_success=len(assignments) == len(demands),
+    )
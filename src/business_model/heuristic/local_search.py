@@ -0,0 +1,337 @@
+"""
+Local search on a day's routes.
+
+Moves: relocate and or-opt (segments of up to three customers), swap and
+cross-exchange (segments of up to three customers between two routes),
+2-opt within a route and 2-opt* between routes. Candidate moves are
+granular: they must put a customer next to one of its nearest neighbours.
+Their cost and load deltas come from prefix sums along every route and
+touch only the changed arcs; moves within one route are priced on the
+route itself, which is at most config.MAX_STOPS long.
+
+Usable as a post-optimizer after any solver (improve_cvrp_output).
+"""
+from src.data_model.cvrp_input import CVRPInput
+from src.data_model.cvrp_output import CVRPOutput
+from src.data_model.route_table import RouteTable
+from src.serializer.serialize_cvrp_output import (
+    Route,
+    create_cvrp_output_from_routes,
+    routes_from_cvrp_output,
+)
+from typing import List
+import time
+
+MAX_SEGMENT = 3
+EPS = 1e-9
+
+
+class RouteState:
+    """
+    One route per truck position (empty for idle trucks) with, per route,
+    prefix sums along its path depot -> customers -> depot: forward and
+    reversed arc lengths and weight and area.
+    """
+
+    def __init__(self, table: RouteTable, routes: List[Route]):
+        self.table = table
+        self.d = table.distance.tolist()
+        self.weight = table.weight.tolist()
+        self.area = table.area.tolist()
+        self.capacity = table.capacity.tolist()
+        self.inner_size = table.inner_size.tolist()
+        self.cost = table.cost.tolist()
+        self.max_stops = table.max_stops
+
+        self.routes: List[List[int]] = [[] for _ in table.trucks]
+        for truck, route in routes:
+            self.routes[truck] = list(route)
+        self.route_of = [-1] * len(table)
+        self.index_of = [0] * len(table)  # path index, the depot being 0
+        self.paths: List[List[int]] = [[] for _ in table.trucks]
+        self.fwd: List[List[float]] = [[] for _ in table.trucks]
+        self.bwd: List[List[float]] = [[] for _ in table.trucks]
+        self.load: List[List[float]] = [[] for _ in table.trucks]
+        self.size: List[List[float]] = [[] for _ in table.trucks]
+        for r in range(len(self.routes)):
+            self.refresh(r)
+
+    def refresh(self, r: int) -> None:
+        d = self.d
+        path = [0] + self.routes[r] + [0]
+        fwd, bwd, load, size = [0.0], [0.0], [0.0], [0.0]
+        for k in range(1, len(path)):
+            a, b = path[k - 1], path[k]
+            fwd.append(fwd[-1] + d[a][b])
+            bwd.append(bwd[-1] + d[b][a])
+            load.append(load[-1] + self.weight[b])
+            size.append(size[-1] + self.area[b])
+        self.paths[r], self.fwd[r], self.bwd[r] = path, fwd, bwd
+        self.load[r], self.size[r] = load, size
+        for k, p in enumerate(path[1:-1], start=1):
+            self.route_of[p] = r
+            self.index_of[p] = k
+
+    def fits(self, r: int, weight: float, area: float, stops: int) -> bool:
+        return (
+            stops <= self.max_stops
+            and weight <= self.capacity[r] + EPS
+            and area <= self.inner_size[r] + EPS
+        )
+
+    def length(self, r: int) -> float:
+        return self.fwd[r][-1]
+
+    def path_length(self, path: List[int]) -> float:
+        d = self.d
+        return sum(d[a][b] for a, b in zip(path[:-1], path[1:]))
+
+    def total_cost(self) -> float:
+        return sum(c * self.length(r) for r, c in enumerate(self.cost) if self.routes[r])
+
+    def to_routes(self) -> List[Route]:
+        return [(r, list(route)) for r, route in enumerate(self.routes) if route]
+
+
+def _intra_route(state: RouteState, r: int, route: List[int]) -> float | None:
+    """Cost change of replacing route r by a reordering of it."""
+    delta = state.cost[r] * (state.path_length([0] + route + [0]) - state.length(r))
+    return delta if delta < -EPS else None
+
+
+def _try_relocate(state: RouteState, i: int, j: int) -> bool:
+    """Move a segment starting at i after j, or one ending at i before j."""
+    ra, rb = state.route_of[i], state.route_of[j]
+    ia, jb = state.index_of[i], state.index_of[j]
+    last = len(state.paths[ra]) - 2
+    candidates = [(ia, e, jb) for e in range(ia, min(ia + MAX_SEGMENT, last + 1))]
+    candidates += [(s, ia, jb - 1) for s in range(max(1, ia - MAX_SEGMENT + 1), ia + 1)]
+    for s, e, t in candidates:
+        if ra == rb:
+            if s - 1 <= t <= e:
+                continue
+            route = state.routes[ra]
+            segment = route[s - 1 : e]
+            rest = route[: s - 1] + route[e:]
+            at = t if t < s else t - len(segment)
+            if _intra_route(state, ra, rest[:at] + segment + rest[at:]) is not None:
+                state.routes[ra] = rest[:at] + segment + rest[at:]
+                state.refresh(ra)
+                return True
+            continue
+        if _relocate_between(state, ra, s, e, rb, t):
+            return True
+    return False
+
+
+def _relocate_between(state: RouteState, ra: int, s: int, e: int, rb: int, t: int) -> bool:
+    """Move path positions [s, e] of route ra between path positions t and t + 1 of route rb."""
+    d = state.d
+    PA, PB = state.paths[ra], state.paths[rb]
+    seg_weight = state.load[ra][e] - state.load[ra][s - 1]
+    seg_area = state.size[ra][e] - state.size[ra][s - 1]
+    stops = len(PB) - 2 + e - s + 1
+    if not state.fits(rb, state.load[rb][-1] + seg_weight, state.size[rb][-1] + seg_area, stops):
+        return False
+    inner = state.fwd[ra][e] - state.fwd[ra][s]
+    removed = d[PA[s - 1]][PA[e + 1]] - d[PA[s - 1]][PA[s]] - d[PA[e]][PA[e + 1]] - inner
+    inserted = d[PB[t]][PA[s]] + inner + d[PA[e]][PB[t + 1]] - d[PB[t]][PB[t + 1]]
+    if state.cost[ra] * removed + state.cost[rb] * inserted >= -EPS:
+        return False
+    segment = state.routes[ra][s - 1 : e]
+    del state.routes[ra][s - 1 : e]
+    state.routes[rb][t:t] = segment
+    state.refresh(ra)
+    state.refresh(rb)
+    return True
+
+
+def _try_exchange(state: RouteState, i: int, j: int) -> bool:
+    """
+    Swap (1 + 1 customers) and cross-exchange: a segment starting at i and
+    one starting right after j, in another route, trade places, so that
+    i follows j.
+    """
+    d = state.d
+    ra, rb = state.route_of[i], state.route_of[j]
+    if ra == rb:
+        return False
+    PA, PB = state.paths[ra], state.paths[rb]
+    s = state.index_of[i]
+    u = state.index_of[j] + 1
+    last_a, last_b = len(PA) - 2, len(PB) - 2
+    if u > last_b:
+        return False
+    for e in range(s, min(s + MAX_SEGMENT, last_a + 1)):
+        weight_a = state.load[ra][e] - state.load[ra][s - 1]
+        area_a = state.size[ra][e] - state.size[ra][s - 1]
+        inner_a = state.fwd[ra][e] - state.fwd[ra][s]
+        for v in range(u, min(u + MAX_SEGMENT, last_b + 1)):
+            weight_b = state.load[rb][v] - state.load[rb][u - 1]
+            area_b = state.size[rb][v] - state.size[rb][u - 1]
+            if not state.fits(
+                ra,
+                state.load[ra][-1] - weight_a + weight_b,
+                state.size[ra][-1] - area_a + area_b,
+                last_a - (e - s) + (v - u),
+            ) or not state.fits(
+                rb,
+                state.load[rb][-1] - weight_b + weight_a,
+                state.size[rb][-1] - area_b + area_a,
+                last_b - (v - u) + (e - s),
+            ):
+                continue
+            inner_b = state.fwd[rb][v] - state.fwd[rb][u]
+            delta_a = (
+                d[PA[s - 1]][PB[u]] + inner_b + d[PB[v]][PA[e + 1]]
+                - d[PA[s - 1]][PA[s]] - inner_a - d[PA[e]][PA[e + 1]]
+            )
+            delta_b = (
+                d[PB[u - 1]][PA[s]] + inner_a + d[PA[e]][PB[v + 1]]
+                - d[PB[u - 1]][PB[u]] - inner_b - d[PB[v]][PB[v + 1]]
+            )
+            if state.cost[ra] * delta_a + state.cost[rb] * delta_b >= -EPS:
+                continue
+            seg_a = state.routes[ra][s - 1 : e]
+            seg_b = state.routes[rb][u - 1 : v]
+            state.routes[ra][s - 1 : e] = seg_b
+            state.routes[rb][u - 1 : v] = seg_a
+            state.refresh(ra)
+            state.refresh(rb)
+            return True
+    return False
+
+
+def _try_two_opt(state: RouteState, i: int, j: int) -> bool:
+    """
+    Add the arc i -> j. Within a route, by reversing the customers between
+    them (2-opt); across routes, by swapping the tails after i and from j
+    on (2-opt*).
+    """
+    d = state.d
+    ra, rb = state.route_of[i], state.route_of[j]
+    a, b = state.index_of[i], state.index_of[j]
+    PA, PB = state.paths[ra], state.paths[rb]
+    if ra == rb:
+        if b <= a + 1:
+            return False
+        fwd, bwd = state.fwd[ra], state.bwd[ra]
+        delta = (
+            d[PA[a]][PA[b]] + d[PA[a + 1]][PA[b + 1]]
+            - d[PA[a]][PA[a + 1]] - d[PA[b]][PA[b + 1]]
+            + (bwd[b] - bwd[a + 1]) - (fwd[b] - fwd[a + 1])
+        )
+        if state.cost[ra] * delta >= -EPS:
+            return False
+        state.routes[ra][a : b] = state.routes[ra][a : b][::-1]
+        state.refresh(ra)
+        return True
+
+    # route a keeps PA[..a] and takes PB[b..], route b keeps PB[..b-1] and takes PA[a+1..]
+    end_a, end_b = len(PA) - 1, len(PB) - 1
+    load_a, load_b = state.load[ra], state.load[rb]
+    size_a, size_b = state.size[ra], state.size[rb]
+    if not state.fits(
+        ra, load_a[a] + load_b[-1] - load_b[b - 1], size_a[a] + size_b[-1] - size_b[b - 1],
+        a + end_b - b,
+    ) or not state.fits(
+        rb, load_b[b - 1] + load_a[-1] - load_a[a], size_b[b - 1] + size_a[-1] - size_a[a],
+        b - 1 + end_a - a - 1,
+    ):
+        return False
+    fwd_a, fwd_b = state.fwd[ra], state.fwd[rb]
+    new_a = fwd_a[a] + d[PA[a]][PB[b]] + fwd_b[end_b] - fwd_b[b]
+    new_b = fwd_b[b - 1] + d[PB[b - 1]][PA[a + 1]] + fwd_a[end_a] - fwd_a[a + 1]
+    delta = state.cost[ra] * (new_a - fwd_a[end_a]) + state.cost[rb] * (new_b - fwd_b[end_b])
+    if delta >= -EPS:
+        return False
+    tail_a = state.routes[ra][a:]
+    state.routes[ra] = state.routes[ra][:a] + state.routes[rb][b - 1 :]
+    state.routes[rb] = state.routes[rb][: b - 1] + tail_a
+    state.refresh(ra)
+    state.refresh(rb)
+    return True
+
+
+def _try_open_route(state: RouteState, i: int) -> bool:
+    """Move a segment starting at i to an idle truck, trying one truck per kind."""
+    ra = state.route_of[i]
+    s = state.index_of[i]
+    last = len(state.paths[ra]) - 2
+    tried = set()
+    for rb, route in enumerate(state.routes):
+        kind = (state.capacity[rb], state.inner_size[rb], state.cost[rb])
+        if route or rb == ra or kind in tried:
+            continue
+        tried.add(kind)
+        for e in range(s, min(s + MAX_SEGMENT, last + 1)):
+            if _relocate_between(state, ra, s, e, rb, 0):
+                return True
+    return False
+
+
+def local_search(
+    state: RouteState, neighbours: List[List[int]], time_limit: float | None = None
+) -> RouteState:
+    """
+    Apply the first improving move found, customer by customer, until a
+    full pass finds none or time_limit seconds have passed.
+    """
+    started = time.perf_counter()
+    customers = list(state.table.customers)
+    improved = True
+    while improved:
+        improved = False
+        for i in customers:
+            if time_limit is not None and time.perf_counter() - started > time_limit:
+                return state
+            if state.route_of[i] < 0:
+                continue
+            for j in neighbours[i]:
+                if state.route_of[j] < 0:
+                    continue
+                if (
+                    _try_relocate(state, i, j)
+                    or _try_exchange(state, i, j)
+                    or _try_two_opt(state, i, j)
+                ):
+                    improved = True
+                    break
+            else:
+                if _try_open_route(state, i):
+                    improved = True
+    return state
+
+
+def improve_routes(
+    table: RouteTable,
+    routes: List[Route],
+    neighbour_count: int = 10,
+    time_limit: float | None = None,
+) -> List[Route]:
+    """routes after local search, with neighbour lists of neighbour_count customers."""
+    state = RouteState(table, routes)
+    local_search(state, table.neighbours(neighbour_count), time_limit)
+    return state.to_routes()
+
+
+def improve_cvrp_output(
+    input_data: CVRPInput,
+    output: CVRPOutput,
+    neighbour_count: int = 10,
+    time_limit: float | None = None,
+) -> CVRPOutput:
+    """
+    output of any solver after local search, with its routes' distances and
+    costs recomputed. best_bound is kept; mip_gap is dropped since it
+    belonged to the solver's solution.
+    """
+    if not output.routes:
+        return output
+    table = RouteTable.from_cvrp_input(input_data)
+    routes = improve_routes(
+        table, routes_from_cvrp_output(table, output), neighbour_count, time_limit
+    )
+    return create_cvrp_output_from_routes(
+        table, routes, best_bound=output.best_bound, is_success=output.is_success
+    )
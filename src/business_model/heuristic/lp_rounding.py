@@ -0,0 +1,149 @@
+"""
+Fast mode for the assignment MIPs: solve the LP relaxation, round x with a
+capacity-aware repair pass and price the rounded assignment in the MIP.
+
+The LP objective bounds the MIP optimum from below, so the rounded
+objective comes with a known gap.
+"""
+from src.data_model.demand_table import DemandTable
+from src.data_model.truck import Truck
+from src.business_model.mip.assignment_model.built_model import BuiltAssignmentModel
+from src.business_model.heuristic.greedy_assignment import greedy_assignment
+from src.business_model.solve_control import SolveControl, SolveResult
+from dataclasses import replace
+from typing import Dict, List
+from gurobipy import GRB
+import numpy as np
+import time
+
+
+def lp_values(built: BuiltAssignmentModel, control: SolveControl) -> tuple[SolveResult, np.ndarray | None]:
+    """The LP relaxation's result and its x values in x key order (None without a solution)."""
+    m = built.model
+    m.update()
+    relaxed = m.relax()
+    lp = control.optimize(relaxed)
+    values = None
+    if lp.has_solution:
+        all_values = np.asarray(relaxed.getAttr(GRB.Attr.X, relaxed.getVars()))
+        values = all_values[[var.index for var in built.x.values()]]
+    relaxed.dispose()
+    return lp, values
+
+
+def round_starts(table: DemandTable, preference: np.ndarray, daily_capacity: float) -> Dict[tuple, int]:
+    """
+    Items per (row, start day index) for the truck-less model, heaviest
+    first. Each takes, among its starts where the day keeps within
+    daily_capacity (or all of them, the capacity being soft), the one that
+    changes sum(|daily load - average load|) least, with a bonus of a
+    quarter of its weight times the start's LP value.
+    """
+    H = len(table.planning_horizon)
+    load = np.zeros(H)
+    avg_load = table.total_weight / H
+    rounded: Dict[tuple, int] = {}
+    feasible = np.flatnonzero(table.is_feasible)
+    for i in feasible[np.argsort(-table.weight[feasible], kind="stable")].tolist():
+        starts = np.arange(table.available_idx[i], table.last_start_idx[i] + 1)
+        w = table.weight[i]
+        for _ in range(int(table.count[i])):
+            fits = load[starts] + w <= daily_capacity + 1e-9
+            score = (
+                np.abs(load[starts] + w - avg_load)
+                - np.abs(load[starts] - avg_load)
+                - 0.25 * w * np.clip(preference[i, starts], 0, 1)
+            )
+            if fits.any():
+                score[~fits] = np.inf
+            s_idx = int(starts[np.argmin(score)])
+            load[s_idx] += w
+            preference[i, s_idx] -= 1
+            rounded[i, s_idx] = rounded.get((i, s_idx), 0) + 1
+    return rounded
+
+
+def round_truck_assignment(built: BuiltAssignmentModel, values: np.ndarray) -> Dict[tuple, int]:
+    """
+    Items per x key (row, start day index, truck type id): the greedy
+    assigner steered by the LP values, which keeps every item within the
+    weight, area and stop limits of a single truck.
+    """
+    table = built.demand_table
+    truck_types = built.truck_types
+    trucks: List[Truck] = [truck for t in truck_types for truck in t.trucks]
+    # positions of every type's trucks in the fleet
+    positions, n = {}, 0
+    for t in truck_types:
+        positions[t.id] = list(range(n, n + t.count))
+        n += t.count
+    type_of = [t.id for t in truck_types for _ in t.trucks]
+
+    preference = np.zeros((len(table), len(trucks), len(table.planning_horizon)))
+    for (i, s_idx, k_id), value in zip(built.x.keys(), values.tolist()):
+        preference[i, positions[k_id], s_idx] = value
+
+    rounded: Dict[tuple, int] = {}
+    for i, s_idx, k in greedy_assignment(table, trucks, preference):
+        key = (i, s_idx, type_of[k])
+        rounded[key] = rounded.get(key, 0) + 1
+    return rounded
+
+
+def solve_lp_rounding(
+    built: BuiltAssignmentModel,
+    solve_control: SolveControl | None = None,
+    daily_capacity: float | None = None,
+) -> SolveResult:
+    """
+    Solve built in fast mode and leave the rounded solution in its model for
+    the usual extraction. Truck-indexed models are rounded by
+    round_truck_assignment, the truck-less one by round_starts with
+    daily_capacity. x is fixed for every row whose items were all placed;
+    rows the repair could not place stay free for the MIP to complete.
+
+    objective_value is the rounded objective, best_bound the LP bound and
+    mip_gap the gap between them; runtime covers all three steps, which share
+    the time_limit of solve_control.
+    """
+    control = solve_control or SolveControl()
+    started = time.perf_counter()
+    lp, values = lp_values(built, control)
+    if values is None:
+        return lp
+
+    table = built.demand_table
+    if built.truck_types is not None:
+        rounded = round_truck_assignment(built, values)
+    else:
+        preference = np.zeros((len(table), len(table.planning_horizon)))
+        for (i, s_idx), value in zip(built.x.keys(), values.tolist()):
+            preference[i, s_idx] = value
+        rounded = round_starts(table, preference, daily_capacity)
+
+    placed = np.zeros(len(table), dtype=np.int64)
+    for key, n in rounded.items():
+        placed[key[0]] += n
+    complete = (placed == table.count).tolist()
+    for key, var in built.x.items():
+        n = rounded.get(key, 0)
+        var.LB = n
+        if complete[key[0]]:
+            var.UB = n
+
+    # the MIP gets what the LP and the rounding left of the budget
+    if control.time_limit is not None:
+        elapsed = time.perf_counter() - started
+        control = replace(control, time_limit=max(0.0, control.time_limit - elapsed))
+    solved = control.optimize(built.model)
+    runtime = time.perf_counter() - started
+    if not solved.has_solution:
+        return SolveResult(solved.status, None, None, None, runtime)
+    objective = solved.objective_value
+    if objective == lp.objective_value:
+        gap = 0.0
+    elif objective == 0:
+        gap = float("inf")
+    else:
+        gap = abs(objective - lp.objective_value) / abs(objective)
+    return SolveResult(solved.status, objective, lp.objective_value, gap, runtime)
@@ -0,0 +1,132 @@
+"""
+Clarke-Wright savings construction of a day's routes.
+
+Usable on its own (solve_cvrp_savings) or as a MIP start for solve_cvrp_gg
+(warm_start=True).
+"""
+from src.data_model.cvrp_input import CVRPInput
+from src.data_model.cvrp_output import CVRPOutput
+from src.data_model.route_table import RouteTable
+from src.serializer.serialize_cvrp_output import Route, create_cvrp_output_from_routes
+from typing import Dict, List, Tuple
+import numpy as np
+
+
+def savings_routes(table: RouteTable) -> List[List[int]]:
+    """
+    Routes as customer positions, by parallel savings merges. Every customer
+    starts on its own route; pairs (i, j) go in order of their saving
+    d(i, 0) + d(0, j) - d(i, j), and a route ending in i is joined to a route
+    starting with j when the result stays within config.MAX_STOPS and fits
+    the weight and area of some truck. Pairs with no saving are only merged
+    while there are more routes than trucks.
+    """
+    d = table.distance
+    n = len(table) - 1
+    if n == 0:
+        return []
+    saving = d[1:, [0]] + d[[0], 1:] - d[1:, 1:]
+    np.fill_diagonal(saving, -np.inf)
+    saving[~np.isfinite(saving)] = -np.inf
+
+    weight = table.weight.tolist()
+    area = table.area.tolist()
+    capacity = table.capacity
+    inner_size = table.inner_size
+    n_trucks = len(table.trucks)
+
+    routes: Dict[int, List[int]] = {p: [p] for p in table.customers}
+    route_of = list(range(n + 1))
+    route_weight = {p: weight[p] for p in table.customers}
+    route_area = {p: area[p] for p in table.customers}
+
+    flat = np.argsort(-saving, axis=None, kind="stable")
+    for value, index in zip(saving.ravel()[flat].tolist(), flat.tolist()):
+        if value == -np.inf or (value <= 0 and len(routes) <= n_trucks):
+            break
+        i, j = divmod(index, n)
+        i += 1
+        j += 1
+        a, b = route_of[i], route_of[j]
+        if a == b or routes[a][-1] != i or routes[b][0] != j:
+            continue
+        if len(routes[a]) + len(routes[b]) > table.max_stops:
+            continue
+        w = route_weight[a] + route_weight[b]
+        s = route_area[a] + route_area[b]
+        if not ((w <= capacity + 1e-9) & (s <= inner_size + 1e-9)).any():
+            continue
+        routes[a].extend(routes[b])
+        for p in routes.pop(b):
+            route_of[p] = a
+        route_weight[a] = w
+        route_area[a] = s
+        del route_weight[b], route_area[b]
+    return list(routes.values())
+
+
+def assign_routes(table: RouteTable, routes: List[List[int]]) -> Tuple[List[Route], List[int]]:
+    """
+    One route per truck, heaviest route first, each on the free truck that
+    fits it at the lowest travel cost (the smallest one on ties). Returns the
+    assigned routes and the customers of routes no free truck could take.
+    """
+    free = set(range(len(table.trucks)))
+    assigned: List[Route] = []
+    unrouted: List[int] = []
+    for route in sorted(routes, key=lambda r: -table.weight[r].sum()):
+        length = table.route_distance(route)
+        fitting = [t for t in free if table.fits(t, route)]
+        if not fitting:
+            unrouted.extend(route)
+            continue
+        truck = min(fitting, key=lambda t: (table.cost[t] * length, table.capacity[t], t))
+        free.remove(truck)
+        assigned.append((truck, route))
+    return sorted(assigned), unrouted
+
+
+def fill_fleet(table: RouteTable, routes: List[Route]) -> List[Route]:
+    """
+    Give every idle truck a route of its own by moving the last customer of
+    the longest route to it, as long as that customer fits. The flow model
+    sends every truck out exactly once, so its starts need this.
+    """
+    routes = [(truck, list(route)) for truck, route in routes]
+    used = {truck for truck, _ in routes}
+    for truck in range(len(table.trucks)):
+        if truck in used:
+            continue
+        donors = [r for _, r in routes if len(r) > 1 and table.fits(truck, r[-1:])]
+        if not donors:
+            continue
+        donor = max(donors, key=len)
+        routes.append((truck, [donor.pop()]))
+    return sorted(routes)
+
+
+def set_savings_start(table: RouteTable, x, type_of: List[int]) -> None:
+    """
+    Set the savings routes as MIP start of the flow model's arc variables x,
+    keyed (node id, node id, truck type); type_of gives the type index of
+    every truck position. Arcs x lacks are skipped and left to the solver.
+    """
+    routes, _ = assign_routes(table, savings_routes(table))
+    used = set()
+    for truck, route in fill_fleet(table, routes):
+        path = [table.nodes[p].id for p in [0] + route + [0]]
+        used.update((i, j, type_of[truck]) for i, j in zip(path[:-1], path[1:]))
+    for key, var in x.items():
+        var.Start = 1.0 if key in used else 0.0
+
+
+def solve_cvrp_savings(input_data: CVRPInput) -> CVRPOutput:
+    """
+    Route the day by savings alone. is_success is False when some customers
+    fit on no free truck; they are left out of the routes.
+    """
+    table = RouteTable.from_cvrp_input(input_data)
+    routes, unrouted = assign_routes(table, savings_routes(table))
+    if unrouted:
+        print(f"Savings left {len(unrouted)} customers unrouted")
+    return create_cvrp_output_from_routes(table, routes, is_success=not unrouted)
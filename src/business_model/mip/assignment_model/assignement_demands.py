@@ -4,6 +4,14 @@ from src.data_model.assignment_Input import AssignmentInput
 from src.data_model.assignment_output import AssignmentOutput
 from src.data_model.assignment_demand import OrderAssignment
 from src.data_model.demand import Demand
+from src.data_model.demand_table import DemandTable
+from src.business_model.mip.assignment_model.built_model import (
+    BuiltAssignmentModel,
+    add_assignment_vars,
+)
+from src.business_model.mip.assignment_model.matrix_builder import build_assign_orders_matrix
+from src.business_model.heuristic.lp_rounding import solve_lp_rounding
+from src.business_model.solve_control import SolveControl
 from typing import List
 
 def compute_daily_capacity(trucks, planning_horizon):
@@ -13,47 +21,52 @@ def compute_daily_capacity(trucks, planning_horizon):
             Cap[d] += truck.capacity
     return Cap
 
-def assign_orders(input_data: AssignmentInput) -> AssignmentOutput:
-    demands: List[Demand] = input_data.demands
+def build_assign_orders_model(
+    input_data: AssignmentInput,
+    demand_table: DemandTable | None = None,
+    use_matrix_api: bool = False,
+    aggregate_demands: bool = False,
+) -> BuiltAssignmentModel:
+    if demand_table is None:
+        demand_table = DemandTable.from_demands(input_data.demands, input_data.planning_horizon)
+    if aggregate_demands:
+        demand_table = demand_table.aggregate()
+    if use_matrix_api:
+        return build_assign_orders_matrix(input_data, demand_table)
+
     planning_horizon = input_data.planning_horizon
     trucks = input_data.trucks
     w_bal = input_data.w_balance
     w_slack = input_data.w_slack
 
+    demand_range = range(len(demand_table))
+    count = demand_table.count.tolist()
+    weight = demand_table.weight.tolist()
+
     planning_horizon_range = range(len(planning_horizon))
 
     # Compute total capacity per day
     Cap = compute_daily_capacity(trucks, planning_horizon_range)
     
     # Average load for balance
-    AvgLoad = sum(d.weight for d in demands) / len(planning_horizon)
-
-    demand_ids = [d.demand_id for d in demands]
-    
-    date_to_index = {d: i for i, d in enumerate(planning_horizon)}
-    index_to_date = {i: d for d, i in date_to_index.items()}
+    AvgLoad = demand_table.total_weight / len(planning_horizon)
 
     # Initialize model
     m = gp.Model("Order_Assignment")
 
-    # Decision variables
-    x = m.addVars(demand_ids, planning_horizon_range, vtype=GRB.BINARY, name="x")
+    # Decision variables, only for the feasible (demand, start day) pairs
+    x = add_assignment_vars(
+        m, [(i, t) for i in demand_range for t in demand_table.feasible_starts(i)], demand_table
+    )
     Load = m.addVars(planning_horizon_range, lb=0, name="l")
     z = m.addVars(planning_horizon_range, lb=0, name="z")
     slack = m.addVars(planning_horizon_range, lb=0, name="s")
 
-    # Each order assigned exactly once
-    m.addConstrs(gp.quicksum(x[d.demand_id, t] for t in planning_horizon_range) == 1 for d in demands)
-
-    # Pickup/due date feasibility
-    for o in demands:
-        feasible_days = [date_to_index[d] for d in o.feasible_dates(planning_horizon)]
-        for t in range(len(planning_horizon)):
-            if t not in feasible_days:
-                x[o.demand_id, t].ub = 0
+    # Each order assigned exactly once, within its pickup/due date window
+    m.addConstrs(gp.quicksum(x[i, t] for t in demand_table.feasible_starts(i)) == count[i] for i in demand_range)
 
     # Define daily loads
-    m.addConstrs((Load[d] == gp.quicksum(o.weight*x[o.demand_id,d] for o in demands) for d in planning_horizon_range), name="load_def")
+    m.addConstrs((Load[d] == gp.quicksum(weight[i]*x[i,d] for i in demand_table.rows_starting_on(d)) for d in planning_horizon_range), name="load_def")
 
     # Capacity (with slack)
     m.addConstrs((Load[d] <= Cap[d] + slack[d] for d in planning_horizon_range), name="capacity")
@@ -67,8 +80,36 @@ def assign_orders(input_data: AssignmentInput) -> AssignmentOutput:
                    w_slack * gp.quicksum(slack[d] for d in planning_horizon_range),
                    GRB.MINIMIZE)
 
-    # Solve
-    m.optimize()
+    return BuiltAssignmentModel(
+        model=m, demand_table=demand_table, x=x, Load=Load, z=z, slack=slack
+    )
+
+
+def assign_orders(
+    input_data: AssignmentInput,
+    demand_table: DemandTable | None = None,
+    use_matrix_api: bool = False,
+    aggregate_demands: bool = False,
+    solve_control: SolveControl | None = None,
+    lp_rounding: bool = False,
+) -> AssignmentOutput:
+    """
+    lp_rounding switches from the exact MIP to the fast mode of
+    solve_lp_rounding: best_bound is then the LP bound.
+    """
+    built = build_assign_orders_model(
+        input_data, demand_table, use_matrix_api, aggregate_demands
+    )
+    m, Load, z, slack = built.model, built.Load, built.z, built.slack
+    planning_horizon_range = range(len(input_data.planning_horizon))
+    index_to_date = dict(enumerate(input_data.planning_horizon))
+
+    # Solve, keeping the best incumbent when the budget runs out
+    if lp_rounding:
+        daily_capacity = sum(t.capacity for t in input_data.trucks)
+        result = solve_lp_rounding(built, solve_control, daily_capacity)
+    else:
+        result = (solve_control or SolveControl()).optimize(m)
 
     # Extract results
     assignments = []
@@ -76,16 +117,15 @@ def assign_orders(input_data: AssignmentInput) -> AssignmentOutput:
     daily_slack = {}
     daily_balance = {}
 
-    if m.status == GRB.OPTIMAL:
-        for o in demands:
-            for t in range(len(planning_horizon)):
-                if x[o.demand_id, t].x > 0.5:
-                    assignments.append(
-                        OrderAssignment(
-                            demand=o,
-                            assigned_date=index_to_date[t]
-                        )
-                    )
+    if result.has_solution:
+        for demand, (t,) in built.assigned_items():
+            assignments.append(
+                OrderAssignment(
+                    demand=demand,
+                    assigned_date=index_to_date[t],
+                    truck=None,
+                )
+            )
         for d in planning_horizon_range:
             daily_loads[index_to_date[d]] = Load[d].x
             daily_slack[index_to_date[d]] = slack[d].x
@@ -96,7 +136,9 @@ def assign_orders(input_data: AssignmentInput) -> AssignmentOutput:
             daily_loads=daily_loads,
             daily_slack=daily_slack,
             daily_balance=daily_balance,
-            objective_value=m.objVal
+            objective_value=result.objective_value,
+            best_bound=result.best_bound,
+            mip_gap=result.mip_gap,
         )
     else:
-        raise Exception("No optimal solution found")
+        raise Exception("No feasible solution found")
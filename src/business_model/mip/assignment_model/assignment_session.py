@@ -0,0 +1,242 @@
+"""
+Incremental planning session on the assign_orders_with_truck model.
+
+The model is built once and kept in memory with its last solution. Demand
+deltas (new demands, cancelled demand ids, changed due times) only add or
+remove the variables and constraints of the demands concerned and patch the
+rows that depend on the demand set as a whole: the average load of the
+balance rows and the per-destination stop weights. Each solve starts from
+the previous incumbent.
+"""
+from src.data_model.assignment_demand import OrderAssignment
+from src.data_model.assignment_Input import AssignmentInput
+from src.data_model.assignment_output import AssignmentOutput
+from src.data_model.demand import Demand
+from src.data_model.demand_table import DemandTable
+from src.business_model.mip.assignment_model.built_model import assignment_ub
+from src.business_model.mip.assignment_model.assignment_summary import daily_summary
+from src.business_model.mip.assignment_model.order_assignment import (
+    build_assign_orders_with_truck_model,
+    report_overflow,
+)
+from src.business_model.mip.assignment_model.truck_dispatch import dispatch_to_trucks
+from src.business_model.solve_control import SolveControl
+from src.business_model.solution_values import nonzero_values
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, List, Tuple
+import gurobipy as gp
+from gurobipy import GRB
+
+
+class AssignmentSession:
+    """
+    The demands of input_data planned with assign_orders_with_truck, open to
+    changes. Demands are keyed by demand_id, which must be unique. The
+    planning horizon and the fleet are fixed for the session.
+
+    With aggregate_trucks a solve may return a plan that does not pack onto
+    the trucks of its types: the demands that overflow are printed and
+    is_success is False. Open the session without aggregate_trucks to get a
+    plan that always packs.
+    """
+
+    def __init__(
+        self,
+        input_data: AssignmentInput,
+        aggregate_trucks: bool = False,
+        solve_control: SolveControl | None = None,
+    ):
+        duplicates = [
+            demand_id
+            for demand_id, n in Counter(d.demand_id for d in input_data.demands).items()
+            if n > 1
+        ]
+        if duplicates:
+            raise ValueError(f"Demand ids must be unique, got duplicates: {duplicates}")
+        built = build_assign_orders_with_truck_model(
+            input_data, aggregate_trucks=aggregate_trucks
+        )
+        self.input_data = input_data
+        self.solve_control = solve_control or SolveControl()
+        self.truck_types = built.truck_types
+        self.m = built.model
+        self.m.update()
+        self._constrs = {c.ConstrName: c for c in self.m.getConstrs()}
+
+        table = built.demand_table
+        self._demands: Dict[str, Demand] = {}
+        self._x: Dict[str, Dict[Tuple[int, int], gp.Var]] = {}
+        self._assign_once: Dict[str, gp.Constr] = {}
+        for i, demand in enumerate(table.to_demands()):
+            self._demands[demand.demand_id] = demand
+            self._x[demand.demand_id] = {}
+            if f"assign_once_{i}" in self._constrs:
+                self._assign_once[demand.demand_id] = self._constrs.pop(f"assign_once_{i}")
+        for (i, s_idx, k_id), var in built.x.items():
+            self._x[str(table.demand_ids[i])][s_idx, k_id] = var
+        self._next_row = len(table)
+        self._items_per_destination = Counter(d.destination.id for d in self._demands.values())
+        self._total_weight = table.total_weight
+        self._solution: Dict[str, Tuple[int, int]] = {}
+
+    @property
+    def demands(self) -> List[Demand]:
+        return list(self._demands.values())
+
+    def add_demands(self, demands: Iterable[Demand]) -> None:
+        """Add new demands; their ids must not be planned already."""
+        demands = list(demands)
+        ids = Counter(d.demand_id for d in demands)
+        for demand_id, n in ids.items():
+            if demand_id in self._demands:
+                raise ValueError(f"Demand {demand_id} is already planned")
+            if n > 1:
+                raise ValueError(f"Demand {demand_id} is given more than once")
+        for demand in demands:
+            self._demands[demand.demand_id] = demand
+            self._items_per_destination[demand.destination.id] += 1
+            self._add_vars(demand)
+        self.m.update()
+        self._demand_set_changed(
+            {d.destination.id for d in demands}, sum(d.weight for d in demands)
+        )
+
+    def remove_demands(self, demand_ids: Iterable[str]) -> None:
+        """Cancel planned demands."""
+        demand_ids = self._planned_ids(demand_ids)
+        removed = [self._demands.pop(demand_id) for demand_id in demand_ids]
+        for demand in removed:
+            self._items_per_destination[demand.destination.id] -= 1
+            self._drop_vars(demand.demand_id)
+            self._solution.pop(demand.demand_id, None)
+        self._demand_set_changed(
+            {d.destination.id for d in removed}, -sum(d.weight for d in removed)
+        )
+
+    def change_due_times(self, due_times: Dict[str, datetime]) -> None:
+        """Move the due time of planned demands; their start days are rebuilt."""
+        self._planned_ids(due_times)
+        for demand_id, due_time in due_times.items():
+            demand = self._demands[demand_id].model_copy(update={"due_time": due_time})
+            self._drop_vars(demand_id)
+            self._demands[demand_id] = demand
+            self._add_vars(demand)
+        self.m.update()
+
+    def solve(self) -> AssignmentOutput:
+        """Re-solve from the previous incumbent and return the plan."""
+        for demand_id, slots in self._x.items():
+            previous = self._solution.get(demand_id)
+            if previous is None:
+                continue
+            for slot, var in slots.items():
+                var.Start = 1 if slot == previous else 0
+
+        solved = self.solve_control.optimize(self.m)
+        if not solved.has_solution:
+            return AssignmentOutput(
+                assignments=[],
+                daily_loads={},
+                daily_slack={},
+                daily_balance={},
+                objective_value=0.0,
+                is_success=False,
+            )
+
+        x = gp.tupledict(
+            ((demand_id, *slot), var)
+            for demand_id, slots in self._x.items()
+            for slot, var in slots.items()
+        )
+        self._solution = {key[0]: key[1:] for key in nonzero_values(self.m, x)}
+
+        planning_horizon = self.input_data.planning_horizon
+        assigned = [
+            (self._demands[demand_id], s_idx, k_id)
+            for demand_id, (s_idx, k_id) in self._solution.items()
+        ]
+        trucks, overflow = dispatch_to_trucks(
+            assigned, self.truck_types, len(planning_horizon), self._items_per_destination
+        )
+        report_overflow([assigned[n][0] for n in overflow])
+        assignments = [
+            OrderAssignment(demand=demand, assigned_date=planning_horizon[s_idx], truck=truck)
+            for (demand, s_idx, _), truck in zip(assigned, trucks)
+        ]
+        daily_loads, daily_slack, daily_balance = daily_summary(
+            assignments,
+            self.input_data.trucks,
+            planning_horizon,
+            self._total_weight / len(planning_horizon),
+        )
+        return AssignmentOutput(
+            assignments=assignments,
+            daily_loads=daily_loads,
+            daily_slack=daily_slack,
+            daily_balance=daily_balance,
+            objective_value=solved.objective_value,
+            best_bound=solved.best_bound,
+            mip_gap=solved.mip_gap,
+            is_success=not overflow,
+        )
+
+    def _planned_ids(self, demand_ids: Iterable[str]) -> List[str]:
+        """The given ids, checked to be planned and distinct before a delta touches the model."""
+        demand_ids = list(demand_ids)
+        unknown = [demand_id for demand_id in demand_ids if demand_id not in self._demands]
+        if unknown:
+            raise ValueError(f"Demands {unknown} are not planned")
+        repeated = [demand_id for demand_id, n in Counter(demand_ids).items() if n > 1]
+        if repeated:
+            raise ValueError(f"Demands {repeated} are given more than once")
+        return demand_ids
+
+    def _add_vars(self, demand: Demand) -> None:
+        """x and the assign-once row of one demand, in the rows the builder puts them."""
+        planning_horizon = self.input_data.planning_horizon
+        H = len(planning_horizon)
+        table = DemandTable.from_demands([demand], planning_horizon)
+        row, self._next_row = self._next_row, self._next_row + 1
+        ipd = self._items_per_destination[demand.destination.id]
+
+        keys = [(0, s_idx, t.id) for s_idx in table.feasible_starts(0) for t in self.truck_types]
+        ub = assignment_ub(keys, table, self.truck_types).tolist()
+        slots = {}
+        for (_, s_idx, k_id), var_ub in zip(keys, ub):
+            column = gp.Column()
+            for day_idx in range(s_idx, min(s_idx + demand.travel_days, H)):
+                column.addTerms(-demand.weight, self._constrs[f"load_active_{day_idx}"])
+                column.addTerms(demand.weight, self._constrs[f"truckcap_{k_id}_{day_idx}"])
+                column.addTerms(
+                    demand.size_area, self._constrs[f"size_cap_truck_{k_id}_{day_idx}"]
+                )
+            column.addTerms(1 / ipd, self._constrs[f"approx_maxstops_{k_id}_{s_idx}"])
+            slots[s_idx, k_id] = self.m.addVar(
+                ub=var_ub, vtype=GRB.BINARY, name=f"x[{row},{s_idx},{k_id}]", column=column
+            )
+        self._x[demand.demand_id] = slots
+        if slots:
+            self._assign_once[demand.demand_id] = self.m.addConstr(
+                gp.quicksum(slots.values()) == 1, name=f"assign_once_{row}"
+            )
+
+    def _drop_vars(self, demand_id: str) -> None:
+        self.m.remove(list(self._x.pop(demand_id).values()))
+        if demand_id in self._assign_once:
+            self.m.remove(self._assign_once.pop(demand_id))
+
+    def _demand_set_changed(self, destination_ids: set, weight_delta: float) -> None:
+        """Refresh the stop weights of the given destinations and the average load."""
+        for demand in self._demands.values():
+            if demand.destination.id not in destination_ids:
+                continue
+            ipd = self._items_per_destination[demand.destination.id]
+            for (s_idx, k_id), var in self._x[demand.demand_id].items():
+                self.m.chgCoeff(self._constrs[f"approx_maxstops_{k_id}_{s_idx}"], var, 1 / ipd)
+
+        self._total_weight += weight_delta
+        AvgLoad = self._total_weight / len(self.input_data.planning_horizon)
+        for day_idx in range(len(self.input_data.planning_horizon)):
+            self._constrs[f"pos_dev_{day_idx}"].RHS = AvgLoad
+            self._constrs[f"neg_dev_{day_idx}"].RHS = -AvgLoad
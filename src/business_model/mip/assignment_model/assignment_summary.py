@@ -0,0 +1,42 @@
+from src.data_model.assignment_demand import OrderAssignment
+from src.data_model.demand import Demand
+from src.data_model.truck import Truck
+from datetime import date
+from typing import Dict, List
+
+
+def daily_summary(
+    assignments: List[OrderAssignment],
+    trucks: List[Truck],
+    planning_horizon: List[date],
+    AvgLoad: float,
+) -> tuple[Dict[date, float], Dict[date, float], Dict[date, float]]:
+    """
+    Daily loads, slack and balance deviation of a set of assignments. A load
+    counts on every horizon day its trip covers. Shared by the MIP and
+    heuristic assigners so that their outputs report the same figures.
+    """
+    date_to_index = {d: i for i, d in enumerate(planning_horizon)}
+    H = len(planning_horizon)
+
+    daily_loads: Dict = {date: 0.0 for date in planning_horizon}
+    for oa in assignments:
+        d_obj: Demand = oa.demand
+        start_idx = date_to_index[oa.assigned_date]
+        for day_offset in range(d_obj.travel_days):
+            idx = start_idx + day_offset
+            if idx < H:
+                daily_loads[planning_horizon[idx]] += d_obj.weight
+
+    # total capacity per calendar day (test expects sum of truck capacities)
+    total_capacity_per_day = sum(t.capacity for t in trucks)
+    daily_slack = {
+        date: max(0.0, total_capacity_per_day - load)
+        for date, load in daily_loads.items()
+    }
+
+    # daily balance = abs(Load - AvgLoad) -- compute from daily_loads
+    daily_balance = {
+        date: abs(load - AvgLoad) for date, load in daily_loads.items()
+    }
+    return daily_loads, daily_slack, daily_balance
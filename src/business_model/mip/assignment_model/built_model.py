@@ -0,0 +1,129 @@
+import gurobipy as gp
+from gurobipy import GRB
+import numpy as np
+from dataclasses import dataclass
+from typing import Iterator, List, Tuple
+from src.data_model.demand import Demand
+from src.data_model.demand_table import DemandTable
+from src.data_model.truck import Truck
+from src.data_model.truck_type import TruckType
+from src.business_model.mip.assignment_model.truck_dispatch import dispatch_to_trucks
+from src.business_model.solution_values import nonzero_values
+
+
+@dataclass
+class BuiltAssignmentModel:
+    """
+    An assignment MIP that has been built but not solved yet, with handles to
+    the variables the result extraction needs. x is keyed by
+    (demand row, start day index, truck id), or (demand row, start day index)
+    for the truck-less model. When demand_table is aggregated, demand rows
+    are classes and x counts how many of their items take that slot. The
+    truck index runs over truck_types, which are single trucks unless the
+    fleet was aggregated.
+    """
+
+    model: gp.Model
+    demand_table: DemandTable
+    x: gp.tupledict
+    Load: gp.tupledict
+    z: gp.tupledict
+    slack: gp.tupledict
+    u: gp.tupledict | None = None
+    y: gp.tupledict | None = None
+    truck_types: List[TruckType] | None = None
+
+    def assigned_items(self) -> Iterator[Tuple[Demand, tuple]]:
+        """
+        (demand, rest of the x key) for every assigned item of the solved
+        model, in x key order. Classes hand out their items in row order.
+        """
+        table = self.demand_table
+        if not table.is_aggregated:
+            for key in nonzero_values(self.model, self.x):
+                yield table.demand(key[0]), key[1:]
+            return
+
+        handed_out = [0] * len(table)
+        for key, value in nonzero_values(self.model, self.x).items():
+            n = round(value)
+            c = key[0]
+            for item in table.members[c][handed_out[c] : handed_out[c] + n]:
+                yield table.items.demand(item), key[1:]
+            handed_out[c] += n
+
+    def assigned_to_trucks(self) -> Tuple[List[Tuple[Demand, int, Truck]], List[Demand]]:
+        """
+        (demand, start day index, truck) for every assigned item of a solved
+        truck-indexed model, with truck types dispatched to concrete trucks,
+        and the demands that overflow their truck in that dispatch.
+        """
+        assigned = [(demand, s_idx, k_id) for demand, (s_idx, k_id) in self.assigned_items()]
+        table = self.demand_table
+        items_per_destination = dict(
+            zip(table.destination_ids.tolist(), table.items_per_destination().tolist())
+        )
+        trucks, overflow = dispatch_to_trucks(
+            assigned,
+            self.truck_types,
+            len(table.planning_horizon),
+            items_per_destination,
+        )
+        return (
+            [(demand, s_idx, truck) for (demand, s_idx, _), truck in zip(assigned, trucks)],
+            [assigned[n][0] for n in overflow],
+        )
+
+
+@dataclass
+class TruckPreload:
+    """
+    Weight and area already on the trucks from trips fixed outside the model,
+    per truck type (in the model's type order) and horizon day.
+    """
+
+    weight: np.ndarray
+    area: np.ndarray
+
+
+def per_class(demand_table: DemandTable, item_values: np.ndarray) -> np.ndarray:
+    """
+    Values given per row of the table an aggregated table was made from, taken
+    per class; values of an item table are returned as they are.
+    """
+    if not demand_table.is_aggregated:
+        return item_values
+    return np.asarray(item_values)[[rows[0] for rows in demand_table.members]]
+
+
+def assignment_ub(
+    keys: list, demand_table: DemandTable, truck_types: List[TruckType] | None = None
+) -> np.ndarray:
+    """
+    Upper bounds of x over the given keys, whose first element is the demand
+    row and whose last, if truck_types is given, the truck type id: the class
+    size (1 for item tables), or 0 where a row does not fit a single truck of
+    a multi-truck type, which its count * capacity rows alone would allow.
+    """
+    rows = np.fromiter((key[0] for key in keys), dtype=np.int64, count=len(keys))
+    ub = demand_table.count[rows].astype(float)
+    for t in truck_types or []:
+        if t.count == 1:
+            continue
+        inner_size = np.inf if t.inner_size is None else t.inner_size
+        too_big = (demand_table.weight > t.capacity) | (demand_table.area > inner_size)
+        of_type = np.fromiter((key[-1] == t.id for key in keys), dtype=bool, count=len(keys))
+        ub[of_type & too_big[rows]] = 0
+    return ub
+
+
+def add_assignment_vars(
+    m: gp.Model, keys: list, demand_table: DemandTable, truck_types: List[TruckType] | None = None
+) -> gp.tupledict:
+    """
+    x over the given keys, whose first element is the demand row: binary for
+    item tables, integer up to the class size for aggregated ones.
+    """
+    ub = assignment_ub(keys, demand_table, truck_types).tolist()
+    vtype = GRB.INTEGER if demand_table.is_aggregated else GRB.BINARY
+    return m.addVars(keys, ub=ub, vtype=vtype, name="x")
@@ -0,0 +1,345 @@
+"""
+Matrix-API builders for the assignment MIPs.
+
+Each builder creates the same variables (same order and names) and the same
+constraint rows as its quicksum counterpart, but assembles every constraint
+block as a SciPy sparse matrix from the DemandTable arrays and adds it with a
+single Gurobi call. Select them with use_matrix_api=True on the public
+assignment functions.
+"""
+import gurobipy as gp
+from gurobipy import GRB
+import numpy as np
+import scipy.sparse as sp
+import config
+from src.data_model.assignment_Input import AssignmentInput
+from src.data_model.demand_table import DemandTable
+from src.data_model.truck_type import TruckType, group_truck_types
+from src.business_model.mip.assignment_model.built_model import (
+    BuiltAssignmentModel,
+    TruckPreload,
+    assignment_ub,
+)
+
+
+def _sparse(rows, cols, values, shape) -> sp.csr_matrix:
+    return sp.csr_matrix((values, (rows, cols)), shape=shape)
+
+
+def _pair_truck_columns(pairs: np.ndarray, n_trucks: int) -> np.ndarray:
+    """Columns of x[pair, k] for every pair and every truck position k, pair-major."""
+    return (pairs[:, None] * n_trucks + np.arange(n_trucks)[None, :]).ravel()
+
+
+def _add_x(
+    m: gp.Model, table: DemandTable, keys: list[tuple], truck_types: list[TruckType] | None = None
+):
+    """x over keys starting with the demand row, typed, bounded and named like the quicksum builders."""
+    names = [f"x[{','.join(map(str, key))}]" for key in keys]
+    x = m.addMVar(
+        len(keys),
+        ub=assignment_ub(keys, table, truck_types),
+        vtype=GRB.INTEGER if table.is_aggregated else GRB.BINARY,
+        name=names,
+    )
+    return x, gp.tupledict(zip(keys, x.tolist()))
+
+
+def _x_keys(table: DemandTable, truck_ids: list[int]) -> list[tuple]:
+    pair_row, pair_start = table.start_pairs()
+    return [
+        (i, s, k)
+        for i, s in zip(pair_row.tolist(), pair_start.tolist())
+        for k in truck_ids
+    ]
+
+
+def _day_vars(m: gp.Model, H: int, name: str):
+    var = m.addMVar(H, lb=0, name=name)
+    return var, gp.tupledict(enumerate(var.tolist()))
+
+
+def _truck_day_load_matrix(
+    table: DemandTable, values: np.ndarray, n_trucks: int, H: int
+) -> sp.csr_matrix:
+    """Row k*H + d sums values[i] * x[i, s, k] over the pairs (i, s) active on day d."""
+    pair_row, _ = table.start_pairs()
+    cover_pair, cover_day = table.covered_days()
+    trucks = np.arange(n_trucks)[:, None]
+    return _sparse(
+        (trucks * H + cover_day[None, :]).ravel(),
+        (cover_pair[None, :] * n_trucks + trucks).ravel(),
+        np.tile(values[pair_row[cover_pair]], n_trucks),
+        (n_trucks * H, len(pair_row) * n_trucks),
+    )
+
+
+def _day_load_matrix(table: DemandTable, n_trucks: int, H: int) -> sp.csr_matrix:
+    """Row d sums weight[i] * x[i, s, k] over the pairs (i, s) active on day d and all trucks."""
+    pair_row, _ = table.start_pairs()
+    cover_pair, cover_day = table.covered_days()
+    return _sparse(
+        np.repeat(cover_day, n_trucks),
+        _pair_truck_columns(cover_pair, n_trucks),
+        np.repeat(table.weight[pair_row[cover_pair]], n_trucks),
+        (H, len(pair_row) * n_trucks),
+    )
+
+
+def build_assign_orders_with_truck_matrix(
+    input_data: AssignmentInput,
+    demand_table: DemandTable | None = None,
+    truck_types: list[TruckType] | None = None,
+) -> BuiltAssignmentModel:
+    trucks = truck_types or group_truck_types(input_data.trucks, aggregate=False)
+    planning_horizon = input_data.planning_horizon
+    if demand_table is None:
+        demand_table = DemandTable.from_demands(input_data.demands, planning_horizon)
+    table = demand_table
+    H, K = len(planning_horizon), len(trucks)
+    truck_ids = [t.id for t in trucks]
+    pair_row, pair_start = table.start_pairs()
+    P = len(pair_row)
+    AvgLoad = table.total_weight / H
+
+    m = gp.Model("AssignOrders_Truck")
+    x, x_dict = _add_x(m, table, _x_keys(table, truck_ids), trucks)
+    Load, Load_dict = _day_vars(m, H, "Load")
+    z, z_dict = _day_vars(m, H, "BalanceDeviation")
+    slack, slack_dict = _day_vars(m, H, "Slack")
+
+    # Each demand with a feasible start assigned exactly once
+    feasible_rows = np.flatnonzero(table.is_feasible)
+    assign_once = _sparse(
+        np.repeat(np.searchsorted(feasible_rows, pair_row), K),
+        np.arange(P * K),
+        np.ones(P * K),
+        (len(feasible_rows), P * K),
+    )
+    m.addConstr(assign_once @ x == table.count[feasible_rows], name="assign_once")
+
+    m.addConstr(Load - _day_load_matrix(table, K, H) @ x == 0, name="load_active")
+
+    truck_count = np.array([t.count for t in trucks])
+    capacity = np.array([t.count * t.capacity for t in trucks], dtype=float)
+    inner_size = np.array([t.count * t.inner_size for t in trucks], dtype=float)
+    m.addConstr(
+        _truck_day_load_matrix(table, table.weight, K, H) @ x <= np.repeat(capacity, H),
+        name="truckcap",
+    )
+    m.addConstr(
+        _truck_day_load_matrix(table, table.area, K, H) @ x <= np.repeat(inner_size, H),
+        name="size_cap_truck",
+    )
+
+    m.addConstr(Load - AvgLoad <= z, name="pos_dev")
+    m.addConstr(AvgLoad - Load <= z, name="neg_dev")
+
+    # each item counts 1/(number of items of its destination) towards the stops
+    items_per_destination = table.items_per_destination()[table.destination]
+    truck_pos = np.arange(K)[:, None]
+    max_stops = _sparse(
+        (truck_pos * H + pair_start[None, :]).ravel(),
+        (np.arange(P)[None, :] * K + truck_pos).ravel(),
+        np.tile(1.0 / items_per_destination[pair_row], K),
+        (K * H, P * K),
+    )
+    m.addConstr(
+        max_stops @ x <= np.repeat(config.MAX_STOPS * truck_count, H), name="approx_maxstops"
+    )
+
+    m.setObjective(
+        input_data.w_balance * z.sum() + input_data.w_slack * slack.sum(), GRB.MINIMIZE
+    )
+
+    m.params.OutputFlag = 0  # display solver output
+    m.params.TimeLimit = 1800  # 30 minutes
+
+    return BuiltAssignmentModel(
+        model=m,
+        demand_table=table,
+        x=x_dict,
+        Load=Load_dict,
+        z=z_dict,
+        slack=slack_dict,
+        truck_types=trucks,
+    )
+
+
+def build_assignment_orders_to_trucks_days_matrix(
+    input_data: AssignmentInput,
+    demand_table: DemandTable | None = None,
+    truck_types: list[TruckType] | None = None,
+    optional: np.ndarray | None = None,
+    preload: TruckPreload | None = None,
+) -> BuiltAssignmentModel:
+    trucks = truck_types or group_truck_types(input_data.trucks, aggregate=False)
+    planning_horizon = input_data.planning_horizon
+    if demand_table is None:
+        demand_table = DemandTable.from_demands(input_data.demands, planning_horizon)
+    table = demand_table
+    D, H, K = len(table), len(planning_horizon), len(trucks)
+    if preload is None:
+        preload = TruckPreload(np.zeros((K, H)), np.zeros((K, H)))
+    truck_ids = [t.id for t in trucks]
+    pair_row, pair_start = table.start_pairs()
+    cover_pair, cover_day = table.covered_days()
+    P = len(pair_row)
+    AvgLoad = table.total_weight / H
+
+    m = gp.Model("AssignOrders_Truck")
+    x, x_dict = _add_x(m, table, _x_keys(table, truck_ids), trucks)
+
+    # u is 1 if truck k visits destination dest on day d
+    unique_dest_ids = np.unique(table.destination)
+    U = len(unique_dest_ids)
+    u_keys = [
+        (dest, d, k) for dest in unique_dest_ids.tolist() for d in range(H) for k in truck_ids
+    ]
+    u = m.addMVar(
+        U * H * K,
+        lb=0,
+        ub=1,
+        vtype=GRB.BINARY if table.is_aggregated else GRB.CONTINUOUS,
+        name=[f"u[{dest},{d},{k}]" for dest, d, k in u_keys],
+    )
+    Load, Load_dict = _day_vars(m, H, "Load")
+    y_keys = [(d, k) for d in range(H) for k in truck_ids]
+    y = m.addMVar(
+        H * K,
+        vtype=GRB.BINARY if all(t.count == 1 for t in trucks) else GRB.INTEGER,
+        name=[f"y[{d},{k}]" for d, k in y_keys],
+    )
+    z, z_dict = _day_vars(m, H, "BalanceDeviation")
+    slack, slack_dict = _day_vars(m, H, "Slack")
+
+    # 1. Every item assigned exactly once (optional items at most once)
+    assign_once = _sparse(np.repeat(pair_row, K), np.arange(P * K), np.ones(P * K), (D, P * K))
+    if optional is None:
+        m.addConstr(assign_once @ x == table.count)
+    else:
+        optional = np.asarray(optional, dtype=bool)
+        m.addConstr(assign_once[~optional] @ x == table.count[~optional])
+        m.addConstr(assign_once[optional] @ x <= table.count[optional])
+
+    # 2. truck-day capacity and size constraints, less what is preloaded
+    truck_count = np.array([t.count for t in trucks])
+    capacity = np.array([t.count * t.capacity for t in trucks], dtype=float)
+    inner_size = np.array([t.count * t.inner_size for t in trucks], dtype=float)
+    m.addConstr(
+        _truck_day_load_matrix(table, table.weight, K, H) @ x
+        <= np.repeat(capacity, H) - preload.weight.ravel()
+    )
+    m.addConstr(
+        _truck_day_load_matrix(table, table.area, K, H) @ x
+        <= np.repeat(inner_size, H) - preload.area.ravel()
+    )
+
+    # total load, defined for the last horizon day only like the quicksum builder
+    last_day_load = _day_load_matrix(table, K, H)[H - 1 :]
+    m.addConstr(Load[H - 1 :] - last_day_load @ x == preload.weight.sum(axis=0)[H - 1 :])
+
+    # 3) item stop coupling: count[i] * u[dest, s, k] >= x[i, s, k]
+    dest_pos = np.searchsorted(unique_dest_ids, table.destination[pair_row])
+    u_of_x = _pair_truck_columns((dest_pos * H + pair_start), K)
+    coupling = _sparse(
+        np.arange(P * K), u_of_x, np.repeat(table.count[pair_row], K), (P * K, U * H * K)
+    )
+    m.addConstr(coupling @ u - x >= 0)
+
+    # 5. Max stops per truck per day
+    dest, day, truck_pos = np.meshgrid(np.arange(U), np.arange(H), np.arange(K), indexing="ij")
+    max_stops = _sparse(
+        (truck_pos * H + day).ravel(),
+        ((dest * H + day) * K + truck_pos).ravel(),
+        np.ones(U * H * K),
+        (K * H, U * H * K),
+    )
+    m.addConstr(max_stops @ u <= np.repeat(config.MAX_STOPS * truck_count, H))
+
+    # 6. availability of trucks: count[i] * y[d, k] >= x[i, s, k] on every day the trip covers
+    truck_pos = np.arange(K)[:, None]
+    n_links = len(cover_pair) * K
+    y_link = _sparse(
+        np.arange(n_links),
+        (cover_day[None, :] * K + truck_pos).ravel(),
+        np.tile(table.count[pair_row[cover_pair]], K),
+        (n_links, H * K),
+    )
+    x_link = _sparse(
+        np.arange(n_links),
+        (cover_pair[None, :] * K + truck_pos).ravel(),
+        np.ones(n_links),
+        (n_links, P * K),
+    )
+    m.addConstr(y_link @ y - x_link @ x >= 0, name="truck_busy_link")
+    m.addConstr(y <= np.tile(truck_count, H), name="truck_busy_limit")
+
+    n_trucks = len(input_data.trucks)
+    m.addConstr(n_trucks * Load - AvgLoad <= z, name="pos_dev")
+    m.addConstr(AvgLoad - n_trucks * Load <= z, name="neg_dev")
+
+    m.setObjective(
+        input_data.w_balance * z.sum() + input_data.w_slack * slack.sum(), GRB.MINIMIZE
+    )
+    m.params.OutputFlag = 0  # display solver output
+    m.params.TimeLimit = 3600  # 30 minutes
+
+    return BuiltAssignmentModel(
+        model=m,
+        demand_table=table,
+        x=x_dict,
+        Load=Load_dict,
+        z=z_dict,
+        slack=slack_dict,
+        u=gp.tupledict(zip(u_keys, u.tolist())),
+        y=gp.tupledict(zip(y_keys, y.tolist())),
+        truck_types=trucks,
+    )
+
+
+def build_assign_orders_matrix(
+    input_data: AssignmentInput, demand_table: DemandTable | None = None
+) -> BuiltAssignmentModel:
+    planning_horizon = input_data.planning_horizon
+    if demand_table is None:
+        demand_table = DemandTable.from_demands(input_data.demands, planning_horizon)
+    table = demand_table
+    D, H = len(table), len(planning_horizon)
+    pair_row, pair_start = table.start_pairs()
+    P = len(pair_row)
+    Cap = sum(t.capacity for t in input_data.trucks)
+    AvgLoad = table.total_weight / H
+
+    m = gp.Model("Order_Assignment")
+    x, x_dict = _add_x(m, table, list(zip(pair_row.tolist(), pair_start.tolist())))
+    Load, Load_dict = _day_vars(m, H, "l")
+    z, z_dict = _day_vars(m, H, "z")
+    slack, slack_dict = _day_vars(m, H, "s")
+
+    # Each order assigned exactly once, within its pickup/due date window
+    m.addConstr(_sparse(pair_row, np.arange(P), np.ones(P), (D, P)) @ x == table.count)
+
+    # Define daily loads
+    load_def = _sparse(pair_start, np.arange(P), table.weight[pair_row], (H, P))
+    m.addConstr(Load - load_def @ x == 0, name="load_def")
+
+    # Capacity (with slack)
+    m.addConstr(Load - slack <= Cap, name="capacity")
+
+    # Balance deviation
+    m.addConstr(z - Load >= -AvgLoad, name="pos_dev")
+    m.addConstr(z + Load >= AvgLoad, name="neg_dev")
+
+    m.setObjective(
+        input_data.w_balance * z.sum() + input_data.w_slack * slack.sum(), GRB.MINIMIZE
+    )
+
+    return BuiltAssignmentModel(
+        model=m,
+        demand_table=table,
+        x=x_dict,
+        Load=Load_dict,
+        z=z_dict,
+        slack=slack_dict,
+    )
@@ -5,10 +5,26 @@ from src.data_model.assignment_demand import OrderAssignment
 from src.data_model.assignment_Input import AssignmentInput
 from src.data_model.assignment_output import AssignmentOutput
 from src.data_model.demand import Demand
+from src.data_model.demand_table import DemandTable
 from src.data_model.truck import Truck
+from src.data_model.truck_type import TruckType, group_truck_types
+from src.business_model.mip.assignment_model.built_model import (
+    BuiltAssignmentModel,
+    TruckPreload,
+    add_assignment_vars,
+    per_class,
+)
+from src.business_model.mip.assignment_model.assignment_summary import daily_summary
+from src.business_model.mip.assignment_model.matrix_builder import (
+    build_assign_orders_with_truck_matrix,
+    build_assignment_orders_to_trucks_days_matrix,
+)
+from src.business_model.heuristic.greedy_assignment import set_greedy_start
+from src.business_model.heuristic.lp_rounding import solve_lp_rounding
+from src.business_model.solve_control import SolveControl
 from datetime import date, datetime
+import numpy as np
 from typing import List, Dict
-from collections import defaultdict
 import config
 
 
@@ -24,38 +40,63 @@ def _build_date_index_maps(
     return date_to_index, index_to_date
 
 
-def assign_orders_with_truck(input_data: AssignmentInput) -> AssignmentOutput:
-    demands: list[Demand] = input_data.demands
-    trucks: list[Truck] = input_data.trucks
+def report_overflow(overflow: List[Demand]) -> None:
+    """Print the demands a truck-type dispatch could not fit onto a truck."""
+    if overflow:
+        print(
+            "Demands overflowing their truck after dispatch: "
+            f"{[d.demand_id for d in overflow]}"
+        )
+
+
+def build_assign_orders_with_truck_model(
+    input_data: AssignmentInput,
+    demand_table: DemandTable | None = None,
+    use_matrix_api: bool = False,
+    aggregate_demands: bool = False,
+    aggregate_trucks: bool = False,
+) -> BuiltAssignmentModel:
+    if demand_table is None:
+        demand_table = DemandTable.from_demands(input_data.demands, input_data.planning_horizon)
+    if aggregate_demands:
+        demand_table = demand_table.aggregate()
+    # k indexes truck types: one per truck unless identical trucks are aggregated
+    trucks: list[TruckType] = group_truck_types(input_data.trucks, aggregate_trucks)
+    if use_matrix_api:
+        return build_assign_orders_with_truck_matrix(input_data, demand_table, trucks)
+
     planning_horizon: list[date] = input_data.planning_horizon
     w_balance: float = input_data.w_balance
     w_slack: float = input_data.w_slack
 
+    D = len(demand_table)
+    count = demand_table.count.tolist()
+    weight = demand_table.weight.tolist()
+    area = demand_table.area.tolist()
+    destination = demand_table.destination.tolist()
+    starts = [demand_table.feasible_starts(i) for i in range(D)]
+
     H = len(planning_horizon)
     planning_horizon_range = range(H)
 
     # Compute average load per day (for balance)
-    total_weight = sum(d.weight for d in demands)
+    total_weight = demand_table.total_weight
     AvgLoad = total_weight / H
-    demand_ids = [d.demand_id for d in demands]
     truck_ids = [t.id for t in trucks]
 
-    date_to_index, index_to_date = _build_date_index_maps(planning_horizon)
-
-    dest_to_demands = defaultdict(list)
-    for d in demands:
-        dest_to_demands[d.destination].append(d)
+    items_per_destination = demand_table.items_per_destination().tolist()
 
     m = gp.Model("AssignOrders_Truck")
 
     # Decision variable x[i,t,k] = 1 if demand i assigned to truck k starting on day t
-    triples = (
-        (d.demand_id, date_to_index[fd], k_id)
-        for d in demands
-        for fd in d.feasible_dates(planning_horizon)
+    # (for aggregated tables: how many items of class i)
+    triples = [
+        (i, s_idx, k_id)
+        for i in range(D)
+        for s_idx in starts[i]
         for k_id in truck_ids
-    )
-    x = m.addVars(triples, vtype=GRB.BINARY, name="x")
+    ]
+    x = add_assignment_vars(m, triples, demand_table, trucks)
     # Daily total load and balance vars
     Load = m.addVars(planning_horizon_range, lb=0, name="Load")
     z = m.addVars(planning_horizon_range, lb=0, name="BalanceDeviation")
@@ -63,72 +104,54 @@ def assign_orders_with_truck(input_data: AssignmentInput) -> AssignmentOutput:
 
     # Each demand assigned exactly once (across all trucks and dates)
     infeasible_demands = []
-    for d in demands:
-        feasible_dates = d.feasible_dates(planning_horizon)
-        feasible_idxs = [date_to_index[fd] for fd in feasible_dates]
-        if not feasible_idxs:
-            infeasible_demands.append(d.demand_id)
+    for i in range(D):
+        if not starts[i]:
+            infeasible_demands.append(demand_table.demand_ids[i])
             continue
         m.addConstr(
             gp.quicksum(
-                x[d.demand_id, t_idx, k_id]
-                for t_idx in feasible_idxs
+                x[i, t_idx, k_id]
+                for t_idx in starts[i]
                 for k_id in truck_ids
             )
-            == 1,
-            name=f"assign_once_{d.demand_id}",
+            == count[i],
+            name=f"assign_once_{i}",
         )
 
 
     for day_idx in planning_horizon_range:
-        day_date = index_to_date[day_idx]
         expr = gp.quicksum(
-            d.weight * x[d.demand_id, s_idx, k_id]
-            for d in demands
-            for s in d.feasible_dates(planning_horizon)
-            for s_idx in [date_to_index[s]]
+            weight[i] * x[i, s_idx, k_id]
+            for i, s_idx in demand_table.pairs_active_on(day_idx)
             for k_id in truck_ids
-            if s_idx <= day_idx < s_idx + d.travel_days
         )
         m.addConstr(Load[day_idx] == expr, name=f"load_active_{day_idx}")
 
     for t in trucks:
         for day_idx in planning_horizon_range:
-            expr_weight = gp.quicksum(
-                d.weight * x[d.demand_id, s_idx, t.id]
-                for d in demands
-                for s in d.feasible_dates(planning_horizon)
-                for s_idx in [date_to_index[s]]
-                if s_idx <= day_idx < s_idx + d.travel_days
-            )
-            expr_size = gp.quicksum(
-                d.size_area * x[d.demand_id, s_idx, t.id]
-                for d in demands
-                for s in d.feasible_dates(planning_horizon)
-                for s_idx in [date_to_index[s]]
-                if s_idx <= day_idx < s_idx + d.travel_days
+            active = demand_table.pairs_active_on(day_idx)
+            expr_weight = gp.quicksum(weight[i] * x[i, s_idx, t.id] for i, s_idx in active)
+            expr_size = gp.quicksum(area[i] * x[i, s_idx, t.id] for i, s_idx in active)
+            m.addConstr(
+                expr_weight <= t.count * t.capacity, name=f"truckcap_{t.id}_{day_idx}"
             )
-            m.addConstr(expr_weight <= t.capacity, name=f"truckcap_{t.id}_{day_idx}")
             m.addConstr(
-                expr_size <= t.inner_size, name=f"size_cap_truck_{t.id}_{day_idx}"
+                expr_size <= t.count * t.inner_size, name=f"size_cap_truck_{t.id}_{day_idx}"
             )
 
     for day in planning_horizon_range:
         m.addConstr(Load[day] - AvgLoad <= z[day], name=f"pos_dev_{day}")
         m.addConstr(AvgLoad - Load[day] <= z[day], name=f"neg_dev_{day}")
 
+    # each item counts 1/(number of items of its destination) towards the stops
     for t in trucks:
         for s_idx in planning_horizon_range:
             m.addConstr(
                 gp.quicksum(
-                    gp.quicksum(
-                        x[d.demand_id, s_idx, t.id]
-                        for d in dest_to_demands[dest]
-                        if s_idx in [date_to_index[s] for s in d.feasible_dates(planning_horizon)]
-                    ) / len(dest_to_demands[dest])
-                    for dest in dest_to_demands
+                    x[i, s_idx, t.id] / items_per_destination[destination[i]]
+                    for i in demand_table.rows_starting_on(s_idx)
                 )
-                <= config.MAX_STOPS,
+                <= config.MAX_STOPS * t.count,
                 name=f"approx_maxstops_{t.id}_{s_idx}",
             )
 
@@ -141,7 +164,39 @@ def assign_orders_with_truck(input_data: AssignmentInput) -> AssignmentOutput:
     m.params.OutputFlag = 0  # display solver output
     m.params.TimeLimit = 1800  # 30 minutes
 
-    m.optimize()
+    return BuiltAssignmentModel(
+        model=m, demand_table=demand_table, x=x, Load=Load, z=z, slack=slack, truck_types=trucks
+    )
+
+
+def assign_orders_with_truck(
+    input_data: AssignmentInput,
+    demand_table: DemandTable | None = None,
+    use_matrix_api: bool = False,
+    aggregate_demands: bool = False,
+    aggregate_trucks: bool = False,
+    warm_start: bool = False,
+    solve_control: SolveControl | None = None,
+) -> AssignmentOutput:
+    """
+    With aggregate_trucks a plan that does not pack onto the trucks of its
+    types is solved again with one truck per type.
+    """
+    built = build_assign_orders_with_truck_model(
+        input_data, demand_table, use_matrix_api, aggregate_demands, aggregate_trucks
+    )
+    m, demand_table = built.model, built.demand_table
+    trucks: list[Truck] = input_data.trucks
+    planning_horizon: list[date] = input_data.planning_horizon
+    H = len(planning_horizon)
+    planning_horizon_range = range(H)
+    AvgLoad = demand_table.total_weight / H
+    date_to_index, index_to_date = _build_date_index_maps(planning_horizon)
+
+    if warm_start:
+        set_greedy_start(built)
+    # keep the best incumbent when the budget runs out
+    solved = (solve_control or SolveControl()).optimize(m)
 
     # Extract results
     assignments = []
@@ -150,41 +205,29 @@ def assign_orders_with_truck(input_data: AssignmentInput) -> AssignmentOutput:
     daily_balance = {}
 
     # --- Extract solution ---
-    if m.status == GRB.OPTIMAL:
-        for d in demands:
-            for s in d.feasible_dates(planning_horizon):
-                s_idx = date_to_index[s]
-                for k in trucks:
-                    if x[d.demand_id, s_idx, k.id].X > 0.5:
-                        oa = OrderAssignment(
-                            demand=d,
-                            assigned_date=index_to_date[s_idx],
-                            truck=k,
-                        )
-
-                        assignments.append(oa)
-
-        daily_loads: Dict = {date: 0.0 for date in planning_horizon}
-        for oa in assignments:
-            d_obj: Demand = oa.demand
-            start_idx = date_to_index[oa.assigned_date]
-            for day_offset in range(d_obj.travel_days):
-                idx = start_idx + day_offset
-                if idx < H:
-                    day_date = index_to_date[idx]
-                    daily_loads[day_date] += d_obj.weight
-
-        # total capacity per calendar day (test expects sum of truck capacities)
-        total_capacity_per_day = sum(t.capacity for t in trucks)
-        daily_slack = {
-            date: max(0.0, total_capacity_per_day - load)
-            for date, load in daily_loads.items()
-        }
-
-        # daily balance = abs(Load - AvgLoad) -- compute from daily_loads
-        daily_balance = {
-            date: abs(load - AvgLoad) for date, load in daily_loads.items()
-        }
+    if solved.has_solution:
+        dispatched, overflow = built.assigned_to_trucks()
+        if overflow and aggregate_trucks:
+            report_overflow(overflow)
+            print("Solving again truck by truck")
+            # the table is already aggregated if asked
+            return assign_orders_with_truck(
+                input_data, demand_table, use_matrix_api,
+                aggregate_trucks=False, warm_start=warm_start, solve_control=solve_control,
+            )
+        for demand, s_idx, truck in dispatched:
+            oa = OrderAssignment(
+                demand=demand,
+                assigned_date=index_to_date[s_idx],
+                truck=truck,
+            )
+
+            assignments.append(oa)
+        report_overflow(overflow)
+
+        daily_loads, daily_slack, daily_balance = daily_summary(
+            assignments, trucks, planning_horizon, AvgLoad
+        )
 
         # total weight of each truck used (for info)
         truck_loads = {t.id: 0.0 for t in trucks}
@@ -208,20 +251,13 @@ def assign_orders_with_truck(input_data: AssignmentInput) -> AssignmentOutput:
 
         # available trucks in each day (for info)
         for day in planning_horizon_range:
-            available_trucks = sum(
-                1
-                for t in trucks
-                if any(
-                    x[d.demand_id, day, t.id].X > 0.5
-                    for d in demands
-                    if day
-                    in [date_to_index[fd] for fd in d.feasible_dates(planning_horizon)]
-                )
+            available_trucks = len(
+                {oa.truck.id for oa in assignments if oa.assigned_date == index_to_date[day]}
             )
             print(f"Day {index_to_date[day]}: {available_trucks} trucks used.")
 
         # Objective value
-        objective_value = m.objVal
+        objective_value = solved.objective_value
 
         # Build and return AssignmentOutput
         result = AssignmentOutput(
@@ -230,7 +266,9 @@ def assign_orders_with_truck(input_data: AssignmentInput) -> AssignmentOutput:
             daily_slack=daily_slack,
             daily_balance=daily_balance,
             objective_value=objective_value,
-            is_success=True,
+            best_bound=solved.best_bound,
+            mip_gap=solved.mip_gap,
+            is_success=not overflow,
         )
 
         return result
@@ -246,41 +284,76 @@ def assign_orders_with_truck(input_data: AssignmentInput) -> AssignmentOutput:
 
 
 
-def assignment_orders_to_trucks_days(input_data: AssignmentInput) -> AssignmentOutput:
-    demands: list[Demand] = input_data.demands
-    trucks: list[Truck] = input_data.trucks
+def build_assignment_orders_to_trucks_days_model(
+    input_data: AssignmentInput,
+    demand_table: DemandTable | None = None,
+    use_matrix_api: bool = False,
+    aggregate_demands: bool = False,
+    aggregate_trucks: bool = False,
+    optional: np.ndarray | None = None,
+    preload: TruckPreload | None = None,
+) -> BuiltAssignmentModel:
+    """
+    optional marks demand rows that may stay unassigned (at most count items
+    instead of exactly count), and preload is truck load already fixed on the
+    horizon days; the rolling-horizon driver uses both.
+    """
+    if demand_table is None:
+        demand_table = DemandTable.from_demands(input_data.demands, input_data.planning_horizon)
+    if aggregate_demands:
+        demand_table = demand_table.aggregate()
+        if optional is not None:
+            optional = per_class(demand_table, optional)
+    # k indexes truck types: one per truck unless identical trucks are aggregated
+    trucks: list[TruckType] = group_truck_types(input_data.trucks, aggregate_trucks)
+    if use_matrix_api:
+        return build_assignment_orders_to_trucks_days_matrix(
+            input_data, demand_table, trucks, optional, preload
+        )
+
     planning_horizon: list[date] = input_data.planning_horizon
     w_balance: float = input_data.w_balance
     w_slack: float = input_data.w_slack
 
+    D = len(demand_table)
+    count = demand_table.count.tolist()
+    weight = demand_table.weight.tolist()
+    area = demand_table.area.tolist()
+    travel_days = demand_table.travel_days.tolist()
+    destination = demand_table.destination.tolist()
+    starts = [demand_table.feasible_starts(i) for i in range(D)]
+
     H = len(planning_horizon)
     planning_horizon_range = range(H)
 
     # Compute average load per day (for balance)
-    total_weight = sum(d.weight for d in demands)
+    total_weight = demand_table.total_weight
     AvgLoad = total_weight / H
     truck_ids = [t.id for t in trucks]
 
-    date_to_index, index_to_date = _build_date_index_maps(planning_horizon)
-
-    dest_to_demands = defaultdict(list)
-    for d in demands:
-        dest_to_demands[d.destination].append(d)
+    is_optional = [False] * D if optional is None else np.asarray(optional, dtype=bool).tolist()
+    if preload is None:
+        preload = TruckPreload(np.zeros((len(trucks), H)), np.zeros((len(trucks), H)))
+    preload_weight = preload.weight.tolist()
+    preload_area = preload.area.tolist()
+    preload_total = preload.weight.sum(axis=0).tolist()
 
     # Build model
     m = gp.Model("AssignOrders_Truck")
 
     # Decision variable x is 1 if demand i assigned to truck k starting on day t
-    triples = (
-        (d.demand_id, date_to_index[fd], k_id)
-        for d in demands
-        for fd in d.feasible_dates(planning_horizon)
+    # (for aggregated tables: how many items of class i)
+    triples = [
+        (i, s_idx, k_id)
+        for i in range(D)
+        for s_idx in starts[i]
         for k_id in truck_ids
-    )
-    x = m.addVars(triples, vtype=GRB.BINARY, name="x")
+    ]
+    x = add_assignment_vars(m, triples, demand_table, trucks)
     
-    # u 1 if truck 𝑘 visits destination i on day d
-    unique_dest_ids = list({d.destination.id for d in demands})
+    # u 1 if (a truck of type) 𝑘 visits destination i on day d; binary once x
+    # counts class items, so that a single stop still covers the whole class
+    unique_dest_ids = sorted(set(destination))
     u = m.addVars(
         unique_dest_ids,
         planning_horizon_range,
@@ -288,102 +361,88 @@ def assignment_orders_to_trucks_days(input_data: AssignmentInput) -> AssignmentO
         name="u",
         lb=0,
         ub=1,
+        vtype=GRB.BINARY if demand_table.is_aggregated else GRB.CONTINUOUS,
     )
 
     # Daily total load and balance vars
     Load = m.addVars(planning_horizon_range, lb=0, name="Load")
-    # Truck k used on day t
-    y = m.addVars(len(planning_horizon), [t.id for t in trucks], vtype=GRB.BINARY, name="y")
+    # Truck k used on day t (for truck types: how many of its trucks)
+    y = m.addVars(
+        len(planning_horizon),
+        [t.id for t in trucks],
+        vtype=GRB.BINARY if all(t.count == 1 for t in trucks) else GRB.INTEGER,
+        name="y",
+    )
 
     # --- constraints ---
-    # 1. Every item assigned exactly once
-    for d in demands:
-        feasible_idxs = [date_to_index[fd] for fd in d.feasible_dates(planning_horizon)]
-        m.addConstr(
-            gp.quicksum(
-                x[d.demand_id, t_idx, k_id]
-                for t_idx in feasible_idxs
-                for k_id in truck_ids
-            )
-            == 1,
+    # 1. Every item assigned exactly once (optional items at most once)
+    for i in range(D):
+        assigned = gp.quicksum(
+            x[i, t_idx, k_id]
+            for t_idx in starts[i]
+            for k_id in truck_ids
         )
+        m.addConstr(assigned <= count[i] if is_optional[i] else assigned == count[i])
 
-    # 2. truck-day capacity and size constraints
-    for t in trucks:
+    # 2. truck-day capacity and size constraints, less what is preloaded
+    for k, t in enumerate(trucks):
         for day_idx in planning_horizon_range:
-            expr_weight = gp.quicksum(
-                d.weight * x[d.demand_id, s_idx, t.id]
-                for d in demands
-                for s_idx in [
-                    date_to_index[s] for s in d.feasible_dates(planning_horizon)
-                ]
-                if s_idx <= day_idx < s_idx + d.travel_days
-            )
-            expr_size = gp.quicksum(
-                d.size_area * x[d.demand_id, s_idx, t.id]
-                for d in demands
-                for s_idx in [
-                    date_to_index[s] for s in d.feasible_dates(planning_horizon)
-                ]
-                if s_idx <= day_idx < s_idx + d.travel_days
-            )
-            m.addConstr(expr_weight <= t.capacity)
-            m.addConstr(expr_size <= t.inner_size)
+            active = demand_table.pairs_active_on(day_idx)
+            expr_weight = gp.quicksum(weight[i] * x[i, s_idx, t.id] for i, s_idx in active)
+            expr_size = gp.quicksum(area[i] * x[i, s_idx, t.id] for i, s_idx in active)
+            m.addConstr(expr_weight <= t.count * t.capacity - preload_weight[k][day_idx])
+            m.addConstr(expr_size <= t.count * t.inner_size - preload_area[k][day_idx])
 
     # total load of truck k on day d
     for day_idx in planning_horizon_range:
         expr_weight = gp.quicksum(
-            d.weight * x[d.demand_id, s_idx, t.id]
-            for d in demands
-            for s_idx in [
-                date_to_index[s] for s in d.feasible_dates(planning_horizon)
-            ]
-            if s_idx <= day_idx < s_idx + d.travel_days
+            weight[i] * x[i, s_idx, t.id]
+            for i, s_idx in demand_table.pairs_active_on(day_idx)
             for t in trucks
         )
-    m.addConstr(Load[day_idx] == expr_weight)
+    m.addConstr(Load[day_idx] == expr_weight + preload_total[day_idx])
 
     # 3) item stop coupling
-    for d in demands:
-        dest = d.destination.id
-        feasible_idxs = [date_to_index[fd] for fd in d.feasible_dates(planning_horizon)]
-        for t_idx in feasible_idxs:
+    for i in range(D):
+        dest = destination[i]
+        for t_idx in starts[i]:
             for k_id in truck_ids:
-                m.addConstr(u[dest, t_idx, k_id] >= x[d.demand_id, t_idx, k_id])
+                m.addConstr(count[i] * u[dest, t_idx, k_id] >= x[i, t_idx, k_id])
 
     # 5. Max stops per truck per day
-    for t_id in truck_ids:
+    for t in trucks:
         for t_idx in planning_horizon_range:
-            destinations_that_day = list({d.destination.id for d in demands})
+            destinations_that_day = unique_dest_ids
             m.addConstr(
-                gp.quicksum(u[dest, t_idx, t_id] for dest in destinations_that_day)
-                <= config.MAX_STOPS
+                gp.quicksum(u[dest, t_idx, t.id] for dest in destinations_that_day)
+                <= config.MAX_STOPS * t.count
             )
     
     # 6. availability of trucks
     for t in trucks:
-        for d in demands:
-            for s in d.feasible_dates(planning_horizon):
-                s_idx = date_to_index[s]
-                for day_idx in range(s_idx, min(s_idx + d.travel_days, len(planning_horizon))):
+        for i in range(D):
+            for s_idx in starts[i]:
+                for day_idx in range(s_idx, min(s_idx + travel_days[i], len(planning_horizon))):
                     m.addConstr(
-                        y[day_idx, t.id] >= x[d.demand_id, s_idx, t.id],
-                        name=f"truck_busy_link_{d.demand_id}_{s_idx}_{t.id}_{day_idx}"
+                        count[i] * y[day_idx, t.id] >= x[i, s_idx, t.id],
+                        name=f"truck_busy_link_{i}_{s_idx}_{t.id}_{day_idx}"
                     )
     for t in trucks:
         for day_idx in range(len(planning_horizon)):
-            m.addConstr(y[day_idx, t.id] <= 1, name=f"truck_busy_limit_{t.id}_{day_idx}")
+            m.addConstr(
+                y[day_idx, t.id] <= t.count, name=f"truck_busy_limit_{t.id}_{day_idx}"
+            )
 
 
     z = m.addVars(planning_horizon_range, lb=0, name="BalanceDeviation")
     slack = m.addVars(planning_horizon_range, lb=0, name="Slack")
     for day in planning_horizon_range:
        m.addConstr(
-           gp.quicksum(Load[day] for t in trucks) - AvgLoad <= z[day],
+           gp.quicksum(Load[day] for t in input_data.trucks) - AvgLoad <= z[day],
            name=f"pos_dev_{day}",
        )
        m.addConstr(
-           AvgLoad - gp.quicksum(Load[day] for t in trucks) <= z[day],
+           AvgLoad - gp.quicksum(Load[day] for t in input_data.trucks) <= z[day],
            name=f"neg_dev_{day}",
        )
     
@@ -394,47 +453,83 @@ def assignment_orders_to_trucks_days(input_data: AssignmentInput) -> AssignmentO
     )
     m.params.OutputFlag = 0  # display solver output
     m.params.TimeLimit = 3600  # 30 minutes
-    # Solve
-    m.optimize()
 
-    if m.status == GRB.OPTIMAL:
+    return BuiltAssignmentModel(
+        model=m,
+        demand_table=demand_table,
+        x=x,
+        Load=Load,
+        z=z,
+        slack=slack,
+        u=u,
+        y=y,
+        truck_types=trucks,
+    )
+
+
+def assignment_orders_to_trucks_days(
+    input_data: AssignmentInput,
+    demand_table: DemandTable | None = None,
+    use_matrix_api: bool = False,
+    aggregate_demands: bool = False,
+    aggregate_trucks: bool = False,
+    warm_start: bool = False,
+    solve_control: SolveControl | None = None,
+    lp_rounding: bool = False,
+) -> AssignmentOutput:
+    """
+    lp_rounding switches from the exact MIP to the fast mode of
+    solve_lp_rounding: best_bound is then the LP bound. warm_start only
+    applies to the exact MIP. With aggregate_trucks a plan that does not
+    pack onto the trucks of its types is solved again with one truck per
+    type.
+    """
+    built = build_assignment_orders_to_trucks_days_model(
+        input_data, demand_table, use_matrix_api, aggregate_demands, aggregate_trucks
+    )
+    m, demand_table = built.model, built.demand_table
+    trucks: list[Truck] = input_data.trucks
+    planning_horizon: list[date] = input_data.planning_horizon
+    H = len(planning_horizon)
+    AvgLoad = demand_table.total_weight / H
+    date_to_index, index_to_date = _build_date_index_maps(planning_horizon)
+
+    # Solve, from the greedy assignment if asked, keeping the best incumbent
+    # when the budget runs out
+    if lp_rounding:
+        solved = solve_lp_rounding(built, solve_control)
+    else:
+        if warm_start:
+            set_greedy_start(built)
+        solved = (solve_control or SolveControl()).optimize(m)
+
+    if solved.has_solution:
         assignments = []
-        for d in demands:
-            for s in d.feasible_dates(planning_horizon):
-                s_idx = date_to_index[s]
-                for k in truck_ids:
-                    if x[d.demand_id, s_idx, k].X > 0.5:
-                        oa = OrderAssignment(
-                            demand=d,
-                            assigned_date=index_to_date[s_idx],
-                            truck=next(t for t in trucks if t.id == k),
-                        )
-                        assignments.append(oa)
-
-        daily_loads: Dict = {date: 0.0 for date in planning_horizon}
-        for oa in assignments:
-            d_obj: Demand = oa.demand
-            start_idx = date_to_index[oa.assigned_date]
-            for day_offset in range(d_obj.travel_days):
-                idx = start_idx + day_offset
-                if idx < H:
-                    day_date = index_to_date[idx]
-                    daily_loads[day_date] += d_obj.weight
-
-        # total capacity per calendar day (test expects sum of truck capacities)
-        total_capacity_per_day = sum(t.capacity for t in trucks)
-        daily_slack = {
-            date: max(0.0, total_capacity_per_day - load)
-            for date, load in daily_loads.items()
-        }
-
-        # daily balance = abs(Load - AvgLoad) -- compute from daily_loads
-        daily_balance = {
-            date: abs(load - AvgLoad) for date, load in daily_loads.items()
-        }
+        dispatched, overflow = built.assigned_to_trucks()
+        if overflow and aggregate_trucks:
+            report_overflow(overflow)
+            print("Solving again truck by truck")
+            # the table is already aggregated if asked
+            return assignment_orders_to_trucks_days(
+                input_data, demand_table, use_matrix_api,
+                aggregate_trucks=False, warm_start=warm_start,
+                solve_control=solve_control, lp_rounding=lp_rounding,
+            )
+        for demand, s_idx, truck in dispatched:
+            oa = OrderAssignment(
+                demand=demand,
+                assigned_date=index_to_date[s_idx],
+                truck=truck,
+            )
+            assignments.append(oa)
+        report_overflow(overflow)
+
+        daily_loads, daily_slack, daily_balance = daily_summary(
+            assignments, trucks, planning_horizon, AvgLoad
+        )
 
         # Objective value
-        objective_value = m.objVal
+        objective_value = solved.objective_value
 
         return AssignmentOutput(
             assignments=assignments,
@@ -442,10 +537,12 @@ def assignment_orders_to_trucks_days(input_data: AssignmentInput) -> AssignmentO
             daily_slack=daily_slack,
             daily_balance=daily_balance,
             objective_value=objective_value,
-            is_success=True,
+            best_bound=solved.best_bound,
+            mip_gap=solved.mip_gap,
+            is_success=not overflow,
         )
     else:
-        print(f"No feasible assignment found. status={m.status}")
+        print(f"No feasible assignment found. status={solved.status}")
         return AssignmentOutput(
             assignments=[],
             daily_loads={},
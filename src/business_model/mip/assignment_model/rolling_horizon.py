@@ -0,0 +1,142 @@
+"""
+Rolling-horizon driver for assignment_orders_to_trucks_days.
+
+The planning horizon is solved in overlapping windows of window_days days
+that advance by step_days. In each window the demands that must start
+inside it are assigned, while those that may still start later are
+optional: leaving them for later costs defer_cost per kg, so that windows
+do not push work onto their successors. Starts on the first step_days days
+of the window are then fixed, together with the truck load their trips put
+on the following days, which the next windows see as preload. The last
+window fixes everything.
+"""
+from src.data_model.assignment_demand import OrderAssignment
+from src.data_model.assignment_Input import AssignmentInput
+from src.data_model.assignment_output import AssignmentOutput
+from src.data_model.demand_table import DemandTable
+from src.data_model.truck_type import group_truck_types
+from src.business_model.mip.assignment_model.built_model import TruckPreload, per_class
+from src.business_model.mip.assignment_model.order_assignment import (
+    build_assignment_orders_to_trucks_days_model,
+    report_overflow,
+)
+from src.business_model.mip.assignment_model.truck_dispatch import dispatch_to_trucks
+from src.business_model.solve_control import SolveControl
+from typing import Dict
+import gurobipy as gp
+import numpy as np
+
+
+def rolling_horizon_assignment(
+    input_data: AssignmentInput,
+    window_days: int,
+    step_days: int,
+    use_matrix_api: bool = False,
+    aggregate_demands: bool = False,
+    aggregate_trucks: bool = False,
+    solve_control: SolveControl | None = None,
+    defer_cost: float = 1.0,
+) -> AssignmentOutput:
+    """
+    Assign the demands window by window. solve_control applies to each
+    window's solve. objective_value is the balance deviation of the
+    combined plan, w_balance * sum(|daily load - average load|), since the
+    window objectives do not add up to it.
+
+    With aggregate_trucks the fixed trips are only packed onto the trucks
+    of their type after the last window, and the plan may not fit them: the
+    demands that overflow are printed and is_success is False. Solve
+    without aggregate_trucks to get a plan that always packs.
+    """
+    if not 0 < step_days <= window_days:
+        raise ValueError("need 0 < step_days <= window_days")
+
+    planning_horizon = input_data.planning_horizon
+    H = len(planning_horizon)
+    table = DemandTable.from_demands(input_data.demands, planning_horizon)
+    demands = table.to_demands()
+    row_of = {id(d): i for i, d in enumerate(demands)}
+    truck_types = group_truck_types(input_data.trucks, aggregate_trucks)
+    control = solve_control or SolveControl()
+
+    # truck load of the fixed trips, per truck type and horizon day
+    preload = TruckPreload(np.zeros((len(truck_types), H)), np.zeros((len(truck_types), H)))
+    type_pos = {t.id: k for k, t in enumerate(truck_types)}
+    is_open = table.is_feasible.copy()
+    if not is_open.all():
+        print(f"Demands without a feasible start day: {table.demand_ids[~is_open].tolist()}")
+    fixed = []
+
+    for w0 in range(0, H, step_days):
+        w1 = min(w0 + window_days, H)
+        last_window = w1 == H
+        rows = np.flatnonzero(is_open & (table.available_idx < w1))
+        if len(rows):
+            window_input = input_data.model_copy(
+                update={"demands": [], "planning_horizon": planning_horizon[w0:w1]}
+            )
+            optional = table.last_start_idx[rows] >= w1
+            built = build_assignment_orders_to_trucks_days_model(
+                window_input,
+                DemandTable.from_demands([demands[i] for i in rows], planning_horizon[w0:w1]),
+                use_matrix_api,
+                aggregate_demands,
+                aggregate_trucks,
+                optional=optional,
+                preload=TruckPreload(preload.weight[:, w0:w1], preload.area[:, w0:w1]),
+            )
+            # deferring optional demand costs defer_cost per kg (up to a constant)
+            optional = per_class(built.demand_table, optional).tolist()
+            weight = built.demand_table.weight.tolist()
+            built.model.setObjective(
+                built.model.getObjective()
+                - defer_cost
+                * gp.quicksum(weight[key[0]] * var for key, var in built.x.items() if optional[key[0]])
+            )
+            solved = control.optimize(built.model)
+            if not solved.has_solution:
+                print(f"No feasible assignment for window {planning_horizon[w0]}. status={solved.status}")
+                return AssignmentOutput(
+                    assignments=[],
+                    daily_loads={},
+                    daily_slack={},
+                    daily_balance={},
+                    objective_value=0.0,
+                    is_success=False,
+                )
+            for demand, (s_idx, k_id) in built.assigned_items():
+                if s_idx >= step_days and not last_window:
+                    continue
+                start = w0 + s_idx
+                days = slice(start, min(start + demand.travel_days, H))
+                preload.weight[type_pos[k_id], days] += demand.weight
+                preload.area[type_pos[k_id], days] += demand.size_area
+                is_open[row_of[id(demand)]] = False
+                fixed.append((demand, start, k_id))
+            built.model.dispose()
+        if last_window:
+            break
+
+    trucks, overflow = dispatch_to_trucks(fixed, truck_types, H)
+    report_overflow([fixed[n][0] for n in overflow])
+    assignments = [
+        OrderAssignment(demand=demand, assigned_date=planning_horizon[start], truck=truck)
+        for (demand, start, _), truck in zip(fixed, trucks)
+    ]
+
+    daily_loads: Dict = dict(zip(planning_horizon, preload.weight.sum(axis=0).tolist()))
+    AvgLoad = table.total_weight / H
+    total_capacity_per_day = sum(t.capacity for t in input_data.trucks)
+    daily_slack = {
+        date: max(0.0, total_capacity_per_day - load) for date, load in daily_loads.items()
+    }
+    daily_balance = {date: abs(load - AvgLoad) for date, load in daily_loads.items()}
+
+    return AssignmentOutput(
+        assignments=assignments,
+        daily_loads=daily_loads,
+        daily_slack=daily_slack,
+        daily_balance=daily_balance,
+        objective_value=input_data.w_balance * sum(daily_balance.values()),
+        is_success=not is_open.any() and not overflow,
+    )
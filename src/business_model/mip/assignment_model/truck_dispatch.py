@@ -0,0 +1,75 @@
+from src.data_model.demand import Demand
+from src.data_model.truck import Truck
+from src.data_model.truck_type import TruckType
+from collections import Counter
+from typing import Dict, List, Tuple
+import numpy as np
+import config
+
+
+def dispatch_to_trucks(
+    assigned: List[Tuple[Demand, int, int]],
+    truck_types: List[TruckType],
+    horizon_len: int,
+    items_per_destination: Dict[int, int] | None = None,
+) -> Tuple[List[Truck], List[int]]:
+    """
+    Concrete truck for every (demand, start day index, truck type id) of a
+    solved type-level assignment, in input order, and the positions of the
+    items that overflow their truck.
+
+    The type-level models only bound the load and stops of a type by
+    count * capacity and count * MAX_STOPS, so the items of a type are packed
+    onto its trucks afterwards: by start day, heaviest first (ties in input
+    order), each item goes to the first truck of the type, in fleet order,
+    with room for its weight and area on every day of its trip and for its
+    stop on its start day. Stops count as in the models, 1 / (items of the
+    destination) per item, with the items per destination id of the model
+    (by default those among assigned). If no truck has room the item goes to the truck
+    with the least weight on those days and its position is reported as
+    overflowing. Types of a single truck map directly; the models already
+    hold them to their own capacity and stops.
+    """
+    type_by_id = {t.id: t for t in truck_types}
+    if items_per_destination is None:
+        items_per_destination = Counter(demand.destination.id for demand, _, _ in assigned)
+    result: List[Truck | None] = [None] * len(assigned)
+    overflow: List[int] = []
+
+    by_type: dict[int, List[int]] = {}
+    for n, (_, _, type_id) in enumerate(assigned):
+        by_type.setdefault(type_id, []).append(n)
+
+    for type_id, positions in by_type.items():
+        truck_type = type_by_id[type_id]
+        if truck_type.count == 1:
+            for n in positions:
+                result[n] = truck_type.trucks[0]
+            continue
+
+        capacity = truck_type.capacity
+        inner_size = truck_type.inner_size if truck_type.inner_size is not None else np.inf
+        weight_load = np.zeros((truck_type.count, horizon_len))
+        area_load = np.zeros((truck_type.count, horizon_len))
+        stops = np.zeros((truck_type.count, horizon_len))
+        positions = sorted(positions, key=lambda n: (assigned[n][1], -assigned[n][0].weight, n))
+        for n in positions:
+            demand, s_idx, _ = assigned[n]
+            days = slice(s_idx, min(s_idx + max(1, demand.travel_days), horizon_len))
+            stop = 1 / items_per_destination[demand.destination.id]
+            fits = (
+                (weight_load[:, days] + demand.weight <= capacity + 1e-9).all(axis=1)
+                & (area_load[:, days] + demand.size_area <= inner_size + 1e-9).all(axis=1)
+                & (stops[:, s_idx] + stop <= config.MAX_STOPS + 1e-9)
+            )
+            if fits.any():
+                k = int(np.argmax(fits))
+            else:
+                k = int(np.argmin(weight_load[:, days].max(axis=1)))
+                overflow.append(n)
+            weight_load[k, days] += demand.weight
+            area_load[k, days] += demand.size_area
+            stops[k, s_idx] += stop
+            result[n] = truck_type.trucks[k]
+
+    return result, sorted(overflow)
@@ -0,0 +1,63 @@
+"""
+Weight sweeps over w_balance and w_slack on one built assignment model.
+
+The model is built once. Each weight pair only changes the objective
+coefficients of z and slack and re-solves from the previous solution.
+"""
+from src.data_model.weight_sweep import WeightSweepPoint
+from src.business_model.mip.assignment_model.built_model import BuiltAssignmentModel
+from src.business_model.solve_control import SolveControl
+from src.business_model.solution_values import nonzero_values
+from typing import Iterable, List, Tuple
+from gurobipy import GRB
+import hashlib
+
+
+def assignment_fingerprint(built: BuiltAssignmentModel) -> str:
+    """Short hash of the solved x: equal for equal assignments of the same model."""
+    chosen = sorted((key, round(value)) for key, value in nonzero_values(built.model, built.x).items())
+    return hashlib.sha1(repr(chosen).encode()).hexdigest()[:12]
+
+
+def weight_sweep(
+    built: BuiltAssignmentModel,
+    weights: Iterable[Tuple[float, float]],
+    solve_control: SolveControl | None = None,
+) -> List[WeightSweepPoint]:
+    """
+    Solve built once per (w_balance, w_slack) pair, in the given order, each
+    solve starting from the previous solution. The model keeps the last
+    pair's objective and solution.
+    """
+    m = built.model
+    control = solve_control or SolveControl()
+    z = list(built.z.values())
+    slack = list(built.slack.values())
+
+    points = []
+    for w_balance, w_slack in weights:
+        m.setAttr(GRB.Attr.Obj, z, [w_balance] * len(z))
+        m.setAttr(GRB.Attr.Obj, slack, [w_slack] * len(slack))
+        solved = control.optimize(m)
+        if not solved.has_solution:
+            points.append(
+                WeightSweepPoint(
+                    w_balance=w_balance, w_slack=w_slack, runtime=solved.runtime, is_success=False
+                )
+            )
+            continue
+        points.append(
+            WeightSweepPoint(
+                w_balance=w_balance,
+                w_slack=w_slack,
+                objective_value=solved.objective_value,
+                balance_deviation=sum(m.getAttr(GRB.Attr.X, z)),
+                slack=sum(m.getAttr(GRB.Attr.X, slack)),
+                runtime=solved.runtime,
+                fingerprint=assignment_fingerprint(built),
+            )
+        )
+        # the next weights start from this solution
+        variables = m.getVars()
+        m.setAttr(GRB.Attr.Start, variables, m.getAttr(GRB.Attr.X, variables))
+    return points
@@ -0,0 +1,60 @@
+"""
+Sparse arc sets for the CVRP formulations.
+
+Nodes are positions, 0 being the depot. An arc i -> j is left out for a
+vehicle type when no route of that type can use it:
+
+- capacity: q_i + q_j exceeds the type's capacity (with q = 0 at the
+  depot, this drops every arc of a customer the type cannot carry at all);
+- time windows: leaving i at the earliest, ready_i plus the service time,
+  and travelling to j arrives after due_j;
+- optionally, j is not among the nearest_neighbors customers closest to i.
+  Depot arcs are never dropped by this filter, so every customer keeps a
+  direct route.
+
+The first two filters are exact; the neighbour filter is a heuristic cut.
+"""
+from typing import List, Sequence, Tuple
+import numpy as np
+
+
+def sparse_arcs(
+    distance: np.ndarray,
+    demand: Sequence[float],
+    capacity: Sequence[float],
+    ready: Sequence[float] | None = None,
+    due: Sequence[float] | None = None,
+    service_time: float = 0.0,
+    nearest_neighbors: int | None = None,
+) -> List[List[Tuple[int, int]]]:
+    """
+    Per vehicle type, the kept arcs (i, j) in row-major order. distance is
+    the (N, N) matrix between node positions and doubles as travel time for
+    the time-window filter, which only applies when ready and due are given.
+    """
+    distance = np.asarray(distance, dtype=float)
+    N = len(demand)
+    q = np.asarray(demand, dtype=float)
+
+    keep = ~np.eye(N, dtype=bool)
+    if ready is not None and due is not None:
+        earliest = np.asarray(ready, dtype=float)[:, None] + service_time + distance
+        keep &= earliest <= np.asarray(due, dtype=float)[None, :] + 1e-9
+    if nearest_neighbors is not None and N > 2:
+        k = min(nearest_neighbors, N - 2)
+        customer_distance = distance[1:, 1:].copy()
+        np.fill_diagonal(customer_distance, np.inf)
+        near = np.zeros((N, N), dtype=bool)
+        near[0, :] = True
+        near[:, 0] = True
+        if k > 0:
+            closest = np.argpartition(customer_distance, k - 1, axis=1)[:, :k] + 1
+            near[np.arange(1, N)[:, None], closest] = True
+        keep &= near
+
+    pair_load = q[:, None] + q[None, :]
+    arcs = []
+    for Q in capacity:
+        rows, cols = np.nonzero(keep & (pair_load <= Q + 1e-9))
+        arcs.append(list(zip(rows.tolist(), cols.tolist())))
+    return arcs
@@ -2,251 +2,230 @@ import gurobipy as gp
 from gurobipy import GRB
 from src.data_model.cvrp_input import CVRPInput
 from src.data_model.cvrp_output import CVRPOutput, TruckRoute
+from src.data_model.distance import DistanceMatrix
 from src.data_model.factory import Factory, create_depot_factory
-from src.data_model.truck import Truck
+from src.data_model.truck_type import TruckType, group_truck_types
+from src.business_model.solve_control import SolveControl
+from src.business_model.solution_values import nonzero_values, successor_map
+from src.business_model.mip.capacited_vrp_model.arc_set import sparse_arcs
+from src.data_model.route_table import RouteTable
+from src.serializer.serialize_cvrp_output import create_cvrp_output_from_routes
+from src.business_model.heuristic.savings_routing import set_savings_start
 import config
-from datetime import datetime
-
-
-def solve_cvrp_gg(input_data: CVRPInput) -> CVRPOutput:
+import numpy as np
+
+
+def solve_cvrp_gg(
+    input_data: CVRPInput,
+    aggregate_trucks: bool = False,
+    solve_control: SolveControl | None = None,
+    nearest_neighbors: int | None = None,
+    warm_start: bool = False,
+) -> CVRPOutput:
+    """
+    Solve the day's routes with the single-commodity flow formulation. Only
+    the arcs of sparse_arcs are modelled; nearest_neighbors additionally
+    restricts every customer's successors to its nearest customers. With
+    warm_start the savings routes are the MIP start.
+    """
     demands = input_data.demands
     trucks = input_data.trucks
-    C = input_data.distance_matrix
-
-    depot_factory = create_depot_factory()
-    factories = [depot_factory] + [d.destination for d in demands]
-
-    factory_to_index = {f.id: f for f in factories}
+    distance_matrix = DistanceMatrix.from_dict(input_data.distance_matrix)
 
     nodes = [config.DEPOT_ID] + [d.destination.id for d in demands]
     N = len(nodes)
+    pos = {node: p for p, node in enumerate(nodes)}
+    # distances between the day's nodes, addressed by position in `nodes`
+    C = distance_matrix.submatrix(nodes)
 
     q = {d.destination.id: d.weight for d in demands}
     q[config.DEPOT_ID] = 0.0  # depot load is total demand
 
-    available_trucks: list[Truck] = trucks
+    # k indexes truck types: one per truck unless identical trucks are aggregated,
+    # in which case a type departs the depot once per truck
+    truck_types: list[TruckType] = group_truck_types(trucks, aggregate_trucks)
 
-    num_vehicles = len(available_trucks)
-    Q = [t.capacity for t in available_trucks]
+    num_vehicles = len(trucks)
+    num_types = len(truck_types)
+    Q = [t.capacity for t in truck_types]
 
     print(
         f"total number of demands: {N}, nodes are {nodes}, number of vehicles: {num_vehicles}"
     )
 
-    ready = {i: 0.0 for i in range(N)}
-    due = {i: float("inf") for i in range(N)}
-    service_time = config.SERVICE_TIME_PER_STOP
-    for idx, d in enumerate(demands, start=1):
-        ready[d.destination.id] = d.available_minutes
-        due[d.destination.id] = d.due_minutes
-
-    max_c = max(C[i][j] for i in C for j in C[i])
-    C_norm = {i: {j: C[i][j] / max_c for j in C[i]} for i in C}
+    max_c = distance_matrix.max_distance()
+    C_norm = C / max_c
+
+    # arcs a route of each type can use, as (i, j, k) in node ids
+    arcs = gp.tuplelist(
+        (nodes[i], nodes[j], k)
+        for k, type_arcs in enumerate(
+            sparse_arcs(
+                C,
+                [q[node] for node in nodes],
+                Q,
+                nearest_neighbors=nearest_neighbors,
+            )
+        )
+        for i, j in type_arcs
+    )
 
     m = gp.Model("CVRP")
 
-    x = m.addVars(nodes, nodes, range(num_vehicles), vtype=GRB.BINARY, name="x")
-    f = m.addVars(nodes, nodes, range(num_vehicles), lb=0, name="f")
-    visit = m.addVars(nodes, range(num_vehicles), vtype=GRB.BINARY, name="visit")
+    x = m.addVars(arcs, vtype=GRB.BINARY, name="x")
+    f = m.addVars(arcs, lb=0, name="f")
+    visit = m.addVars(nodes, range(num_types), vtype=GRB.BINARY, name="visit")
+    for k, truck_type in enumerate(truck_types):
+        if truck_type.count > 1:
+            visit[config.DEPOT_ID, k].VType = GRB.INTEGER
+            visit[config.DEPOT_ID, k].UB = truck_type.count
 
     m.setObjective(
         gp.quicksum(
-            available_trucks[k].cost * C_norm[i][j] * x[i, j, k]
-            for k in range(num_vehicles)
-            for i in nodes
-            for j in nodes
-            if i != j
+            truck_types[k].cost * C_norm[pos[i], pos[j]] * x[i, j, k]
+            for i, j, k in arcs
         )
         + config.SERVICE_COST_PER_STOP
         * gp.quicksum(
             visit[j, k]
-            for k in range(num_vehicles)
+            for k in range(num_types)
             for j in nodes
             if j != config.DEPOT_ID
         )
-        + gp.quicksum(
-            f[i, j, k] * 0.01
-            for k in range(num_vehicles)
-            for i in nodes
-            for j in nodes
-            if i != j
-        ),
+        + gp.quicksum(f[i, j, k] * 0.01 for i, j, k in arcs),
         GRB.MINIMIZE,
     )
 
-    m.addConstr(
-        gp.quicksum(
-            x[config.DEPOT_ID, j, k] for j in nodes[1:] for k in range(num_vehicles)
-        )
-        == num_vehicles
-    )
+    m.addConstr(x.sum(config.DEPOT_ID, "*", "*") == num_vehicles)
     m.addConstrs(
-        gp.quicksum(visit[i, k] for k in range(num_vehicles)) == 1
+        gp.quicksum(visit[i, k] for k in range(num_types)) == 1
         for i in nodes
         if i != config.DEPOT_ID
     )
 
-    for k in range(num_vehicles):
+    for k in range(num_types):
         for h in nodes:
             m.addConstr(
-                gp.quicksum(x[i, h, k] for i in nodes if i != h)
-                == gp.quicksum(x[h, j, k] for j in nodes if j != h),
+                x.sum("*", h, k) == x.sum(h, "*", k),
                 name=f"flow_conservation_{h}_{k}",
             )
 
-    for k in range(num_vehicles):
+    for k in range(num_types):
         for i in nodes:
             m.addConstr(
-                gp.quicksum(x[i, j, k] for j in nodes if i != j) == visit[i, k],
+                x.sum(i, "*", k) == visit[i, k],
                 name=f"visit_link_{i}_{k}",
             )
 
-    for k in range(num_vehicles):
+    for k in range(num_types):
         m.addConstr(
             gp.quicksum(visit[j, k] for j in nodes if j != config.DEPOT_ID)
-            <= config.MAX_STOPS
+            <= config.MAX_STOPS * truck_types[k].count
+        )
+
+    # the stop limit above is per type, so number the stops of each route of a
+    # multi-truck type to keep every single route within MAX_STOPS
+    for k, truck_type in enumerate(truck_types):
+        if truck_type.count == 1:
+            continue
+        stop_no = m.addVars(
+            nodes[1:], lb=1, ub=config.MAX_STOPS, name=f"stop_no_{k}"
         )
+        for i, j, _ in arcs.select("*", "*", k):
+            if i != config.DEPOT_ID and j != config.DEPOT_ID:
+                m.addConstr(
+                    stop_no[j]
+                    >= stop_no[i] + 1 - config.MAX_STOPS * (1 - x[i, j, k]),
+                    name=f"stop_order_{i}_{j}_{k}",
+                )
 
     for i in nodes[1:]:
-        for k in range(num_vehicles):
+        for k in range(num_types):
             m.addConstr(
-                gp.quicksum(f[j, i, k] for j in nodes if j != i)
-                - gp.quicksum(f[i, j, k] for j in nodes if j != i)
-                == q[i] * visit[i, k],
+                f.sum("*", i, k) - f.sum(i, "*", k) == q[i] * visit[i, k],
                 name=f"flow_conservation_load_{i}_{k}",
             )
-    for i in nodes:
-        for j in nodes[1:]:
-            if i != j:
-                for k in range(num_vehicles):
-                    m.addConstr(
-                        f[i, j, k] >= q[i]*x[i, j, k],
-                        name=f"flow_cap_{i}_{j}_{k}",
-                    )
-    for k in range(num_vehicles):
-        for i in nodes:
-            for j in nodes[1:]:
-                if i != j:
-                    m.addConstr(
-                        f[i, j, k] <= (Q[k] - q[i]) * x[i, j, k],
-                        name=f"load_cap2_{j}_{k}",
-                    )
-    for k in range(num_vehicles):
-        for j in nodes[1:]:
+    for i, j, k in arcs:
+        if j != config.DEPOT_ID:
             m.addConstr(
-                f[config.DEPOT_ID, j, k] <= Q[k] * x[config.DEPOT_ID, j, k],
-                name=f"load_cap_{j}_{k}",
+                f[i, j, k] >= q[i]*x[i, j, k],
+                name=f"flow_cap_{i}_{j}_{k}",
             )
+    for i, j, k in arcs:
+        if j != config.DEPOT_ID:
+            m.addConstr(
+                f[i, j, k] <= (Q[k] - q[i]) * x[i, j, k],
+                name=f"load_cap2_{j}_{k}",
+            )
+    for _, j, k in arcs.select(config.DEPOT_ID, "*", "*"):
+        m.addConstr(
+            f[config.DEPOT_ID, j, k] <= Q[k] * x[config.DEPOT_ID, j, k],
+            name=f"load_cap_{j}_{k}",
+        )
+    table = RouteTable.from_cvrp_input(input_data)
+    if warm_start:
+        type_index = {t.id: k for k, truck_type in enumerate(truck_types) for t in truck_type.trucks}
+        set_savings_start(table, x, [type_index[t.id] for t in trucks])
+
     m.params.OutputFlag = 0  # turn off output
     m.params.TimeLimit = 600  # 10 minutes
-    m.optimize()
-
-    if m.status == GRB.OPTIMAL:
-        print(f"Optimal objective: {m.objVal}")
-        # visited nodes
-        for k in range(num_vehicles):
-            for i in nodes:
-                for j in nodes:
-                    if x[i, j, k].X > 0.5:
-                        print(f"Truck {k} travels from {i} to {j}")
-
-        routes_output = []
-        cvrp_travel_cost: int = 0
-        cvrp_handling_cost: int = 0
-        cvrp_total_distance: float = 0.0
-        for k, t in enumerate(available_trucks):
-            route_indices = [config.DEPOT_ID]  # start at depot
-            load_seq = [0.0]
-            start_time = [0.0]
-            travel_times = [0.0]
-            start_time_dt = []
-            current_node = config.DEPOT_ID
-            visited = set()
-            while True:
-                next_nodes = [
-                    j
-                    for j in nodes
-                    if j != current_node
-                    and x[current_node, j, k].X > 0.5
-                    and j not in visited
-                ]
-                if not next_nodes:
-                    break
-                next_node = next_nodes[0]
-                route_indices.append(next_node)
-                load_seq.append(
-                    f[current_node, next_node, k].X
-                    if next_node != config.DEPOT_ID
-                    else 0.0
-                )
-                travel_time = (C[current_node][next_node] / t.speed) * 60
-                if current_node == config.DEPOT_ID and len(route_indices) == 2:
-                    st = 0.0
-                else:
-                    if next_node == config.DEPOT_ID:
-                        st = start_time[-1] + service_time + travel_time
-                    else:
-                        st = start_time[-1] + service_time + travel_time
-
-                start_time.append(st)
-                dt = datetime.fromtimestamp(st * 60)
-                start_time_dt.append(str(dt.strftime("%H:%M")))
-                travel_times.append(travel_time)
-                visited.add(next_node)
-                current_node = next_node
-
-            if len(route_indices) > 1:
-                route_factories = [factory_to_index[i] for i in route_indices]
-                # total_cost = m.objVal
-
-                travel_cost = 0.0
-                handling_cost = 0.0
-                total_travel_distance = 0.0
-                total_travel_time = 0.0
-                for i, r_id in enumerate(route_indices[:-1]):
-                    i_id = r_id
-                    j_id = route_indices[i + 1]
-                    travel_cost += available_trucks[k].cost * (C[i_id][j_id])
-                    total_travel_distance += C[i_id][j_id]
-                    total_travel_time += C[i_id][j_id] / available_trucks[k].speed
-                    if j_id != config.DEPOT_ID:
-                        handling_cost += config.SERVICE_COST_PER_STOP
-                cvrp_total_distance += total_travel_distance
-
-                total_stops = len(route_indices)-2
-                routes_output.append(
-                    TruckRoute(
-                        truck=t,
-                        route=route_factories,
-                        unload_at_node=load_seq,
-                        times_at_node=start_time_dt,
-                        travel_times_at_node=travel_times,
-                        travel_distance=total_travel_distance,
-                        travel_time=total_travel_time,
-                        total_stops=total_stops,
-                        total_travel_cost=travel_cost,
-                        total_handling_cost=handling_cost,
-                    )
-                )
-
-                cvrp_travel_cost += travel_cost
-                cvrp_handling_cost += handling_cost
-
-        return CVRPOutput(
-            routes=routes_output,
-            total_cost=cvrp_travel_cost + cvrp_handling_cost,
-            travel_cost=cvrp_travel_cost,
-            handling_cost=cvrp_handling_cost,
-            total_travel_distance=cvrp_total_distance,
-            is_success=True,
+    # keep the best incumbent when the budget runs out
+    solved = (solve_control or SolveControl()).optimize(m)
+
+    if solved.has_solution:
+        print(f"Best objective: {solved.objective_value} (gap {solved.mip_gap:.2%})")
+        # used arcs, keyed (i, j, k) in node order
+        arcs = sorted(nonzero_values(m, x), key=lambda arc: arc[2])
+        successors = successor_map(arcs)
+        for i, j, k in arcs:
+            print(f"Truck {k} travels from {i} to {j}")
+
+        # the routes of a type start at its depot arcs, in node order, and go to
+        # its trucks in fleet order
+        truck_position = {t.id: p for p, t in enumerate(trucks)}
+        routes = []
+        for k, truck_type in enumerate(truck_types):
+            firsts = [
+                j
+                for j in successors.get(k, {}).get(config.DEPOT_ID, [])
+                if j != config.DEPOT_ID
+            ]
+            for truck, first in zip(truck_type.trucks, firsts):
+                route = [first]
+                while True:
+                    next_nodes = [
+                        j
+                        for j in successors[k].get(route[-1], [])
+                        if j != config.DEPOT_ID and j not in route
+                    ]
+                    if not next_nodes:
+                        break
+                    route.append(next_nodes[0])
+                routes.append((truck_position[truck.id], [pos[i] for i in route]))
+
+        return create_cvrp_output_from_routes(
+            table,
+            routes,
+            best_bound=solved.best_bound,
+            mip_gap=solved.mip_gap,
         )
     else:
-        print(f"No optimal solution found for CVRP ")
+        print(f"No feasible solution found for CVRP ")
         return CVRPOutput(routes=[], total_cost=0.0, is_success=False)
 
 
 
-def solve_cvrp_tw(input_data: CVRPInput) -> CVRPOutput:
+def solve_cvrp_tw(
+    input_data: CVRPInput,
+    aggregate_trucks: bool = False,
+    solve_control: SolveControl | None = None,
+    nearest_neighbors: int | None = None,
+) -> CVRPOutput:
+    """
+    Solve the day's routes with time windows. Only the arcs of sparse_arcs
+    are modelled, time windows included; nearest_neighbors additionally
+    restricts every customer's successors to its nearest customers.
+    """
     demands = input_data.demands
     trucks = input_data.trucks
     C = input_data.distance_matrix
@@ -255,7 +234,18 @@ def solve_cvrp_tw(input_data: CVRPInput) -> CVRPOutput:
     customers = [d.destination for d in demands]
     nodes = [depot_factory] + customers
     N = len(nodes)
-    num_vehicles = len(trucks)
+    if isinstance(C, DistanceMatrix):
+        # positional distances between depot (0) and customers (1..N-1)
+        C = C.submatrix([f.id for f in nodes])
+    else:
+        # already positional, as nested lists or dicts; a dict may leave out the diagonal
+        C = np.array(
+            [[0.0 if i == j else C[i][j] for j in range(N)] for i in range(N)], dtype=float
+        )
+    # k indexes truck types: one per truck unless identical trucks are aggregated,
+    # in which case a type may depart the depot once per truck
+    truck_types: list[TruckType] = group_truck_types(trucks, aggregate_trucks)
+    num_vehicles = len(truck_types)
 
     q = {i: 0 for i in range(N)}
     ready = {i: 0.0 for i in range(N)}
@@ -273,27 +263,41 @@ def solve_cvrp_tw(input_data: CVRPInput) -> CVRPOutput:
         )
 
     ready[0] = 0.0
-    due[0] = max(due.values()) + 1000.0
-
-    Q = [t.capacity for t in trucks]
-    costs = [t.cost for t in trucks]
+    # the depot closes 1000 after the latest customer; customers without a due
+    # time (inf) leave it open
+    due[0] = max(due[i] for i in range(1, N)) + 1000.0 if N > 1 else float("inf")
+
+    Q = [t.capacity for t in truck_types]
+    costs = [t.cost for t in truck_types]
+    n_trucks = [t.count for t in truck_types]
+
+    # arcs a route of each type can use, as (i, j, k) in node positions
+    arcs = gp.tuplelist(
+        (i, j, k)
+        for k, type_arcs in enumerate(
+            sparse_arcs(
+                C,
+                [q[i] for i in range(N)],
+                Q,
+                ready=[ready[i] for i in range(N)],
+                due=[due[i] for i in range(N)],
+                service_time=service_time,
+                nearest_neighbors=nearest_neighbors,
+            )
+        )
+        for i, j in type_arcs
+    )
 
     m = gp.Model("CVRP_TW")
 
     # decision arcs
-    x = m.addVars(N, N, num_vehicles, vtype=GRB.BINARY, name="x")
+    x = m.addVars(arcs, vtype=GRB.BINARY, name="x")
     load = m.addVars(range(1, N), range(num_vehicles), lb=0.0, ub=max(Q), name="load")
     arrival = m.addVars(range(N), range(num_vehicles), lb=0.0, name="arrival")
     visit = m.addVars(range(1, N), range(num_vehicles), vtype=GRB.BINARY, name="visit")
 
     m.setObjective(
-        gp.quicksum(
-            costs[k] * C[i][j] * x[i, j, k]
-            for k in range(num_vehicles)
-            for i in range(N)
-            for j in range(N)
-            if i != j
-        )
+        gp.quicksum(costs[k] * C[i][j] * x[i, j, k] for i, j, k in arcs)
         + config.SERVICE_COST_PER_STOP
         * gp.quicksum(visit[j, k] for k in range(num_vehicles) for j in range(1, N)),
         GRB.MINIMIZE,
@@ -304,10 +308,7 @@ def solve_cvrp_tw(input_data: CVRPInput) -> CVRPOutput:
     # 1) Each customer visited exactly once across all vehicles
     for j in range(1, N):
         m.addConstr(
-            gp.quicksum(
-                x[i, j, k] for k in range(num_vehicles) for i in range(N) if i != j
-            )
-            == 1,
+            x.sum("*", j, "*") == 1,
             name=f"visit_once_{j}",
         )
 
@@ -315,23 +316,23 @@ def solve_cvrp_tw(input_data: CVRPInput) -> CVRPOutput:
     for k in range(num_vehicles):
         for j in range(1, N):
             m.addConstr(
-                gp.quicksum(x[i, j, k] for i in range(N) if i != j)
-                == gp.quicksum(x[j, l, k] for l in range(N) if l != j),
+                x.sum("*", j, k) == x.sum(j, "*", k),
                 name=f"flow_cons_{j}_{k}",
             )
 
     # 3) Depot departure/return: each vehicle can depart at most once (<=1 to allow unused vehicles)
     for k in range(num_vehicles):
         m.addConstr(
-            gp.quicksum(x[0, j, k] for j in range(1, N)) <= 1, name=f"depart_once_{k}"
+            x.sum(0, "*", k) <= n_trucks[k],
+            name=f"depart_once_{k}",
         )
         m.addConstr(
-            gp.quicksum(x[i, 0, k] for i in range(1, N)) <= 1, name=f"return_once_{k}"
+            x.sum("*", 0, k) <= n_trucks[k],
+            name=f"return_once_{k}",
         )
         # link departures and returns (if it departs then must return)
         m.addConstr(
-            gp.quicksum(x[0, j, k] for j in range(1, N))
-            == gp.quicksum(x[i, 0, k] for i in range(1, N)),
+            x.sum(0, "*", k) == x.sum("*", 0, k),
             name=f"depart_return_eq_{k}",
         )
 
@@ -339,27 +340,26 @@ def solve_cvrp_tw(input_data: CVRPInput) -> CVRPOutput:
     for k in range(num_vehicles):
         for j in range(1, N):
             m.addConstr(
-                gp.quicksum(x[i, j, k] for i in range(N) if i != j) == visit[j, k],
+                x.sum("*", j, k) == visit[j, k],
                 name=f"visit_link_{j}_{k}",
             )
 
     # 5) Capacity propagation (load variables)
-    # load[j,k] >= load[i,k] + q[j] - Q[k] * (1 - x[i,j,k]) for i != j, i can be depot(0) but load at depot is 0
-    for k in range(num_vehicles):
-        for i in range(N):
-            for j in range(1, N):
-                if i == j:
-                    continue
-                if i == 0:
-                    m.addConstr(
-                        load[j, k] >= q[j] - Q[k] * (1 - x[0, j, k]),
-                        name=f"cap_from_depot_{i}_{j}_{k}",
-                    )
-                else:
-                    m.addConstr(
-                        load[j, k] >= load[i, k] + q[j] - Q[k] * (1 - x[i, j, k]),
-                        name=f"cap_prop_{i}_{j}_{k}",
-                    )
+    # load[j,k] >= load[i,k] + q[j] - (Q[k] + q[j]) * (1 - x[i,j,k]) for i != j, i can be depot(0) but load at depot is 0;
+    # the big-M covers q[j] too, so that an unused arc leaves an unvisited j at load 0
+    for i, j, k in arcs:
+        if j == 0:
+            continue
+        if i == 0:
+            m.addConstr(
+                load[j, k] >= q[j] - (Q[k] + q[j]) * (1 - x[0, j, k]),
+                name=f"cap_from_depot_{i}_{j}_{k}",
+            )
+        else:
+            m.addConstr(
+                load[j, k] >= load[i, k] + q[j] - (Q[k] + q[j]) * (1 - x[i, j, k]),
+                name=f"cap_prop_{i}_{j}_{k}",
+            )
     # bounds: if not visited, load can be zero via big-M; enforce upper bound tight
     for k in range(num_vehicles):
         for j in range(1, N):
@@ -370,40 +370,44 @@ def solve_cvrp_tw(input_data: CVRPInput) -> CVRPOutput:
     # also explicit (optional):
     for k in range(num_vehicles):
         m.addConstr(
-            gp.quicksum(q[j] * visit[j, k] for j in range(1, N)) <= Q[k],
+            gp.quicksum(q[j] * visit[j, k] for j in range(1, N)) <= n_trucks[k] * Q[k],
             name=f"cap_total_{k}",
         )
 
     # 7) Time windows and travel time propagation
     # Compute a safe big_M
-    max_travel = max(C[i][j] for i in range(N) for j in range(N) if i != j)
+    max_travel = max(
+        (C[i][j] for i in range(N) for j in range(N) if i != j and np.isfinite(C[i][j])),
+        default=0.0,
+    )
     earliest = min(ready.values())
-    latest = max(due.values())
+    latest = max(t for t in list(ready.values()) + list(due.values()) if np.isfinite(t))
     big_M = (latest - earliest) + max_travel + service_time + 100.0
 
-    for k in range(num_vehicles):
-        for i in range(N):
-            for j in range(N):
-                if i == j:
-                    continue
-                m.addConstr(
-                    arrival[j, k]
-                    >= arrival[i, k]
-                    + service_time
-                    + C[i][j]
-                    - big_M * (1 - x[i, j, k]),
-                    name=f"time_prop_{i}_{j}_{k}",
-                )
+    # arrival[0, k] is the departure time, so returns to the depot are not timed
+    for i, j, k in arcs:
+        if j == 0:
+            continue
+        m.addConstr(
+            arrival[j, k]
+            >= arrival[i, k]
+            + service_time
+            + C[i][j]
+            - big_M * (1 - x[i, j, k]),
+            name=f"time_prop_{i}_{j}_{k}",
+        )
 
+    for k in range(num_vehicles):
         # time window enforcement for customers if visited
         for j in range(1, N):
             m.addConstr(
                 arrival[j, k] >= ready[j] - big_M * (1 - visit[j, k]),
                 name=f"ready_{j}_{k}",
             )
-            m.addConstr(
-                arrival[j, k] <= due[j] + big_M * (1 - visit[j, k]), name=f"due_{j}_{k}"
-            )
+            if np.isfinite(due[j]):
+                m.addConstr(
+                    arrival[j, k] <= due[j] + big_M * (1 - visit[j, k]), name=f"due_{j}_{k}"
+                )
 
     # Optional: bound arrival at depot if you want to compute return times: no special constraint except derivation
     # limit maximum arrival time
@@ -413,29 +417,45 @@ def solve_cvrp_tw(input_data: CVRPInput) -> CVRPOutput:
     # 8) Max stops per vehicle
     for k in range(num_vehicles):
         m.addConstr(
-            gp.quicksum(visit[j, k] for j in range(1, N)) <= config.MAX_STOPS,
+            gp.quicksum(visit[j, k] for j in range(1, N)) <= n_trucks[k] * config.MAX_STOPS,
             name=f"max_stops_{k}",
         )
 
+    # the limits above are per type, so number the stops of each route of a
+    # multi-truck type to keep every single route within MAX_STOPS
+    for k in range(num_vehicles):
+        if n_trucks[k] == 1:
+            continue
+        stop_no = m.addVars(range(1, N), lb=1, ub=config.MAX_STOPS, name=f"stop_no_{k}")
+        for i, j, _ in arcs.select("*", "*", k):
+            if i != 0 and j != 0:
+                m.addConstr(
+                    stop_no[j] >= stop_no[i] + 1 - config.MAX_STOPS * (1 - x[i, j, k]),
+                    name=f"stop_order_{i}_{j}_{k}",
+                )
+
     # Solve
     m.params.OutputFlag = 0
     m.params.TimeLimit = 600
-    m.optimize()
+    solved = (solve_control or SolveControl()).optimize(m)
 
     routes_output = []
     total_cost = None
-    if m.status in (GRB.OPTIMAL, GRB.TIME_LIMIT, GRB.SUBOPTIMAL):
-        total_cost = m.objVal
-        # extract routes: follow arcs from depot for each vehicle
-        for k in range(num_vehicles):
-            # find departure from depot
-            dep_next = [j for j in range(1, N) if x[0, j, k].X > 0.5]
-            if not dep_next:
-                continue  # vehicle unused
+    if solved.has_solution:
+        total_cost = solved.objective_value
+        # extract routes: follow arcs from every depot departure; the routes of
+        # a type go to its trucks in fleet order, unused trucks get none
+        successors = successor_map(nonzero_values(m, x))
+        departures = [
+            (k, truck, first)
+            for k, truck_type in enumerate(truck_types)
+            for truck, first in zip(truck_type.trucks, successors.get(k, {}).get(0, []))
+        ]
+        for k, truck, first in departures:
             route_nodes = [0]
             loads = [0.0]  # load after visiting depot (0)
             arrivals = [float(arrival[0, k].X)]
-            cur = dep_next[0]
+            cur = first
             visited = set([0])
             # follow path until returns to depot
             while True:
@@ -447,15 +467,8 @@ def solve_cvrp_tw(input_data: CVRPInput) -> CVRPOutput:
                 arrivals.append(arrival[cur, k].X)
                 visited.add(cur)
                 # find next
-                next_candidates = [
-                    j for j in range(N) if j != cur and x[cur, j, k].X > 0.5
-                ]
+                next_candidates = successors[k].get(cur, [])
                 if not next_candidates:
-                    # if no explicit next, try to find return-to-depot
-                    if x[cur, 0, k].X > 0.5:
-                        route_nodes.append(0)
-                        arrivals.append(arrival[0, k].X)
-                        loads.append(0.0)
                     break
                 cur = next_candidates[0]
                 if cur == 0:
@@ -471,11 +484,17 @@ def solve_cvrp_tw(input_data: CVRPInput) -> CVRPOutput:
             route_factories = [nodes[i] for i in route_nodes]
             routes_output.append(
                 TruckRoute(
-                    truck=trucks[k], route=route_factories, unload_at_node=arrivals
+                    truck=truck, route=route_factories, unload_at_node=arrivals
                 )
             )
 
-        return CVRPOutput(routes=routes_output, total_cost=total_cost, is_success=True)
+        return CVRPOutput(
+            routes=routes_output,
+            total_cost=total_cost,
+            best_bound=solved.best_bound,
+            mip_gap=solved.mip_gap,
+            is_success=True,
+        )
     else:
         # infeasible or no solution
         return CVRPOutput(routes=[], total_cost=0.0, is_success=False)
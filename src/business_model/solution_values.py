@@ -0,0 +1,31 @@
+"""
+Reading solutions back from solved models in bulk: one getAttr call per
+variable group, keeping only the nonzero entries with their keys, so result
+extraction costs O(nonzeros) rather than O(variables).
+"""
+import gurobipy as gp
+from gurobipy import GRB
+from typing import Dict, Hashable, Iterable, List
+import numpy as np
+
+
+def nonzero_values(m: gp.Model, variables: gp.tupledict, tol: float = 0.5) -> Dict[tuple, float]:
+    """
+    Solution values of the variables whose magnitude exceeds tol, keyed as in
+    variables and in its key order. The default tol keeps the ones of binary
+    and integer variables; pass a small tol for continuous ones.
+    """
+    keys = list(variables.keys())
+    values = np.asarray(m.getAttr(GRB.Attr.X, list(variables.values())), dtype=float)
+    return {keys[p]: values[p] for p in np.flatnonzero(np.abs(values) > tol).tolist()}
+
+
+def successor_map(arcs: Iterable[tuple]) -> Dict[Hashable, Dict[Hashable, List[Hashable]]]:
+    """
+    Per vehicle index k, the heads j of the arcs (i, j, k) leaving every tail
+    i, in the order the arcs are given.
+    """
+    successors: Dict[Hashable, Dict[Hashable, List[Hashable]]] = {}
+    for i, j, k in arcs:
+        successors.setdefault(k, {}).setdefault(i, []).append(j)
+    return successors
@@ -0,0 +1,83 @@
+"""
+Common solve control for the MIP entry points: a wall-clock budget, a
+target gap and a stall rule, and the best incumbent found within them.
+"""
+import gurobipy as gp
+from gurobipy import GRB
+from dataclasses import dataclass
+
+
+@dataclass
+class SolveResult:
+    """
+    Outcome of a solve. objective_value, best_bound and mip_gap are None when
+    no feasible solution was found; status is the Gurobi status code.
+    """
+
+    status: int
+    objective_value: float | None
+    best_bound: float | None
+    mip_gap: float | None
+    runtime: float
+
+    @property
+    def has_solution(self) -> bool:
+        return self.objective_value is not None
+
+    @property
+    def is_optimal(self) -> bool:
+        return self.status == GRB.OPTIMAL
+
+
+@dataclass
+class SolveControl:
+    """
+    How long and how far to solve. time_limit is a wall-clock budget in
+    seconds and mip_gap a relative gap target; when None the model's own
+    parameters stay in force. stall_time stops the solve once an incumbent
+    exists and has not improved for that many seconds.
+    """
+
+    time_limit: float | None = None
+    mip_gap: float | None = None
+    stall_time: float | None = None
+
+    def optimize(self, m: gp.Model) -> SolveResult:
+        if self.time_limit is not None:
+            m.Params.TimeLimit = self.time_limit
+        if self.mip_gap is not None:
+            m.Params.MIPGap = self.mip_gap
+        if self.stall_time is None:
+            m.optimize()
+        else:
+            m.optimize(self._stall_callback(m.ModelSense))
+        return solve_result(m)
+
+    def _stall_callback(self, sense: int):
+        best = GRB.INFINITY
+        improved_at = 0.0
+
+        def callback(model: gp.Model, where: int):
+            nonlocal best, improved_at
+            if where != GRB.Callback.MIP:
+                return
+            runtime = model.cbGet(GRB.Callback.RUNTIME)
+            if model.cbGet(GRB.Callback.MIP_SOLCNT) == 0:
+                return
+            # compare in minimisation terms whatever the model sense
+            incumbent = sense * model.cbGet(GRB.Callback.MIP_OBJBST)
+            if incumbent < best - 1e-9 * max(1.0, abs(best)):
+                best, improved_at = incumbent, runtime
+            elif runtime - improved_at >= self.stall_time:
+                model.terminate()
+
+        return callback
+
+
+def solve_result(m: gp.Model) -> SolveResult:
+    """The best incumbent of a model after optimize(), with its bound and gap."""
+    if m.SolCount == 0:
+        return SolveResult(m.Status, None, None, None, m.Runtime)
+    if not m.IsMIP:
+        return SolveResult(m.Status, m.ObjVal, m.ObjVal, 0.0, m.Runtime)
+    return SolveResult(m.Status, m.ObjVal, m.ObjBound, m.MIPGap, m.Runtime)
@@ -10,4 +10,6 @@ class AssignmentOutput(BaseModel):
     daily_slack: Dict[date, float] | None = None
     daily_balance: Dict[date, float] | None = None
     objective_value: float | None = None
+    best_bound: float | None = None
+    mip_gap: float | None = None
     is_success: bool = True
\ No newline at end of file
@@ -0,0 +1,34 @@
+from functools import lru_cache
+from pydantic import BaseModel, TypeAdapter
+from typing import List, Sequence, TypeVar
+
+M = TypeVar("M", bound=BaseModel)
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model_cls: type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[model_cls])
+
+
+def build_models(model_cls: type[M], **columns: Sequence) -> list[M]:
+    """
+    Bulk-build validated model instances from columns, e.g. the output of
+    normalize_order_data_frame.
+
+    All rows are validated in one call of a cached list TypeAdapter, which
+    keeps the per-row loop inside pydantic-core and is faster than calling
+    the model constructor per row. Model instances among the values (e.g.
+    shared Factory objects) are kept as they are, not copied. The columns
+    are checked against the model's fields once, up front.
+    """
+    fields = model_cls.model_fields
+    unknown = set(columns) - set(fields)
+    if unknown:
+        raise ValueError(f"Unknown {model_cls.__name__} fields: {sorted(unknown)}")
+    missing = [n for n, f in fields.items() if n not in columns and f.is_required()]
+    if missing:
+        raise ValueError(f"Missing required {model_cls.__name__} fields: {missing}")
+
+    names = list(columns)
+    rows = [dict(zip(names, row)) for row in zip(*columns.values())]
+    return _list_adapter(model_cls).validate_python(rows)
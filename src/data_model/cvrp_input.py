@@ -1,10 +1,12 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import List
-from src.data_model.distance import Distance
+from src.data_model.distance import Distance, DistanceMatrix
 from src.data_model.demand import Demand
 from src.data_model.truck import Truck
 
 class CVRPInput(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     demands: List[Demand]
     trucks: List[Truck]
-    distance_matrix:dict[int, dict[int, float]] = {}
\ No newline at end of file
+    distance_matrix: DistanceMatrix | dict[int, dict[int, float]] = {}
\ No newline at end of file
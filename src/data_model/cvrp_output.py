@@ -26,9 +26,21 @@ class TruckRoute(BaseModel):
     
 
 
+class ConvergencePoint(BaseModel):
+    """Search progress of an iterative solver: runtime in seconds, costs as total_cost."""
+
+    iteration: int
+    runtime: float
+    current_cost: float
+    best_cost: float
+
+
 class CVRPOutput(BaseModel):
     routes: List[TruckRoute]
     total_cost: float
     travel_cost: float | None = None
     handling_cost: float | None = None
-    is_success: bool = True
\ No newline at end of file
+    best_bound: float | None = None
+    mip_gap: float | None = None
+    is_success: bool = True
+    convergence_trace: List[ConvergencePoint] | None = None
\ No newline at end of file
@@ -0,0 +1,261 @@
+from src.data_model.demand import Demand
+from src.data_model.factory import Factory
+from src.data_model.bulk import build_models
+from datetime import date
+from typing import List, Tuple
+import numpy as np
+
+
+class DemandTable:
+    """
+    Struct-of-arrays view of the demands of one planning run.
+
+    Every column is a contiguous NumPy array with one entry per demand. Day
+    indices refer to positions in the planning horizon the table was built
+    for: a demand can start on any horizon day in
+    [available_idx, last_start_idx], which is empty when
+    available_idx > last_start_idx.
+
+    The inverse direction, horizon day -> rows, is answered by
+    rows_starting_on, rows_active_on and pairs_active_on from per-day
+    buckets built once.
+
+    A table made by aggregate() has one row per class of identical demands:
+    count holds the class sizes, members the item rows of each class in
+    the table it was aggregated from (items).
+    """
+
+    def __init__(
+        self,
+        demand_ids: np.ndarray,
+        weight: np.ndarray,
+        area: np.ndarray,
+        destination: np.ndarray,
+        destinations: List[Factory],
+        available_time: np.ndarray,
+        due_time: np.ndarray,
+        travel_days: np.ndarray,
+        planning_horizon: List[date],
+        demands: List[Demand] | None = None,
+        count: np.ndarray | None = None,
+    ):
+        horizon = np.asarray(planning_horizon, dtype="datetime64[D]")
+        if len(horizon) > 1 and not (np.diff(horizon) > np.timedelta64(0, "D")).all():
+            raise ValueError("planning_horizon must be sorted and free of duplicates")
+
+        self.demand_ids = np.asarray(demand_ids)
+        self.weight = np.ascontiguousarray(weight, dtype=np.float64)
+        self.area = np.ascontiguousarray(area, dtype=np.float64)
+        self.destination = np.ascontiguousarray(destination, dtype=np.int64)
+        self.destinations = list(destinations)
+        self.available_time = np.asarray(available_time, dtype="datetime64[s]")
+        self.due_time = np.asarray(due_time, dtype="datetime64[s]")
+        self.travel_days = np.ascontiguousarray(travel_days, dtype=np.int64)
+        self.planning_horizon = list(planning_horizon)
+        self.count = (
+            np.ones(len(self.weight), dtype=np.int64)
+            if count is None
+            else np.ascontiguousarray(count, dtype=np.int64)
+        )
+        self.members: List[List[int]] | None = None
+        self.items: "DemandTable | None" = None
+
+        # same rule as Demand.feasible_dates: the trip must start by
+        # due_date - (max(1, travel_days) - 1)
+        available_date = self.available_time.astype("datetime64[D]")
+        last_start_date = self.due_time.astype("datetime64[D]") - (
+            np.maximum(1, self.travel_days) - 1
+        ).astype("timedelta64[D]")
+        self.available_idx = np.searchsorted(horizon, available_date, side="left")
+        self.last_start_idx = np.searchsorted(horizon, last_start_date, side="right") - 1
+
+        self._demands = demands
+        self._starting_on: List[List[int]] | None = None
+        self._active_on: List[List[int]] | None = None
+        self._pairs_active_on: List[List[Tuple[int, int]]] | None = None
+        self._start_pairs: Tuple[np.ndarray, np.ndarray] | None = None
+        self._covered_days: Tuple[np.ndarray, np.ndarray] | None = None
+
+    @classmethod
+    def from_demands(
+        cls, demands: List[Demand], planning_horizon: List[date]
+    ) -> "DemandTable":
+        destinations: dict[int, Factory] = {}
+        for d in demands:
+            destinations.setdefault(d.destination.id, d.destination)
+        destination_position = {f_id: p for p, f_id in enumerate(destinations)}
+
+        return cls(
+            demand_ids=[d.demand_id for d in demands],
+            weight=[d.weight for d in demands],
+            area=[d.size_area for d in demands],
+            destination=[destination_position[d.destination.id] for d in demands],
+            destinations=list(destinations.values()),
+            available_time=[d.available_time for d in demands],
+            due_time=[d.due_time for d in demands],
+            travel_days=[d.travel_days for d in demands],
+            planning_horizon=planning_horizon,
+            demands=list(demands),
+        )
+
+    def __len__(self) -> int:
+        return len(self.weight)
+
+    @property
+    def is_aggregated(self) -> bool:
+        return self.members is not None
+
+    def aggregate(self) -> "DemandTable":
+        """
+        Collapse demands with the same destination, time window, weight, area
+        and travel days into one row per class, in order of first occurrence.
+        """
+        classes: dict[tuple, List[int]] = {}
+        keys = zip(
+            self.destination.tolist(),
+            self.available_time.astype(np.int64).tolist(),
+            self.due_time.astype(np.int64).tolist(),
+            self.weight.tolist(),
+            self.area.tolist(),
+            self.travel_days.tolist(),
+        )
+        for i, key in enumerate(keys):
+            classes.setdefault(key, []).append(i)
+
+        members = list(classes.values())
+        first = np.array([rows[0] for rows in members], dtype=np.int64)
+        table = DemandTable(
+            demand_ids=self.demand_ids[first],
+            weight=self.weight[first],
+            area=self.area[first],
+            destination=self.destination[first],
+            destinations=self.destinations,
+            available_time=self.available_time[first],
+            due_time=self.due_time[first],
+            travel_days=self.travel_days[first],
+            planning_horizon=self.planning_horizon,
+            count=[len(rows) for rows in members],
+        )
+        table.members = members
+        table.items = self
+        return table
+
+    @property
+    def total_weight(self) -> float:
+        return float(self.weight @ self.count)
+
+    def items_per_destination(self) -> np.ndarray:
+        """Number of demand items per destination position, counting class sizes."""
+        return np.bincount(
+            self.destination, weights=self.count, minlength=len(self.destinations)
+        ).astype(np.int64)
+
+    @property
+    def is_feasible(self) -> np.ndarray:
+        """True for demands with at least one feasible start day in the horizon."""
+        return self.available_idx <= self.last_start_idx
+
+    @property
+    def destination_ids(self) -> np.ndarray:
+        return np.array([f.id for f in self.destinations], dtype=np.int64)
+
+    def feasible_starts(self, i: int) -> range:
+        return range(int(self.available_idx[i]), int(self.last_start_idx[i]) + 1)
+
+    def rows_starting_on(self, day_idx: int) -> List[int]:
+        """Rows that can start their trip on horizon day day_idx."""
+        if self._starting_on is None:
+            self._starting_on = self._bucket_by_day(self.available_idx, self.last_start_idx)
+        return self._starting_on[day_idx]
+
+    def rows_active_on(self, day_idx: int) -> List[int]:
+        """
+        Rows whose trip can cover horizon day day_idx for some feasible start,
+        i.e. day_idx in [available_idx, last_start_idx + travel_days - 1].
+        """
+        if self._active_on is None:
+            last_active = np.minimum(
+                self.last_start_idx + self.travel_days - 1, len(self.planning_horizon) - 1
+            )
+            last_active[~self.is_feasible | (self.travel_days <= 0)] = -1
+            self._active_on = self._bucket_by_day(self.available_idx, last_active)
+        return self._active_on[day_idx]
+
+    def start_pairs(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Rows and start days of all feasible (row, start) pairs, ordered by
+        row and then start, i.e. in the order the assignment models create x.
+        """
+        if self._start_pairs is None:
+            self._start_pairs = _expand_ranges(self.available_idx, self.last_start_idx)
+        return self._start_pairs
+
+    def covered_days(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Position in start_pairs() and horizon day, for every day a pair's trip covers."""
+        if self._covered_days is None:
+            pair_row, pair_start = self.start_pairs()
+            last_day = np.minimum(
+                pair_start + self.travel_days[pair_row] - 1, len(self.planning_horizon) - 1
+            )
+            self._covered_days = _expand_ranges(pair_start, last_day)
+        return self._covered_days
+
+    def pairs_active_on(self, day_idx: int) -> List[Tuple[int, int]]:
+        """
+        (row, start day) pairs whose trip [start, start + travel_days) covers
+        horizon day day_idx, ordered by row and then start.
+        """
+        if self._pairs_active_on is None:
+            pair_row, pair_start = self.start_pairs()
+            pair, day = self.covered_days()
+            rows, starts, bounds = self._group_by_day(day, pair_row[pair], pair_start[pair])
+            self._pairs_active_on = [
+                list(zip(rows[bounds[d] : bounds[d + 1]], starts[bounds[d] : bounds[d + 1]]))
+                for d in range(len(self.planning_horizon))
+            ]
+        return self._pairs_active_on[day_idx]
+
+    def _bucket_by_day(self, first: np.ndarray, last: np.ndarray) -> List[List[int]]:
+        """Per horizon day, the rows i with first[i] <= day <= last[i], in row order."""
+        rows, day = _expand_ranges(first, last)
+        rows, bounds = self._group_by_day(day, rows)
+        return [rows[bounds[d] : bounds[d + 1]] for d in range(len(self.planning_horizon))]
+
+    def _group_by_day(self, day: np.ndarray, *columns: np.ndarray) -> tuple:
+        """Sort the columns by day (stable) and return them as lists plus the per-day bounds."""
+        order = np.argsort(day, kind="stable")
+        bounds = np.searchsorted(day[order], np.arange(len(self.planning_horizon) + 1))
+        return (*(c[order].tolist() for c in columns), bounds.tolist())
+
+    def demand(self, i: int) -> Demand:
+        return self.to_demands()[i]
+
+    def to_demands(self) -> List[Demand]:
+        """Demand objects in table order, built on first use when the table came from the CSV ingest."""
+        if self._demands is None:
+            self._demands = build_models(
+                Demand,
+                demand_id=[str(d) for d in self.demand_ids.tolist()],
+                weight=self.weight.tolist(),
+                size_area=self.area.tolist(),
+                destination=[self.destinations[p] for p in self.destination.tolist()],
+                available_time=self.available_time.tolist(),
+                due_time=self.due_time.tolist(),
+                travel_days=self.travel_days.tolist(),
+            )
+        return self._demands
+
+
+def _expand_ranges(first: np.ndarray, last: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    For the integer ranges [first[k], last[k]], return (k, value) for every
+    value of every non-empty range, ordered by k and then value.
+    """
+    keys = np.flatnonzero(first <= last)
+    lengths = (last - first + 1)[keys]
+    owner = np.repeat(keys, lengths)
+    # offset of each value within its range, without a Python loop
+    value = np.repeat(first[keys] - np.cumsum(lengths) + lengths, lengths) + np.arange(
+        lengths.sum()
+    )
+    return owner, value
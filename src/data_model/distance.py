@@ -1,7 +1,8 @@
 from pydantic import BaseModel
 from src.data_model.factory import Factory
-    
-from typing import List
+
+from collections.abc import Mapping
+from typing import Iterable, Iterator, List
 import numpy as np
 
 class Distance(BaseModel):
@@ -14,24 +15,135 @@ class Distance(BaseModel):
         return distance_m / 1000
 
 
-def build_distance_matrix(distances: List[Distance], factories: list[Factory]) -> List[List[float]]:
+class DistanceRow(Mapping):
     """
-    Convert list of Distance objects into a 2D distance matrix
-    Index of factories in the matrix matches their position in 'factories' list.
+    Read-only dict view of one matrix row, keyed by destination factory id.
+    Unknown (inf) pairs are left out, as they were in the old nested dicts.
+    """
+
+    __slots__ = ("_values", "_index")
+
+    def __init__(self, values: np.ndarray, index: dict[int, int]):
+        self._values = values
+        self._index = index
+
+    def __getitem__(self, factory_id: int) -> float:
+        value = float(self._values[self._index[factory_id]])
+        if not np.isfinite(value):
+            raise KeyError(factory_id)
+        return value
+
+    def __iter__(self) -> Iterator[int]:
+        return (f for f, i in self._index.items() if np.isfinite(self._values[i]))
+
+    def __len__(self) -> int:
+        return int(np.isfinite(self._values).sum())
+
+
+class DistanceMatrix(Mapping):
     """
-    n = len(factories)
-    # Map factory id to matrix index
-    factory_idx = {factory.id: idx for idx, factory in enumerate(factories)}
+    Dense distance matrix in km, indexed by factory id.
+
+    Row/column i belongs to factory ids[i]. Unknown pairs are inf and the
+    diagonal is 0. Old callers can keep using it as dict[int, dict[int, float]]
+    (C[i][j], iteration over ids), where unknown pairs are missing keys; new
+    code should use the array slicing.
+    """
+
+    def __init__(self, ids: Iterable[int], values, dtype=np.float64):
+        self.ids = np.asarray(list(ids), dtype=np.int64)
+        self.values = np.ascontiguousarray(values, dtype=dtype)
+        if self.values.shape != (len(self.ids), len(self.ids)):
+            raise ValueError(
+                f"Distance values of shape {self.values.shape} do not match {len(self.ids)} ids"
+            )
+        self.index = {int(f): i for i, f in enumerate(self.ids)}
+
+    @classmethod
+    def from_pairs(
+        cls, ids: Iterable[int], source_ids, destination_ids, distances_km, dtype=np.float64
+    ) -> "DistanceMatrix":
+        ids = list(ids)
+        index = {f: i for i, f in enumerate(ids)}
+        values = np.full((len(ids), len(ids)), np.inf, dtype=dtype)
+        rows = np.fromiter((index[s] for s in source_ids), dtype=np.int64)
+        cols = np.fromiter((index[d] for d in destination_ids), dtype=np.int64)
+        values[rows, cols] = np.asarray(distances_km, dtype=dtype)
+        np.fill_diagonal(values, 0.0)
+        return cls(ids, values, dtype=dtype)
 
-    # Initialize matrix with large value for unreachable pairs
-    matrix = np.full((n, n), np.inf)
+    @classmethod
+    def from_dict(
+        cls, distances: dict[int, dict[int, float]], dtype=np.float64
+    ) -> "DistanceMatrix":
+        if isinstance(distances, DistanceMatrix):
+            return distances
+        ids = sorted(set(distances) | {j for row in distances.values() for j in row})
+        pairs = [(i, j, c) for i, row in distances.items() for j, c in row.items()]
+        return cls.from_pairs(
+            ids,
+            [p[0] for p in pairs],
+            [p[1] for p in pairs],
+            [p[2] for p in pairs],
+            dtype=dtype,
+        )
 
-    for dist in distances:
-        i = factory_idx[dist.source]
-        j = factory_idx[dist.destination]
-        matrix[i][j] = Distance.distance_in_km(dist.distance_m)
+    @classmethod
+    def from_distances(
+        cls, distances: List[Distance], factories: list[Factory], dtype=np.float64
+    ) -> "DistanceMatrix":
+        return cls.from_pairs(
+            [f.id for f in factories],
+            [d.source.id for d in distances],
+            [d.destination.id for d in distances],
+            [Distance.distance_in_km(d.distance_m) for d in distances],
+            dtype=dtype,
+        )
 
-    # Optional: set diagonal to 0
-    np.fill_diagonal(matrix, 0.0)
-    return matrix.tolist()
+    def indices(self, factory_ids: Iterable[int]) -> np.ndarray:
+        """Matrix positions of the given factory ids."""
+        return np.fromiter((self.index[f] for f in factory_ids), dtype=np.int64)
 
+    def row(self, factory_id: int) -> np.ndarray:
+        return self.values[self.index[factory_id]]
+
+    def column(self, factory_id: int) -> np.ndarray:
+        return self.values[:, self.index[factory_id]]
+
+    def submatrix(
+        self, factory_ids: Iterable[int], to_factory_ids: Iterable[int] | None = None
+    ) -> np.ndarray:
+        """
+        Distances between a node set, e.g. the depot plus one day's destinations.
+        Position p of the result belongs to the p-th id passed in.
+        """
+        rows = self.indices(factory_ids)
+        cols = rows if to_factory_ids is None else self.indices(to_factory_ids)
+        return self.values[np.ix_(rows, cols)]
+
+    def max_distance(self) -> float:
+        finite = self.values[np.isfinite(self.values)]
+        return float(finite.max()) if finite.size else 0.0
+
+    def to_dict(self) -> dict[int, dict[int, float]]:
+        return {int(i): dict(self[int(i)]) for i in self.ids}
+
+    def __getitem__(self, factory_id: int) -> DistanceRow:
+        return DistanceRow(self.values[self.index[factory_id]], self.index)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.index)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, factory_id) -> bool:
+        return factory_id in self.index
+
+
+def build_distance_matrix(distances: List[Distance], factories: list[Factory]) -> DistanceMatrix:
+    """
+    Convert list of Distance objects into a dense distance matrix.
+    Index of factories in the matrix matches their position in 'factories' list.
+    """
+    return DistanceMatrix.from_distances(distances, factories)
@@ -0,0 +1,19 @@
+from pydantic import BaseModel, ConfigDict
+from src.data_model.factory import Factory
+from src.data_model.order import Order
+from src.data_model.demand import Demand
+from src.data_model.truck import Truck
+from src.data_model.distance import DistanceMatrix
+from typing import Dict, List
+
+
+class ProblemData(BaseModel):
+    """All parsed inputs of a planning run, derived from one read of each source file."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    factories: Dict[int, Factory]
+    orders: List[Order]
+    demands: List[Demand]
+    trucks: List[Truck]
+    distances: DistanceMatrix
@@ -0,0 +1,111 @@
+from src.data_model.cvrp_input import CVRPInput
+from src.data_model.distance import DistanceMatrix
+from src.data_model.factory import Factory, create_depot_factory
+from src.data_model.truck import Truck
+from typing import List
+import numpy as np
+import config
+
+
+class RouteTable:
+    """
+    Struct-of-arrays view of one day's routing problem.
+
+    Position 0 is the depot and position p >= 1 the destination of demand
+    p - 1, so every column has one entry per node: weight and area are 0 at
+    the depot, ready and due are the demand's clock minutes (0 and inf at
+    the depot). distance is the node-by-node matrix in km.
+
+    The fleet is kept per physical truck, in input order: capacity,
+    inner_size (inf when unknown), cost and speed.
+    """
+
+    def __init__(
+        self,
+        nodes: List[Factory],
+        weight: np.ndarray,
+        area: np.ndarray,
+        ready: np.ndarray,
+        due: np.ndarray,
+        distance: np.ndarray,
+        trucks: List[Truck],
+    ):
+        self.nodes = list(nodes)
+        self.weight = np.ascontiguousarray(weight, dtype=np.float64)
+        self.area = np.ascontiguousarray(area, dtype=np.float64)
+        self.ready = np.ascontiguousarray(ready, dtype=np.float64)
+        self.due = np.ascontiguousarray(due, dtype=np.float64)
+        self.distance = np.ascontiguousarray(distance, dtype=np.float64)
+        if self.distance.shape != (len(self.nodes), len(self.nodes)):
+            raise ValueError(
+                f"Distances of shape {self.distance.shape} do not match {len(self.nodes)} nodes"
+            )
+
+        self.trucks = list(trucks)
+        self.capacity = np.array([t.capacity for t in trucks], dtype=np.float64)
+        inner_size = np.array(
+            [np.inf if t.inner_size is None else t.inner_size for t in trucks], dtype=np.float64
+        )
+        inner_size[np.isnan(inner_size)] = np.inf
+        self.inner_size = inner_size
+        self.cost = np.array([t.cost for t in trucks], dtype=np.float64)
+        self.speed = np.array([t.speed for t in trucks], dtype=np.float64)
+        self.max_stops = config.MAX_STOPS
+
+    @classmethod
+    def from_cvrp_input(cls, input_data: CVRPInput) -> "RouteTable":
+        demands = input_data.demands
+        nodes = [create_depot_factory()] + [d.destination for d in demands]
+        distances = input_data.distance_matrix
+        if isinstance(distances, (DistanceMatrix, dict)):
+            distance = DistanceMatrix.from_dict(distances).submatrix([f.id for f in nodes])
+        else:
+            # already positional, depot first
+            distance = np.asarray(distances, dtype=np.float64)
+
+        return cls(
+            nodes=nodes,
+            weight=[0.0] + [d.weight for d in demands],
+            area=[0.0] + [d.size_area for d in demands],
+            ready=[0.0] + [d.available_minutes for d in demands],
+            due=[np.inf] + [d.due_minutes for d in demands],
+            distance=distance,
+            trucks=input_data.trucks,
+        )
+
+    def __len__(self) -> int:
+        """Number of nodes, depot included."""
+        return len(self.nodes)
+
+    @property
+    def customers(self) -> range:
+        return range(1, len(self.nodes))
+
+    def neighbours(self, size: int) -> List[List[int]]:
+        """
+        Per node position, the size customers closest to it, nearest first
+        (empty for the depot).
+        """
+        n = len(self.nodes)
+        size = min(size, n - 2)
+        if size <= 0:
+            return [[] for _ in range(n)]
+        distance = self.distance[1:, 1:].copy()
+        np.fill_diagonal(distance, np.inf)
+        closest = np.argsort(distance, axis=1, kind="stable")[:, :size] + 1
+        return [[]] + closest.tolist()
+
+    def route_distance(self, route: List[int]) -> float:
+        """Length of depot -> route -> depot."""
+        if not route:
+            return 0.0
+        path = [0] + list(route) + [0]
+        return float(self.distance[path[:-1], path[1:]].sum())
+
+    def fits(self, truck: int, route: List[int]) -> bool:
+        """Whether the truck at position truck can serve route on its own."""
+        return (
+            len(route) <= self.max_stops
+            and self.weight[route].sum() <= self.capacity[truck] + 1e-9
+            and self.area[route].sum() <= self.inner_size[truck] + 1e-9
+        )
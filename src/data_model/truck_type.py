@@ -0,0 +1,58 @@
+from pydantic import BaseModel
+from typing import List
+from src.data_model.truck import Truck
+import math
+
+
+class TruckType(BaseModel):
+    """
+    Trucks that are interchangeable for the models: same type, inner size,
+    capacity, cost and speed. id is the id of the first truck of the type,
+    so a type of a single truck keeps that truck's id.
+    """
+
+    id: int
+    type: float
+    inner_size: float | None = None
+    capacity: float
+    cost: float
+    speed: float
+    trucks: List[Truck]
+
+    @property
+    def count(self) -> int:
+        return len(self.trucks)
+
+    @classmethod
+    def of(cls, trucks: List[Truck]) -> "TruckType":
+        first = trucks[0]
+        return cls(
+            id=first.id,
+            type=first.type,
+            inner_size=first.inner_size,
+            capacity=first.capacity,
+            cost=first.cost,
+            speed=first.speed,
+            trucks=list(trucks),
+        )
+
+
+def _type_key(truck: Truck) -> tuple:
+    # NaN inner sizes (missing in the CSV) compare unequal, so key them as None
+    inner_size = truck.inner_size
+    if inner_size is not None and math.isnan(inner_size):
+        inner_size = None
+    return (truck.type, inner_size, truck.capacity, truck.cost, truck.speed)
+
+
+def group_truck_types(trucks: List[Truck], aggregate: bool = True) -> List[TruckType]:
+    """
+    Truck types of the fleet in order of first occurrence, with the trucks of
+    each type in fleet order. With aggregate=False every truck is its own type.
+    """
+    if not aggregate:
+        return [TruckType.of([t]) for t in trucks]
+    groups: dict[tuple, List[Truck]] = {}
+    for t in trucks:
+        groups.setdefault(_type_key(t), []).append(t)
+    return [TruckType.of(group) for group in groups.values()]
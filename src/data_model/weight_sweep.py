@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+
+
+class WeightSweepPoint(BaseModel):
+    """
+    One weight setting of a sweep. balance_deviation and slack are the
+    unweighted sums of the z and slack variables; fingerprint identifies the
+    assignment, so equal fingerprints mean the same plan.
+    """
+
+    w_balance: float
+    w_slack: float
+    objective_value: float | None = None
+    balance_deviation: float | None = None
+    slack: float | None = None
+    runtime: float
+    fingerprint: str | None = None
+    is_success: bool = True
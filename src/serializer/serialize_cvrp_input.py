@@ -7,6 +7,7 @@ from src.data_model.cvrp_input import CVRPInput
 from src.data_model.assignment_Input import AssignmentInput
 from src.data_model.assignment_output import AssignmentOutput
 from src.data_model.demand import Demand
+from src.data_model.bulk import build_models
 
 def create_cvrp_input_from_assignment_output(
     assignment_input: AssignmentInput,
@@ -32,30 +33,19 @@ def create_cvrp_input_from_assignment_output(
     for d in assigned_demands:
         grouped[d.destination.id].append(d)
 
-    consolidated_demands = []
+    groups = list(grouped.values())
 
-    for factory_id, group in grouped.items():
-        first_demand = group[0]
-        destination_factory = first_demand.destination
-
-        total_weight = sum(d.weight for d in group)
-        total_area = sum(d.size_area for d in group)
-        earliest_available = min(d.available_time for d in group)
-        latest_due = max(d.due_time for d in group)
-        max_travel_days = max(d.travel_days for d in group)
-
-        new_demand_id = f"agg_{factory_id}_{assigned_date.isoformat()}"
-        
-        new_demand = Demand(
-            demand_id=new_demand_id,
-            weight=total_weight,
-            size_area=total_area,
-            destination=destination_factory,
-            available_time=earliest_available,
-            due_time=latest_due,
-            travel_days=max_travel_days,
-        )
-        consolidated_demands.append(new_demand)
+    # one bulk validation for all consolidated destinations
+    consolidated_demands = build_models(
+        Demand,
+        demand_id=[f"agg_{factory_id}_{assigned_date.isoformat()}" for factory_id in grouped],
+        weight=[sum(d.weight for d in group) for group in groups],
+        size_area=[sum(d.size_area for d in group) for group in groups],
+        destination=[group[0].destination for group in groups],
+        available_time=[min(d.available_time for d in group) for group in groups],
+        due_time=[max(d.due_time for d in group) for group in groups],
+        travel_days=[max(d.travel_days for d in group) for group in groups],
+    )
 
     trucks = truck_used
 
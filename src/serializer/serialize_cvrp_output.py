@@ -0,0 +1,95 @@
+from src.data_model.cvrp_output import CVRPOutput, TruckRoute
+from src.data_model.route_table import RouteTable
+from datetime import datetime
+from typing import List, Tuple
+import config
+
+# a truck's route: (truck position in the fleet, customer positions in visit order)
+Route = Tuple[int, List[int]]
+
+
+def create_truck_route(table: RouteTable, truck: int, route: List[int]) -> TruckRoute:
+    """
+    TruckRoute of depot -> route -> depot. unload_at_node is the load on
+    board when arriving at a node; the first leg departs at minute 0 and
+    every later one after the service time at its tail.
+    """
+    t = table.trucks[truck]
+    route_indices = [0] + list(route) + [0]
+    load_seq = [0.0]
+    start_time = [0.0]
+    travel_times = [0.0]
+    start_time_dt = []
+    travel_cost = 0.0
+    handling_cost = 0.0
+    total_travel_distance = 0.0
+    total_travel_time = 0.0
+    for leg, (i, j) in enumerate(zip(route_indices[:-1], route_indices[1:])):
+        c_ij = float(table.distance[i, j])
+        load_seq.append(float(table.weight[route_indices[leg + 1 :]].sum()) if j != 0 else 0.0)
+        travel_time = (c_ij / t.speed) * 60
+        st = 0.0 if leg == 0 else start_time[-1] + config.SERVICE_TIME_PER_STOP + travel_time
+        start_time.append(st)
+        start_time_dt.append(str(datetime.fromtimestamp(st * 60).strftime("%H:%M")))
+        travel_times.append(travel_time)
+
+        travel_cost += t.cost * c_ij
+        total_travel_distance += c_ij
+        total_travel_time += c_ij / t.speed
+        if j != 0:
+            handling_cost += config.SERVICE_COST_PER_STOP
+
+    return TruckRoute(
+        truck=t,
+        route=[table.nodes[i] for i in route_indices],
+        unload_at_node=load_seq,
+        times_at_node=start_time_dt,
+        travel_times_at_node=travel_times,
+        travel_distance=total_travel_distance,
+        travel_time=total_travel_time,
+        total_stops=len(route),
+        total_travel_cost=travel_cost,
+        total_handling_cost=handling_cost,
+    )
+
+
+def create_cvrp_output_from_routes(
+    table: RouteTable,
+    routes: List[Route],
+    best_bound: float | None = None,
+    mip_gap: float | None = None,
+    is_success: bool = True,
+) -> CVRPOutput:
+    """CVRPOutput of the given routes, empty ones left out, with costs summed over the routes."""
+    truck_routes = [create_truck_route(table, truck, route) for truck, route in routes if route]
+    travel_cost = sum(r.total_travel_cost for r in truck_routes)
+    handling_cost = sum(r.total_handling_cost for r in truck_routes)
+    return CVRPOutput(
+        routes=truck_routes,
+        total_cost=travel_cost + handling_cost,
+        travel_cost=travel_cost,
+        handling_cost=handling_cost,
+        best_bound=best_bound,
+        mip_gap=mip_gap,
+        is_success=is_success,
+    )
+
+
+def routes_from_cvrp_output(table: RouteTable, output: CVRPOutput) -> List[Route]:
+    """
+    The routes of output as (truck position, customer positions). Nodes are
+    matched by factory id; demands sharing a destination take its positions
+    in order.
+    """
+    truck_position = {t.id: p for p, t in enumerate(table.trucks)}
+    positions: dict[int, List[int]] = {}
+    for p in reversed(table.customers):
+        positions.setdefault(table.nodes[p].id, []).append(p)
+    depot_id = table.nodes[0].id
+    return [
+        (
+            truck_position[r.truck.id],
+            [positions[f.id].pop() for f in r.route if f.id != depot_id],
+        )
+        for r in output.routes
+    ]
@@ -1,5 +1,6 @@
-from src.data_model.distance import Distance
+from src.data_model.distance import Distance, DistanceMatrix
 from src.data_model.factory import Factory
+import numpy as np
 import pandas as pd
 
 def serialize_distance_from_data_frame(df: pd.DataFrame, factories: dict[int, Factory]) -> dict[int, dict[int, float]]:
@@ -23,3 +24,25 @@ def serialize_distance_from_data_frame(df: pd.DataFrame, factories: dict[int, Fa
 
     return C
 
+
+
+def serialize_distance_matrix_from_data_frame(
+    df: pd.DataFrame, factories: dict[int, Factory], dtype=np.float64
+) -> DistanceMatrix:
+    """Column-wise variant of serialize_distance_from_data_frame returning a dense matrix."""
+    rows = df.dropna(subset=["Source", "Destination", "Distance(M)"])
+    source_ids = pd.to_numeric(
+        rows["Source"].astype(str).str.split("_").str[1], errors="coerce"
+    )
+    dest_ids = pd.to_numeric(
+        rows["Destination"].astype(str).str.split("_").str[1], errors="coerce"
+    )
+    known = source_ids.isin(list(factories)) & dest_ids.isin(list(factories))
+
+    return DistanceMatrix.from_pairs(
+        sorted(factories),
+        source_ids[known].astype("int64").tolist(),
+        dest_ids[known].astype("int64").tolist(),
+        rows.loc[known, "Distance(M)"].to_numpy(dtype=np.float64) / 1000.0,
+        dtype=dtype,
+    )
@@ -0,0 +1,134 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.data_model.distance import DistanceMatrix
+from src.data_model.factory import Factory
+from src.data_model.order import DangerType
+from src.data_model.bulk import build_models
+
+# bump when the layout of the cached arrays changes
+INPUT_CACHE_VERSION = 1
+
+_ORDER_TEXT_COLUMNS = ["order_id", "material_id", "item_id", "source", "destination"]
+
+
+def fingerprint_source(path: str, block_size: int = 1 << 20) -> dict:
+    """Identify a source file by path, size, mtime and content hash."""
+    stat = os.stat(path)
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(block_size), b""):
+            digest.update(block)
+    return {
+        "path": os.path.abspath(path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": digest.hexdigest(),
+    }
+
+
+def input_cache_key(
+    order_csv: str, truck_csv: str, distance_csv: str, time_format: str
+) -> str:
+    key = {
+        "version": INPUT_CACHE_VERSION,
+        "orders": fingerprint_source(order_csv),
+        "trucks": fingerprint_source(truck_csv),
+        "distances": fingerprint_source(distance_csv),
+        "time_format": time_format,
+    }
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()
+
+
+def input_cache_path(cache_dir: str, key: str) -> str:
+    return os.path.join(cache_dir, f"{key}.npz")
+
+
+def write_input_cache(
+    cache_dir: str,
+    key: str,
+    normalized_orders: pd.DataFrame,
+    factories: dict[int, Factory],
+    distances: DistanceMatrix,
+    truck_df: pd.DataFrame,
+) -> str:
+    """
+    Store the parsed inputs as plain NumPy arrays in one compressed .npz file.
+    The file is written next to its final name and renamed, so readers never
+    see a partial cache.
+    """
+    arrays = {
+        "factory_ids": np.array(list(factories), dtype=np.int64),
+        "factory_names": np.array([f.name for f in factories.values()], dtype=str),
+        "factory_is_depot": np.array(
+            [bool(f.is_depot) for f in factories.values()], dtype=bool
+        ),
+        "distance_ids": distances.ids,
+        "distance_values": distances.values,
+        "order__destination_id": normalized_orders["destination_id"].to_numpy(np.int64),
+        "order__available_time": normalized_orders["available_time"].to_numpy(),
+        "order__due_time": normalized_orders["due_time"].to_numpy(),
+        "order__danger_type": np.array(
+            [t.value for t in normalized_orders["danger_type"]], dtype=np.int64
+        ),
+        "order__area_size": normalized_orders["area_size"].to_numpy(np.float64),
+        "order__weight": normalized_orders["weight"].to_numpy(np.float64),
+    }
+    for column in _ORDER_TEXT_COLUMNS:
+        arrays[f"order__{column}"] = np.array(
+            normalized_orders[column].tolist(), dtype=str
+        )
+    for column in truck_df.columns:
+        arrays[f"truck__{column}"] = truck_df[column].to_numpy()
+
+    os.makedirs(cache_dir, exist_ok=True)
+    path = input_cache_path(cache_dir, key)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as file:
+        np.savez_compressed(file, **arrays)
+    os.replace(tmp_path, path)
+    return path
+
+
+def read_input_cache(
+    cache_dir: str, key: str
+) -> tuple[pd.DataFrame, dict[int, Factory], DistanceMatrix, pd.DataFrame] | None:
+    """Return (normalized orders, factories, distances, trucks) or None on a miss."""
+    path = input_cache_path(cache_dir, key)
+    if not os.path.exists(path):
+        return None
+
+    with np.load(path, allow_pickle=False) as cached:
+        factory_list = build_models(
+            Factory,
+            id=cached["factory_ids"].astype(np.int64).tolist(),
+            name=cached["factory_names"].astype(str).tolist(),
+            is_depot=cached["factory_is_depot"].astype(bool).tolist(),
+        )
+        factories = {factory.id: factory for factory in factory_list}
+        distances = DistanceMatrix(cached["distance_ids"], cached["distance_values"])
+
+        normalized_orders = pd.DataFrame(
+            {column: cached[f"order__{column}"].tolist() for column in _ORDER_TEXT_COLUMNS}
+        )
+        normalized_orders["destination_id"] = cached["order__destination_id"]
+        normalized_orders["available_time"] = cached["order__available_time"]
+        normalized_orders["due_time"] = cached["order__due_time"]
+        normalized_orders["danger_type"] = [
+            DangerType(v) for v in cached["order__danger_type"].tolist()
+        ]
+        normalized_orders["area_size"] = cached["order__area_size"]
+        normalized_orders["weight"] = cached["order__weight"]
+
+        truck_df = pd.DataFrame(
+            {
+                name[len("truck__"):]: cached[name]
+                for name in cached.files
+                if name.startswith("truck__")
+            }
+        )
+    return normalized_orders, factories, distances, truck_df
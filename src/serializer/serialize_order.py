@@ -1,34 +1,29 @@
-from typing import Dict
+from typing import Dict, Iterator
 import config
 from src.data_model.order import Order, DangerType
 import pandas as pd
-from datetime import datetime
+from collections import defaultdict
+from datetime import date
 from src.data_model.factory import Factory
 from src.data_model.demand import Demand
-from src.utils.distance_cal import compute_travel_days
+from src.data_model.demand_table import DemandTable
+from src.data_model.distance import DistanceMatrix
+from src.data_model.bulk import build_models
+from src.utils.distance_cal import compute_travel_days_array
+
+
+DANGER_TYPE_MAPPING = {
+    "type_1": DangerType.TYPE_1,
+    "type_2": DangerType.TYPE_2,
+    "non_danger": DangerType.NOT_DANGEROUS,
+}
 
 
 def map_danger_type(value: str) -> DangerType:
     key = str(value).strip().lower()
-    mapping = {
-        "type_1": DangerType.TYPE_1,
-        "type_2": DangerType.TYPE_2,
-        "non_danger": DangerType.NOT_DANGEROUS,
-    }
-    if key not in mapping:
+    if key not in DANGER_TYPE_MAPPING:
         raise ValueError(f"Invalid danger type: {value}")
-    return mapping[key]
-
-
-def get_factory_list_from_order_data_frame(
-    order_data: pd.DataFrame,
-) -> dict[str, Factory]:
-    factory_names = set(order_data["Source"]).union(set(order_data["Destination"]))
-    factories = {
-        name: Factory(id=name.split("_")[1], name=name)
-        for idx, name in enumerate(factory_names)
-    }
-    return factories
+    return DANGER_TYPE_MAPPING[key]
 
 
 def create_factory_from_order_data(order_data: pd.DataFrame) -> dict[int, Factory]:
@@ -46,60 +41,202 @@ def create_factory_from_order_data(order_data: pd.DataFrame) -> dict[int, Factor
     return factories
 
 
+def get_factory_list_from_order_data_frame(
+    order_data: pd.DataFrame,
+) -> dict[str, Factory]:
+    """
+    The factories of create_factory_from_order_data keyed by name, so that
+    every ingest path builds equal factories.
+    """
+    return {f.name: f for f in create_factory_from_order_data(order_data).values()}
+
+
+def normalize_order_data_frame(
+    order_data: pd.DataFrame, time_format: str = config.ORDER_LARGE_DATE
+) -> pd.DataFrame:
+    """
+    Parse the raw order export column-wise into a normalized order table.
+
+    Rows whose dates cannot be parsed, or whose deadline is before the
+    available time, are dropped. Area is converted to m² and weight to tons.
+    Every column is type-checked here, so the model builders below validate
+    plain Python values in one bulk call.
+    """
+    available_time = pd.to_datetime(
+        order_data["Available_Time"], format=time_format, errors="coerce"
+    )
+    due_time = pd.to_datetime(order_data["Deadline"], format=time_format, errors="coerce")
+    keep = available_time.notna() & due_time.notna() & (due_time >= available_time)
+    rows = order_data.loc[keep]
+
+    danger_type = (
+        rows["Danger_Type"].astype(str).str.strip().str.lower().map(DANGER_TYPE_MAPPING)
+    )
+    invalid = danger_type.isna()
+    if invalid.any():
+        raise ValueError(f"Invalid danger type: {rows['Danger_Type'][invalid].iloc[0]}")
+
+    text_columns = ["Order_ID", "Material_ID", "Item_ID", "Source", "Destination"]
+    missing = rows[text_columns].isna().any()
+    if missing.any():
+        raise ValueError(f"Missing values in column(s): {', '.join(missing[missing].index)}")
+
+    return pd.DataFrame(
+        {
+            "order_id": rows["Order_ID"].astype(str),
+            "material_id": rows["Material_ID"].astype(str),
+            "item_id": rows["Item_ID"].astype(str),
+            "source": rows["Source"].astype(str),
+            "destination": rows["Destination"].astype(str),
+            "destination_id": rows["Destination"].str.split("_").str[1].astype("int64"),
+            "available_time": available_time[keep],
+            "due_time": due_time[keep],
+            "danger_type": danger_type,
+            "area_size": rows["Area"].astype(float) / 10000,
+            "weight": rows["Weight"].astype(float) / 1000000,
+        }
+    ).reset_index(drop=True)
+
+
+def create_order_from_normalized_data_frame(
+    normalized: pd.DataFrame, factories: dict[str, Factory]
+) -> list[Order]:
+    return build_models(
+        Order,
+        id=normalized["order_id"].tolist(),
+        material_id=normalized["material_id"].tolist(),
+        item_id=normalized["item_id"].tolist(),
+        source=[factories[name] for name in normalized["source"].tolist()],
+        destination=[factories[name] for name in normalized["destination"].tolist()],
+        available_date_local=normalized["available_time"].dt.to_pydatetime().tolist(),
+        due_date_local=normalized["due_time"].dt.to_pydatetime().tolist(),
+        danger_type=normalized["danger_type"].tolist(),
+        area_size=normalized["area_size"].tolist(),
+        weight=normalized["weight"].tolist(),
+    )
+
+
 def create_order_from_data_frame(
     order_data: pd.DataFrame, factories: dict[str, Factory], time_format: str = config.ORDER_LARGE_DATE
 ) -> list[Order]:
-    order_list = []
-    for _, row in order_data.iterrows():
-        source_factory = factories.get(row["Source"])
-        destination_factory = factories.get(row["Destination"])
-        try:
-            available_date_local = datetime.strptime(row["Available_Time"], time_format)
-            due_date_local = datetime.strptime(row["Deadline"], time_format)
-        except (ValueError, TypeError):
-            # Skip row if date format is incorrect or missing
-            continue
-        if due_date_local < available_date_local:
-            continue
-
-        danger_type = map_danger_type(row["Danger_Type"])
-        order_instance = Order(
-            id=row["Order_ID"],
-            material_id=row["Material_ID"],
-            item_id=row["Item_ID"],
-            source=source_factory,
-            destination=destination_factory,
-            available_date_local=available_date_local,
-            due_date_local=due_date_local,
-            danger_type=danger_type,
-            area_size=row["Area"] / 10000,
-            weight=row["Weight"] / 1000000,
-        )
-        order_list.append(order_instance)
-    return order_list
+    normalized = normalize_order_data_frame(order_data, time_format)
+    return create_order_from_normalized_data_frame(normalized, factories)
+
+
+def compute_travel_days_by_destination(
+    destination_ids, distances: DistanceMatrix | dict[int, dict[int, float]]
+) -> dict[int, int]:
+    """Travel days from the depot, computed once per distinct destination."""
+    unique_ids = sorted(set(destination_ids))
+    if isinstance(distances, DistanceMatrix):
+        distance_km = distances.row(config.DEPOT_ID)[distances.indices(unique_ids)]
+    else:
+        distance_km = [distances[config.DEPOT_ID][dest_id] for dest_id in unique_ids]
+    travel_days = compute_travel_days_array(
+        distance_km=distance_km,
+        truck_speed_kmph=40,
+        unload_hours=1.0,
+        load_hours=0.0,
+    )
+    return dict(zip(unique_ids, travel_days.tolist()))
+
+
+def create_demands_from_normalized_data_frame(
+    normalized: pd.DataFrame,
+    factories: dict[str, Factory],
+    distances: DistanceMatrix | dict[int, dict[int, float]],
+) -> list[Demand]:
+    destination_ids = normalized["destination_id"].tolist()
+    travel_days = compute_travel_days_by_destination(destination_ids, distances)
+    return build_models(
+        Demand,
+        demand_id=normalized["item_id"].tolist(),
+        weight=normalized["weight"].tolist(),
+        size_area=normalized["area_size"].tolist(),
+        destination=[factories[name] for name in normalized["destination"].tolist()],
+        available_time=normalized["available_time"].dt.to_pydatetime().tolist(),
+        due_time=normalized["due_time"].dt.to_pydatetime().tolist(),
+        travel_days=[travel_days[dest_id] for dest_id in destination_ids],
+    )
+
+
+def create_demand_table_from_normalized_data_frame(
+    normalized: pd.DataFrame,
+    factories: dict[str, Factory],
+    distances: DistanceMatrix | dict[int, dict[int, float]],
+    planning_horizon: list[date],
+) -> DemandTable:
+    """Build the solver-facing DemandTable straight from the order columns."""
+    destination_names = normalized["destination"].unique().tolist()
+    destination_position = {name: p for p, name in enumerate(destination_names)}
+    destination_ids = normalized["destination_id"].tolist()
+    travel_days = compute_travel_days_by_destination(destination_ids, distances)
+
+    return DemandTable(
+        demand_ids=normalized["item_id"].to_numpy(dtype=str),
+        weight=normalized["weight"].to_numpy(),
+        area=normalized["area_size"].to_numpy(),
+        destination=normalized["destination"].map(destination_position).to_numpy(),
+        destinations=[factories[name] for name in destination_names],
+        available_time=normalized["available_time"].to_numpy(),
+        due_time=normalized["due_time"].to_numpy(),
+        travel_days=[travel_days[dest_id] for dest_id in destination_ids],
+        planning_horizon=planning_horizon,
+    )
 
 
 def get_demands_from_order_data_frame(
     order_data: pd.DataFrame, distances: dict[tuple[int, int], float], time_format: str = config.ORDER_LARGE_DATE
 ) -> list[Demand]:
     factories = get_factory_list_from_order_data_frame(order_data)
-    orders = create_order_from_data_frame(order_data, factories, time_format) 
-    demands: list[Demand] = []
-    for order in orders:
-        distance_to_destination = distances[config.DEPOT_ID][order.destination.id]
-        demand = Demand(
-            demand_id=order.item_id,
-            weight=order.weight,
-            size_area=order.area_size,
-            destination=order.destination,
-            available_time=order.available_date_local,
-            due_time=order.due_date_local,
-            travel_days=compute_travel_days(
-                distance_km=distance_to_destination,
-                truck_speed_kmph=40,
-                unload_hours=1.0,
-                load_hours=0.0,
-            ),
-        )
-        demands.append(demand)
-    return demands
+    normalized = normalize_order_data_frame(order_data, time_format)
+    return create_demands_from_normalized_data_frame(normalized, factories, distances)
+
+
+def stream_demand_batches(
+    order_csv: str,
+    distances: DistanceMatrix | dict[int, dict[int, float]],
+    time_format: str = config.ORDER_LARGE_DATE,
+    chunksize: int = 10000,
+) -> Iterator[list[Demand]]:
+    """
+    Read the order file in chunks of `chunksize` rows and yield the validated
+    demands of each chunk. Only one chunk is held in memory at a time; factory
+    objects are shared across chunks and built by create_factory_from_order_data,
+    as on every other ingest path.
+    """
+    factories: dict[str, Factory] = {}
+    for chunk in pd.read_csv(order_csv, encoding="cp1252", chunksize=chunksize):
+        for name, factory in get_factory_list_from_order_data_frame(chunk).items():
+            factories.setdefault(name, factory)
+        normalized = normalize_order_data_frame(chunk, time_format)
+        if len(normalized):
+            yield create_demands_from_normalized_data_frame(normalized, factories, distances)
+
+
+def stream_demands(
+    order_csv: str,
+    distances: DistanceMatrix | dict[int, dict[int, float]],
+    time_format: str = config.ORDER_LARGE_DATE,
+    chunksize: int = 10000,
+) -> Iterator[Demand]:
+    for batch in stream_demand_batches(order_csv, distances, time_format, chunksize):
+        yield from batch
+
+
+def stream_demand_batches_by_date(
+    order_csv: str,
+    distances: DistanceMatrix | dict[int, dict[int, float]],
+    time_format: str = config.ORDER_LARGE_DATE,
+    chunksize: int = 10000,
+) -> Iterator[tuple[date, list[Demand]]]:
+    """
+    Yield (available date, demands) batches per chunk, in date order within a chunk.
+    A date can appear again in a later chunk unless the export is sorted by
+    Available_Time.
+    """
+    for batch in stream_demand_batches(order_csv, distances, time_format, chunksize):
+        by_date: dict[date, list[Demand]] = defaultdict(list)
+        for demand in batch:
+            by_date[demand.available_date].append(demand)
+        yield from sorted(by_date.items())
@@ -0,0 +1,80 @@
+import config
+import pandas as pd
+from src.data_model.distance import DistanceMatrix
+from src.data_model.factory import Factory
+from src.data_model.problem_data import ProblemData
+from src.serializer.serialize_input_cache import input_cache_key, read_input_cache, write_input_cache
+from src.serializer.serialize_distance import serialize_distance_matrix_from_data_frame
+from src.serializer.serialize_order import (
+    create_demands_from_normalized_data_frame,
+    create_factory_from_order_data,
+    create_order_from_normalized_data_frame,
+    normalize_order_data_frame,
+)
+from src.serializer.serializer_truck import create_truck_from_data_frame
+
+
+def create_problem_data(
+    normalized_orders: pd.DataFrame,
+    factories: dict[int, Factory],
+    distances: DistanceMatrix,
+    truck_df: pd.DataFrame,
+) -> ProblemData:
+    factories_by_name = {f.name: f for f in factories.values()}
+    orders = create_order_from_normalized_data_frame(normalized_orders, factories_by_name)
+    demands = create_demands_from_normalized_data_frame(
+        normalized_orders, factories_by_name, distances
+    )
+    trucks = list(create_truck_from_data_frame(truck_df).values())
+
+    return ProblemData(
+        factories=factories,
+        orders=orders,
+        demands=demands,
+        trucks=trucks,
+        distances=distances,
+    )
+
+
+def create_problem_data_from_data_frames(
+    order_df: pd.DataFrame,
+    truck_df: pd.DataFrame,
+    distance_df: pd.DataFrame,
+    time_format: str = config.ORDER_LARGE_DATE,
+) -> ProblemData:
+    factories = create_factory_from_order_data(order_df)
+    distances = serialize_distance_matrix_from_data_frame(distance_df, factories)
+    normalized_orders = normalize_order_data_frame(order_df, time_format)
+    return create_problem_data(normalized_orders, factories, distances, truck_df)
+
+
+def load_problem_data(
+    order_csv: str = config.ORDER_LARGE_CSV,
+    truck_csv: str = config.TRUCK_CSV,
+    distance_csv: str = config.DISTANCE_CSV,
+    time_format: str = config.ORDER_LARGE_DATE,
+    cache_dir: str | None = None,
+) -> ProblemData:
+    """
+    Read each source file exactly once and derive every input from it.
+
+    With a cache_dir, the parsed inputs are stored in a binary cache keyed by
+    the source file fingerprints and the time format, and later runs load
+    that instead of parsing the CSV files again.
+    """
+    if cache_dir is not None:
+        key = input_cache_key(order_csv, truck_csv, distance_csv, time_format)
+        cached = read_input_cache(cache_dir, key)
+        if cached is not None:
+            return create_problem_data(*cached)
+
+    order_df = pd.read_csv(order_csv, encoding="cp1252")
+    truck_df = pd.read_csv(truck_csv)
+    distance_df = pd.read_csv(distance_csv)
+
+    factories = create_factory_from_order_data(order_df)
+    distances = serialize_distance_matrix_from_data_frame(distance_df, factories)
+    normalized_orders = normalize_order_data_frame(order_df, time_format)
+    if cache_dir is not None:
+        write_input_cache(cache_dir, key, normalized_orders, factories, distances, truck_df)
+    return create_problem_data(normalized_orders, factories, distances, truck_df)
@@ -1,18 +1,23 @@
 from src.data_model.truck import Truck
+from src.data_model.bulk import build_models
 import pandas as pd
 from typing import Dict
 
 
 def create_truck_from_data_frame(df: pd.DataFrame) -> Dict[str,Truck]:
-    truck_list: Dict[str, Truck] = {}
-    for _, row in df.iterrows():
-        truck_instance = Truck(
-            id=row['Id'],
-            type=row['TruckTypeMeter'],
-            inner_size=row['TruckSizeMeterSquared'],
-            capacity=row['CapacityPerKg'],
-            cost=row['CostPerKg'],
-            speed=row['SpeedKmPerH']
-        )
-        truck_list[truck_instance.id] = truck_instance
-    return truck_list
+    # report missing values per column before the per-row validation
+    required = ['Id', 'TruckTypeMeter', 'CapacityPerKg', 'CostPerKg', 'SpeedKmPerH']
+    missing = df[required].isna().any()
+    if missing.any():
+        raise ValueError(f"Missing values in column(s): {', '.join(missing[missing].index)}")
+
+    trucks = build_models(
+        Truck,
+        id=df['Id'].astype('int64').tolist(),
+        type=df['TruckTypeMeter'].astype(float).tolist(),
+        inner_size=df['TruckSizeMeterSquared'].astype(float).tolist(),
+        capacity=df['CapacityPerKg'].astype(float).tolist(),
+        cost=df['CostPerKg'].astype(float).tolist(),
+        speed=df['SpeedKmPerH'].astype(float).tolist(),
+    )
+    return {truck.id: truck for truck in trucks}
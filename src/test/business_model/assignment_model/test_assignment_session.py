@@ -0,0 +1,94 @@
+import pytest
+
+from src.data_model.assignment_Input import AssignmentInput
+from src.data_model.demand import Demand
+from src.data_model.truck import Truck
+from src.data_model.factory import Factory
+from src.business_model.mip.assignment_model.assignment_session import AssignmentSession
+from src.business_model.mip.assignment_model.order_assignment import assign_orders_with_truck
+from datetime import date, datetime, timedelta
+
+start = date(2025, 10, 10)
+planning_horizon = [start + timedelta(days=i) for i in range(4)]
+a = Factory(id=1, name="A")
+b = Factory(id=2, name="B")
+
+
+def at(day: int, hour: int) -> datetime:
+    return datetime.combine(planning_horizon[day], datetime.min.time()) + timedelta(hours=hour)
+
+
+@pytest.fixture
+def input_data():
+    demands = [
+        Demand(demand_id="1", weight=6, size_area=4, destination=a, available_time=at(0, 8), due_time=at(2, 20), travel_days=2),
+        Demand(demand_id="2", weight=5, size_area=3, destination=b, available_time=at(0, 8), due_time=at(3, 20), travel_days=1),
+        Demand(demand_id="3", weight=3, size_area=2, destination=a, available_time=at(1, 8), due_time=at(3, 20), travel_days=1),
+        Demand(demand_id="4", weight=4, size_area=3, destination=b, available_time=at(2, 8), due_time=at(3, 20), travel_days=1),
+    ]
+    trucks = [
+        Truck(id=1, capacity=10, inner_size=8, speed=40, cost=2, type=50),
+        Truck(id=2, capacity=8, inner_size=6, speed=40, cost=1, type=40),
+    ]
+    return AssignmentInput(
+        demands=demands,
+        trucks=trucks,
+        planning_horizon=planning_horizon,
+        w_balance=1,
+        w_slack=10,
+    )
+
+
+def test_session_matches_fresh_solve_after_changes(input_data):
+    session = AssignmentSession(input_data)
+    assert session.solve().objective_value == pytest.approx(
+        assign_orders_with_truck(input_data).objective_value
+    )
+
+    session.add_demands([
+        Demand(demand_id="5", weight=7, size_area=5, destination=a, available_time=at(1, 8), due_time=at(3, 20), travel_days=1),
+        Demand(demand_id="6", weight=2, size_area=1, destination=b, available_time=at(0, 8), due_time=at(1, 20), travel_days=1),
+    ])
+    session.remove_demands(["2"])
+    session.change_due_times({"1": at(3, 20)})
+    output = session.solve()
+
+    changed = input_data.model_copy(update={"demands": session.demands})
+    assert output.is_success
+    assert sorted(oa.demand.demand_id for oa in output.assignments) == ["1", "3", "4", "5", "6"]
+    assert output.objective_value == pytest.approx(
+        assign_orders_with_truck(changed).objective_value
+    )
+    moved = next(oa for oa in output.assignments if oa.demand.demand_id == "1")
+    assert moved.assigned_date in moved.demand.feasible_dates(planning_horizon)
+
+
+def test_session_rejects_duplicate_demand(input_data):
+    session = AssignmentSession(input_data)
+    with pytest.raises(ValueError):
+        session.add_demands([input_data.demands[0]])
+    duplicate = input_data.demands[1].model_copy(update={"demand_id": "1"})
+    with pytest.raises(ValueError):
+        AssignmentSession(
+            input_data.model_copy(update={"demands": input_data.demands + [duplicate]})
+        )
+
+
+def test_rejected_delta_leaves_the_session_solvable(input_data):
+    session = AssignmentSession(input_data)
+    expected = session.solve().objective_value
+
+    with pytest.raises(ValueError):
+        session.remove_demands(["1", "nope"])
+    with pytest.raises(ValueError):
+        session.remove_demands(["1", "1"])
+    with pytest.raises(ValueError):
+        session.change_due_times({"1": at(3, 20), "nope": at(3, 20)})
+    new = Demand(demand_id="5", weight=2, size_area=1, destination=a, available_time=at(0, 8), due_time=at(3, 20), travel_days=1)
+    with pytest.raises(ValueError):
+        session.add_demands([new, new])
+
+    output = session.solve()
+    assert output.is_success
+    assert sorted(oa.demand.demand_id for oa in output.assignments) == ["1", "2", "3", "4"]
+    assert output.objective_value == pytest.approx(expected)
@@ -0,0 +1,252 @@
+import pytest
+from functools import partial
+
+from src.data_model.assignment_Input import AssignmentInput
+from src.data_model.demand import Demand
+from src.data_model.demand_table import DemandTable
+from src.data_model.truck import Truck
+from src.data_model.factory import Factory
+from src.business_model.mip.assignment_model.order_assignment import (
+    assign_orders_with_truck,
+    assignment_orders_to_trucks_days,
+    build_assignment_orders_to_trucks_days_model,
+)
+from src.business_model.mip.assignment_model.assignement_demands import assign_orders
+from src.business_model.mip.assignment_model.rolling_horizon import rolling_horizon_assignment
+from src.business_model.mip.assignment_model.assignment_session import AssignmentSession
+from src.business_model.heuristic.greedy_assignment import assign_orders_greedy
+from src.business_model.heuristic.lp_rounding import solve_lp_rounding
+from src.business_model.solve_control import SolveControl
+from datetime import date, datetime, timedelta
+
+start = date(2025, 10, 10)
+planning_horizon = [start + timedelta(days=i) for i in range(4)]
+
+
+def at(day: int, hour: int) -> datetime:
+    return datetime.combine(planning_horizon[day], datetime.min.time()) + timedelta(hours=hour)
+
+
+@pytest.fixture
+def input_data():
+    a = Factory(id=1, name="A")
+    b = Factory(id=2, name="B")
+    c = Factory(id=3, name="C")
+    demands = [
+        Demand(demand_id="1", weight=5, size_area=4, destination=a, available_time=at(0, 8), due_time=at(1, 20), travel_days=1),
+        Demand(demand_id="2", weight=6, size_area=5, destination=b, available_time=at(0, 8), due_time=at(3, 20), travel_days=2),
+        Demand(demand_id="3", weight=3, size_area=2, destination=c, available_time=at(1, 8), due_time=at(2, 20), travel_days=1),
+        Demand(demand_id="4", weight=4, size_area=3, destination=a, available_time=at(2, 8), due_time=at(3, 20), travel_days=1),
+        Demand(demand_id="5", weight=2, size_area=1, destination=b, available_time=at(0, 8), due_time=at(0, 20), travel_days=1),
+    ]
+    trucks = [
+        Truck(id=1, capacity=10, inner_size=8, speed=40, cost=2, type=50),
+        Truck(id=2, capacity=8, inner_size=6, speed=40, cost=1, type=40),
+    ]
+    return AssignmentInput(
+        demands=demands,
+        trucks=trucks,
+        planning_horizon=planning_horizon,
+        w_balance=1,
+        w_slack=10,
+    )
+
+
+@pytest.mark.parametrize(
+    "assign", [assign_orders_with_truck, assignment_orders_to_trucks_days]
+)
+def test_assignment_is_feasible(assign, input_data):
+    output = assign(input_data)
+
+    assert output.is_success
+    assert len(output.assignments) == len(input_data.demands)
+    assert {a.demand.demand_id for a in output.assignments} == {
+        d.demand_id for d in input_data.demands
+    }
+    for a in output.assignments:
+        assert a.assigned_date in a.demand.feasible_dates(planning_horizon)
+        assert a.truck in input_data.trucks
+
+
+@pytest.mark.parametrize(
+    "assign", [assign_orders_with_truck, assignment_orders_to_trucks_days]
+)
+def test_assignment_accepts_demand_table(assign, input_data):
+    table = DemandTable.from_demands(input_data.demands, planning_horizon)
+    from_table = assign(input_data.model_copy(update={"demands": []}), table)
+    from_demands = assign(input_data)
+
+    assert from_table.is_success
+    assert from_table.objective_value == pytest.approx(from_demands.objective_value)
+    assert len(from_table.assignments) == len(input_data.demands)
+
+
+@pytest.mark.parametrize(
+    "assign", [assign_orders_with_truck, assignment_orders_to_trucks_days, assign_orders]
+)
+def test_matrix_builder_matches_quicksum_builder(assign, input_data):
+    matrix = assign(input_data, use_matrix_api=True)
+    quicksum = assign(input_data)
+
+    assert matrix.objective_value == pytest.approx(quicksum.objective_value)
+    assert len(matrix.assignments) == len(input_data.demands)
+    for a in matrix.assignments:
+        assert a.assigned_date in a.demand.feasible_dates(planning_horizon)
+
+
+@pytest.mark.parametrize("use_matrix_api", [False, True])
+@pytest.mark.parametrize(
+    "assign", [assign_orders_with_truck, assignment_orders_to_trucks_days, assign_orders]
+)
+def test_aggregated_demands_match_item_model(assign, use_matrix_api, input_data):
+    copies = [
+        d.model_copy(update={"demand_id": f"{d.demand_id}b"})
+        for d in input_data.demands
+        if d.weight <= 3
+    ]
+    input_data = input_data.model_copy(update={"demands": input_data.demands + copies})
+
+    aggregated = assign(input_data, use_matrix_api=use_matrix_api, aggregate_demands=True)
+    items = assign(input_data)
+
+    assert aggregated.objective_value == pytest.approx(items.objective_value)
+    assert sorted(a.demand.demand_id for a in aggregated.assignments) == sorted(
+        d.demand_id for d in input_data.demands
+    )
+    for a in aggregated.assignments:
+        assert a.assigned_date in a.demand.feasible_dates(planning_horizon)
+
+
+@pytest.mark.parametrize("use_matrix_api", [False, True])
+@pytest.mark.parametrize(
+    "assign", [assign_orders_with_truck, assignment_orders_to_trucks_days]
+)
+def test_aggregated_trucks_match_truck_model(assign, use_matrix_api, input_data):
+    twin = input_data.trucks[1].model_copy(update={"id": 3})
+    input_data = input_data.model_copy(update={"trucks": input_data.trucks + [twin]})
+
+    by_type = assign(input_data, use_matrix_api=use_matrix_api, aggregate_trucks=True)
+    by_truck = assign(input_data)
+
+    assert by_type.is_success
+    assert by_type.objective_value == pytest.approx(by_truck.objective_value)
+    assert len(by_type.assignments) == len(input_data.demands)
+    loads = {}
+    for a in by_type.assignments:
+        assert a.truck in input_data.trucks
+        start = planning_horizon.index(a.assigned_date)
+        for day in range(start, min(start + a.demand.travel_days, len(planning_horizon))):
+            loads[a.truck.id, day] = loads.get((a.truck.id, day), 0) + a.demand.weight
+    capacity = {t.id: t.capacity for t in input_data.trucks}
+    assert all(load <= capacity[k] for (k, _), load in loads.items())
+
+
+@pytest.mark.parametrize(
+    "assign",
+    [
+        partial(rolling_horizon_assignment, window_days=1, step_days=1),
+        lambda input_data, aggregate_trucks: AssignmentSession(
+            input_data, aggregate_trucks=aggregate_trucks
+        ).solve(),
+    ],
+)
+def test_aggregated_trucks_report_overflowing_dispatch(assign, input_data):
+    # 20 kg fit two 10 kg trucks by type, but 6, 6, 6 and 2 do not pack onto them
+    day = planning_horizon[:1]
+    twin = input_data.trucks[0].model_copy(update={"id": 3})
+    demands = [
+        Demand(demand_id=str(n), weight=w, size_area=1, destination=Factory(id=n, name=str(n)),
+               available_time=at(0, 8), due_time=at(0, 20), travel_days=1)
+        for n, w in enumerate([6, 6, 6, 2], start=1)
+    ]
+    input_data = input_data.model_copy(
+        update={"demands": demands, "trucks": [input_data.trucks[0], twin], "planning_horizon": day}
+    )
+
+    output = assign(input_data, aggregate_trucks=True)
+
+    assert not output.is_success
+    assert len(output.assignments) == len(demands)
+
+
+@pytest.mark.parametrize(
+    "assign", [assign_orders_with_truck, assignment_orders_to_trucks_days]
+)
+def test_aggregated_trucks_solve_again_when_the_dispatch_overflows(assign, input_data):
+    # by type, the last day takes 7, 7 and 5 kg on two 10 kg trucks; by truck
+    # the 5 kg demand moves to the middle day at the same balance
+    days = planning_horizon[:3]
+    twin = input_data.trucks[0].model_copy(update={"id": 3})
+    demands = [
+        Demand(demand_id=str(n), weight=w, size_area=1, destination=Factory(id=n, name=str(n)),
+               available_time=at(first, 8), due_time=at(last, 20), travel_days=1)
+        for n, (w, first, last) in enumerate(
+            [(7, 1, 1), (5, 1, 2), (5, 1, 1), (7, 2, 2), (7, 2, 2)], start=1
+        )
+    ]
+    input_data = input_data.model_copy(
+        update={"demands": demands, "trucks": [input_data.trucks[0], twin], "planning_horizon": days}
+    )
+
+    by_type = assign(input_data, aggregate_trucks=True)
+    by_truck = assign(input_data)
+
+    assert by_type.is_success
+    assert by_type.objective_value == pytest.approx(by_truck.objective_value)
+    assert len(by_type.assignments) == len(demands)
+    loads = {}
+    for a in by_type.assignments:
+        loads[a.truck.id, a.assigned_date] = loads.get((a.truck.id, a.assigned_date), 0) + a.demand.weight
+    assert all(load <= 10 for load in loads.values())
+
+
+def test_greedy_assignment_is_feasible(input_data):
+    output = assign_orders_greedy(input_data)
+
+    assert output.is_success
+    assert len(output.assignments) == len(input_data.demands)
+    loads = {}
+    for a in output.assignments:
+        assert a.assigned_date in a.demand.feasible_dates(planning_horizon)
+        start = planning_horizon.index(a.assigned_date)
+        for day in range(start, min(start + a.demand.travel_days, len(planning_horizon))):
+            loads[a.truck.id, day] = loads.get((a.truck.id, day), 0) + a.demand.weight
+    capacity = {t.id: t.capacity for t in input_data.trucks}
+    assert all(load <= capacity[k] for (k, _), load in loads.items())
+
+
+@pytest.mark.parametrize(
+    "assign", [assign_orders_with_truck, assignment_orders_to_trucks_days]
+)
+def test_warm_start_keeps_the_optimum(assign, input_data):
+    warm = assign(input_data, warm_start=True)
+    cold = assign(input_data)
+
+    assert warm.is_success
+    assert warm.objective_value == pytest.approx(cold.objective_value)
+
+
+@pytest.mark.parametrize("assign", [assignment_orders_to_trucks_days, assign_orders])
+def test_lp_rounding_brackets_the_optimum(assign, input_data):
+    fast = assign(input_data, lp_rounding=True)
+    exact = assign(input_data)
+
+    assert fast.is_success
+    assert {a.demand.demand_id for a in fast.assignments} == {
+        d.demand_id for d in input_data.demands
+    }
+    for a in fast.assignments:
+        assert a.assigned_date in a.demand.feasible_dates(planning_horizon)
+    assert fast.best_bound <= exact.objective_value + 1e-6
+    assert fast.objective_value >= exact.objective_value - 1e-6
+    assert 0 <= fast.mip_gap <= 1
+
+
+def test_lp_rounding_shares_the_time_limit(input_data):
+    built = build_assignment_orders_to_trucks_days_model(input_data)
+
+    solved = solve_lp_rounding(built, SolveControl(time_limit=5.0))
+
+    assert solved.has_solution
+    # the repair MIP only gets what the LP and the rounding left
+    assert built.model.Params.TimeLimit < 5.0
@@ -0,0 +1,65 @@
+import pytest
+
+from src.data_model.assignment_Input import AssignmentInput
+from src.data_model.demand import Demand
+from src.data_model.truck import Truck
+from src.data_model.factory import Factory
+from src.business_model.mip.assignment_model.rolling_horizon import rolling_horizon_assignment
+from datetime import date, datetime, timedelta
+
+start = date(2025, 10, 10)
+planning_horizon = [start + timedelta(days=i) for i in range(6)]
+
+
+def at(day: int, hour: int) -> datetime:
+    return datetime.combine(planning_horizon[day], datetime.min.time()) + timedelta(hours=hour)
+
+
+@pytest.fixture
+def input_data():
+    a = Factory(id=1, name="A")
+    b = Factory(id=2, name="B")
+    demands = [
+        Demand(demand_id="1", weight=6, size_area=4, destination=a, available_time=at(0, 8), due_time=at(2, 20), travel_days=3),
+        Demand(demand_id="2", weight=5, size_area=3, destination=b, available_time=at(0, 8), due_time=at(5, 20), travel_days=2),
+        Demand(demand_id="3", weight=3, size_area=2, destination=a, available_time=at(1, 8), due_time=at(3, 20), travel_days=1),
+        Demand(demand_id="4", weight=4, size_area=3, destination=b, available_time=at(2, 8), due_time=at(5, 20), travel_days=1),
+        Demand(demand_id="5", weight=7, size_area=5, destination=a, available_time=at(3, 8), due_time=at(5, 20), travel_days=2),
+        Demand(demand_id="6", weight=2, size_area=1, destination=b, available_time=at(4, 8), due_time=at(5, 20), travel_days=1),
+    ]
+    trucks = [
+        Truck(id=1, capacity=10, inner_size=8, speed=40, cost=2, type=50),
+        Truck(id=2, capacity=8, inner_size=6, speed=40, cost=1, type=40),
+    ]
+    return AssignmentInput(
+        demands=demands,
+        trucks=trucks,
+        planning_horizon=planning_horizon,
+        w_balance=1,
+        w_slack=10,
+    )
+
+
+@pytest.mark.parametrize("use_matrix_api", [False, True])
+@pytest.mark.parametrize("window_days, step_days", [(6, 6), (3, 1), (2, 2)])
+def test_rolling_horizon_respects_truck_occupancy(window_days, step_days, use_matrix_api, input_data):
+    output = rolling_horizon_assignment(
+        input_data, window_days, step_days, use_matrix_api=use_matrix_api
+    )
+
+    assert output.is_success
+    assert sorted(a.demand.demand_id for a in output.assignments) == ["1", "2", "3", "4", "5", "6"]
+    loads = {}
+    for a in output.assignments:
+        assert a.assigned_date in a.demand.feasible_dates(planning_horizon)
+        first = planning_horizon.index(a.assigned_date)
+        for day in range(first, min(first + a.demand.travel_days, len(planning_horizon))):
+            loads[a.truck.id, day] = loads.get((a.truck.id, day), 0) + a.demand.weight
+    capacity = {t.id: t.capacity for t in input_data.trucks}
+    assert all(load <= capacity[k] for (k, _), load in loads.items())
+    assert sum(output.daily_loads.values()) == pytest.approx(sum(loads.values()))
+
+
+def test_rolling_horizon_rejects_step_longer_than_window(input_data):
+    with pytest.raises(ValueError):
+        rolling_horizon_assignment(input_data, window_days=2, step_days=3)
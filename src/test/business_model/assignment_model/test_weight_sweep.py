@@ -0,0 +1,61 @@
+import pytest
+
+from src.data_model.assignment_Input import AssignmentInput
+from src.data_model.demand import Demand
+from src.data_model.truck import Truck
+from src.data_model.factory import Factory
+from src.business_model.mip.assignment_model.order_assignment import (
+    build_assign_orders_with_truck_model,
+)
+from src.business_model.mip.assignment_model.assignement_demands import build_assign_orders_model
+from src.business_model.mip.assignment_model.weight_sweep import weight_sweep
+from datetime import date, datetime, timedelta
+
+start = date(2025, 10, 10)
+planning_horizon = [start + timedelta(days=i) for i in range(3)]
+weights = [(1, 10), (1, 0.01), (5, 1), (1, 10)]
+
+
+def at(day: int, hour: int) -> datetime:
+    return datetime.combine(planning_horizon[day], datetime.min.time()) + timedelta(hours=hour)
+
+
+@pytest.fixture
+def input_data():
+    a = Factory(id=1, name="A")
+    b = Factory(id=2, name="B")
+    demands = [
+        Demand(demand_id="1", weight=9, size_area=4, destination=a, available_time=at(0, 8), due_time=at(0, 20), travel_days=1),
+        Demand(demand_id="2", weight=8, size_area=3, destination=b, available_time=at(0, 8), due_time=at(0, 20), travel_days=1),
+        Demand(demand_id="3", weight=7, size_area=2, destination=a, available_time=at(0, 8), due_time=at(2, 20), travel_days=1),
+        Demand(demand_id="4", weight=2, size_area=1, destination=b, available_time=at(1, 8), due_time=at(2, 20), travel_days=1),
+    ]
+    trucks = [
+        Truck(id=1, capacity=10, inner_size=8, speed=40, cost=2, type=50),
+        Truck(id=2, capacity=9, inner_size=6, speed=40, cost=1, type=40),
+    ]
+    return AssignmentInput(
+        demands=demands,
+        trucks=trucks,
+        planning_horizon=planning_horizon,
+        w_balance=1,
+        w_slack=10,
+    )
+
+
+@pytest.mark.parametrize("build", [build_assign_orders_with_truck_model, build_assign_orders_model])
+def test_sweep_matches_fresh_solves(build, input_data):
+    points = weight_sweep(build(input_data), weights)
+
+    assert [(p.w_balance, p.w_slack) for p in points] == weights
+    for point in points:
+        fresh = build(
+            input_data.model_copy(update={"w_balance": point.w_balance, "w_slack": point.w_slack})
+        ).model
+        fresh.optimize()
+        assert point.is_success
+        assert point.fingerprint
+        assert point.objective_value == pytest.approx(fresh.ObjVal)
+        assert point.objective_value == pytest.approx(
+            point.w_balance * point.balance_deviation + point.w_slack * point.slack
+        )
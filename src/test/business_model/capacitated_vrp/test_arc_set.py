@@ -0,0 +1,42 @@
+import numpy as np
+
+from src.business_model.mip.capacited_vrp_model.arc_set import sparse_arcs
+
+distance = np.array([
+    [0, 10, 15, 20],
+    [10, 0, 35, 25],
+    [15, 35, 0, 30],
+    [20, 25, 30, 0],
+])
+demand = [0, 5, 3, 7]
+
+
+def test_capacity_drops_pairs_and_customers_a_type_cannot_carry():
+    small, large = sparse_arcs(distance, demand, [6, 10])
+
+    # the small type cannot carry customer 3, nor customers 1 and 2 together
+    assert small == [(0, 1), (0, 2), (1, 0), (2, 0)]
+    # 1 and 3 together exceed 10 as well
+    assert large == [
+        (0, 1), (0, 2), (0, 3), (1, 0), (1, 2), (2, 0), (2, 1), (2, 3), (3, 0), (3, 2)
+    ]
+
+
+def test_time_windows_drop_arcs_arriving_after_the_due_time():
+    ready = [0, 0, 40, 0]
+    due = [1000, 30, 1000, 1000]
+
+    (arcs,) = sparse_arcs(
+        distance, demand, [100], ready=ready, due=due, service_time=5
+    )
+
+    # 1 is due at 30: from the depot 0 + 5 + 10 is in time, from 3 0 + 5 + 25
+    # just in time, from 2 40 + 5 + 35 too late
+    assert (0, 1) in arcs and (3, 1) in arcs
+    assert (2, 1) not in arcs
+
+
+def test_nearest_neighbors_keep_depot_arcs():
+    (arcs,) = sparse_arcs(distance, demand, [100], nearest_neighbors=1)
+
+    assert arcs == [(0, 1), (0, 2), (0, 3), (1, 0), (1, 3), (2, 0), (2, 3), (3, 0), (3, 1)]
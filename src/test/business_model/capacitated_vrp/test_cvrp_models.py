@@ -0,0 +1,143 @@
+import numpy as np
+import pytest
+
+from src.data_model.cvrp_input import CVRPInput
+from src.data_model.demand import Demand
+from src.data_model.distance import DistanceMatrix
+from src.data_model.factory import Factory
+from src.data_model.truck import Truck
+from src.business_model.mip.capacited_vrp_model import capacited_vrp_model
+from src.business_model.mip.capacited_vrp_model.capacited_vrp_model import (
+    solve_cvrp_gg,
+    solve_cvrp_tw,
+)
+import config
+
+distance = np.array([
+    [0, 10, 15, 20],
+    [10, 0, 35, 25],
+    [15, 35, 0, 30],
+    [20, 25, 30, 0],
+], dtype=float)
+
+
+@pytest.fixture
+def demands():
+    return [
+        Demand(
+            demand_id=str(f),
+            weight=w,
+            size_area=1,
+            destination=Factory(id=f, name=f"City_{f}"),
+            available_time="2024-01-01T08:00:00",
+            due_time="2024-01-05T17:00:00",
+        )
+        for f, w in [(1, 5), (2, 3), (3, 4)]
+    ]
+
+
+@pytest.fixture
+def trucks():
+    return [
+        Truck(id=1, capacity=10, inner_size=15, speed=40, cost=2, type=50),
+        Truck(id=2, capacity=8, inner_size=15, speed=40, cost=2, type=50),
+    ]
+
+
+def test_tw_takes_positional_dict_distances(demands, trucks):
+    positional = {i: {j: distance[i, j] for j in range(4) if i != j} for i in range(4)}
+    by_id = DistanceMatrix([config.DEPOT_ID, 1, 2, 3], distance)
+
+    from_dict = solve_cvrp_tw(CVRPInput(demands=demands, trucks=trucks, distance_matrix=positional))
+    from_matrix = solve_cvrp_tw(CVRPInput(demands=demands, trucks=trucks, distance_matrix=by_id))
+
+    assert from_dict.is_success
+    # 2 * (10 + 10) + 2 * (15 + 30 + 20) plus one service cost per stop
+    assert from_dict.total_cost == pytest.approx(170 + 3 * config.SERVICE_COST_PER_STOP)
+    assert from_matrix.total_cost == pytest.approx(from_dict.total_cost)
+
+
+class TimedFactory(Factory):
+    """A destination with the clock window solve_cvrp_tw reads."""
+
+    available_clock: float = 0.0
+    due_clock: float = float("inf")
+
+
+def all_arcs(distance, demand, capacity, **_):
+    N = len(demand)
+    return [[(i, j) for i in range(N) for j in range(N) if i != j] for _ in capacity]
+
+
+@pytest.fixture
+def day():
+    rng = np.random.default_rng(3)
+    ids = [config.DEPOT_ID] + list(range(1, 6))
+    points = rng.uniform(0, 100, (len(ids), 2))
+    # customers 1 and 2 close early, 3 opens late
+    windows = {1: (0, 150), 2: (0, 100), 3: (200, 600)}
+    demands = [
+        Demand(
+            demand_id=str(f),
+            weight=w,
+            size_area=1,
+            destination=TimedFactory(
+                id=f,
+                name=f"City_{f}",
+                available_clock=windows.get(f, (0, 0))[0],
+                due_clock=windows.get(f, (0, float("inf")))[1],
+            ),
+            available_time="2024-01-01T08:00:00",
+            due_time="2024-01-05T17:00:00",
+        )
+        for f, w in zip(ids[1:], [6, 5, 4, 3, 2])
+    ]
+    trucks = [
+        Truck(id=1, capacity=8, inner_size=15, speed=40, cost=2, type=50),
+        Truck(id=2, capacity=12, inner_size=15, speed=40, cost=1, type=60),
+    ]
+    distances = DistanceMatrix(ids, np.linalg.norm(points[:, None] - points[None], axis=2))
+    return CVRPInput(demands=demands, trucks=trucks, distance_matrix=distances)
+
+
+@pytest.mark.parametrize("solve", [solve_cvrp_gg, solve_cvrp_tw])
+def test_pruned_arcs_keep_the_optimum(solve, day, monkeypatch):
+    pruned = solve(day)
+    kept = sum(
+        len(arcs) for arcs in capacited_vrp_model.sparse_arcs(
+            np.zeros((6, 6)), [0] + [d.weight for d in day.demands], [8, 12]
+        )
+    )
+    monkeypatch.setattr(capacited_vrp_model, "sparse_arcs", all_arcs)
+    full = solve(day)
+
+    # the capacity filter alone drops arcs of this day
+    assert kept < 2 * 6 * 5
+    assert pruned.is_success and full.is_success
+    assert pruned.total_cost == pytest.approx(full.total_cost)
+
+
+@pytest.mark.parametrize("solve", [solve_cvrp_gg, solve_cvrp_tw])
+def test_aggregated_trucks_keep_the_optimum(solve, day):
+    # two interchangeable small trucks around a big one
+    day.trucks = [
+        Truck(id=1, capacity=8, inner_size=15, speed=40, cost=2, type=50),
+        Truck(id=2, capacity=12, inner_size=15, speed=40, cost=1, type=60),
+        Truck(id=3, capacity=8, inner_size=15, speed=40, cost=2, type=50),
+    ]
+    weight = {d.destination.id: d.weight for d in day.demands}
+
+    per_truck = solve(day, aggregate_trucks=False)
+    aggregated = solve(day, aggregate_trucks=True)
+
+    assert per_truck.is_success and aggregated.is_success
+    assert aggregated.total_cost == pytest.approx(per_truck.total_cost)
+    fleet = {t.id: t for t in day.trucks}
+    truck_ids = [r.truck.id for r in aggregated.routes]
+    assert len(set(truck_ids)) == len(truck_ids)
+    for r in aggregated.routes:
+        assert r.truck == fleet[r.truck.id]
+        load = sum(weight.get(f.id, 0.0) for f in r.route)
+        assert 0 < load <= r.truck.capacity
+    served = [f.id for r in aggregated.routes for f in r.route if f.id in weight]
+    assert sorted(served) == sorted(weight)
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from src.data_model.cvrp_input import CVRPInput
+from src.data_model.demand import Demand
+from src.data_model.distance import DistanceMatrix
+from src.data_model.factory import Factory
+from src.data_model.truck import Truck
+from src.business_model.column_generation.column_generation import solve_cvrp_column_generation
+from src.business_model.heuristic.alns import solve_cvrp_alns
+import config
+
+# customers 1-3 are due half an hour after they open
+early = {1, 2, 3}
+
+
+@pytest.fixture
+def input_data():
+    rng = np.random.default_rng(5)
+    ids = [config.DEPOT_ID] + list(range(1, 11))
+    points = rng.uniform(0, 100, (len(ids), 2))
+    distances = DistanceMatrix(ids, np.linalg.norm(points[:, None] - points[None], axis=2))
+    demands = [
+        Demand(
+            demand_id=str(f),
+            weight=float(w),
+            size_area=1,
+            destination=Factory(id=f, name=f"City_{f}"),
+            available_time="2025-10-10T08:00:00",
+            due_time="2025-10-10T08:30:00" if f in early else "2025-10-10T20:00:00",
+        )
+        for f, w in zip(ids[1:], rng.integers(1, 8, len(ids) - 1))
+    ]
+    trucks = [
+        Truck(id=t, capacity=c, inner_size=5, speed=40, cost=k, type=50)
+        for t, (c, k) in enumerate([(20, 1), (20, 1), (15, 1), (15, 2)])
+    ]
+    return CVRPInput(demands=demands, trucks=trucks, distance_matrix=distances)
+
+
+def served(output):
+    return sorted(f.id for r in output.routes for f in r.route[1:-1])
+
+
+def test_column_generation_bounds_and_beats_the_heuristics(input_data):
+    output = solve_cvrp_column_generation(input_data)
+
+    assert output.is_success
+    assert served(output) == list(range(1, 11))
+    assert output.best_bound <= output.total_cost + 1e-6
+    assert output.mip_gap == pytest.approx(
+        (output.total_cost - output.best_bound) / output.total_cost
+    )
+    alns = solve_cvrp_alns(input_data, time_limit=60, seed=0, max_iterations=200)
+    assert output.total_cost <= alns.total_cost + 1e-6
+
+
+def test_time_windows_put_early_customers_first(input_data):
+    without = solve_cvrp_column_generation(input_data)
+    output = solve_cvrp_column_generation(input_data, time_windows=True)
+
+    assert output.is_success
+    assert served(output) == list(range(1, 11))
+    # a second stop is reached an hour of service after 08:00 at the earliest
+    for r in output.routes:
+        assert all(f.id not in early for f in r.route[2:-1])
+    assert output.total_cost >= without.total_cost - 1e-6
+
+
+def test_no_pricing_rounds_solve_the_start_columns(input_data):
+    output = solve_cvrp_column_generation(input_data, max_iterations=0)
+
+    assert output.is_success
+    assert served(output) == list(range(1, 11))
+    assert output.best_bound is None
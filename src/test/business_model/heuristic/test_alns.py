@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from src.data_model.cvrp_input import CVRPInput
+from src.data_model.demand import Demand
+from src.data_model.distance import DistanceMatrix
+from src.data_model.factory import Factory
+from src.data_model.truck import Truck
+from src.business_model.heuristic.alns import solve_cvrp_alns
+import config
+
+
+@pytest.fixture
+def input_data():
+    rng = np.random.default_rng(3)
+    ids = [config.DEPOT_ID] + list(range(1, 16))
+    points = rng.uniform(0, 100, (len(ids), 2))
+    distances = DistanceMatrix(ids, np.linalg.norm(points[:, None] - points[None], axis=2))
+    demands = [
+        Demand(
+            demand_id=str(f),
+            weight=float(w),
+            size_area=1,
+            destination=Factory(id=f, name=f"City_{f}"),
+            available_time="2025-10-10T08:00:00",
+            due_time="2025-10-10T20:00:00",
+        )
+        for f, w in zip(ids[1:], rng.integers(1, 8, len(ids) - 1))
+    ]
+    trucks = [
+        Truck(id=t, capacity=c, inner_size=5, speed=40, cost=k, type=50)
+        for t, (c, k) in enumerate([(20, 1), (20, 1), (15, 1), (15, 2), (10, 2)])
+    ]
+    return CVRPInput(demands=demands, trucks=trucks, distance_matrix=distances)
+
+
+def test_alns_routes_every_customer_within_the_limits(input_data):
+    output = solve_cvrp_alns(input_data, time_limit=60, seed=1, max_iterations=300)
+
+    assert output.is_success
+    served = sorted(f.id for r in output.routes for f in r.route[1:-1])
+    assert served == list(range(1, 16))
+    weight = {d.destination.id: d.weight for d in input_data.demands}
+    for r in output.routes:
+        assert len(r.route) - 2 <= config.MAX_STOPS
+        assert sum(weight[f.id] for f in r.route[1:-1]) <= r.truck.capacity
+
+    trace = output.convergence_trace
+    assert trace[0].iteration == 0 and trace[-1].iteration == 300
+    best = [point.best_cost for point in trace]
+    assert best == sorted(best, reverse=True)
+    assert output.total_cost <= best[-1] + 1e-6
+
+
+def test_alns_is_reproducible_for_a_seed(input_data):
+    first = solve_cvrp_alns(input_data, time_limit=60, seed=7, max_iterations=100)
+    second = solve_cvrp_alns(input_data, time_limit=60, seed=7, max_iterations=100)
+
+    assert first.total_cost == second.total_cost
+    assert [[f.id for f in r.route] for r in first.routes] == [
+        [f.id for f in r.route] for r in second.routes
+    ]
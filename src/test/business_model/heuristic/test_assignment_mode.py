@@ -0,0 +1,66 @@
+import pytest
+
+from src.data_model.assignment_Input import AssignmentInput
+from src.data_model.demand import Demand
+from src.data_model.demand_table import DemandTable
+from src.data_model.truck import Truck
+from src.data_model.factory import Factory
+from src.business_model.heuristic.assignemnt_mode import (
+    assignment_orders_to_trucks_days,
+    day_waves,
+)
+from datetime import date, datetime, timedelta
+
+start = date(2025, 10, 10)
+planning_horizon = [start + timedelta(days=i) for i in range(4)]
+
+
+def at(day: int, hour: int) -> datetime:
+    return datetime.combine(planning_horizon[day], datetime.min.time()) + timedelta(hours=hour)
+
+
+@pytest.fixture
+def input_data():
+    a = Factory(id=1, name="A")
+    b = Factory(id=2, name="B")
+    # demands 1-4 can only start on their own day, 5 and 6 on days 2 or 3
+    demands = [
+        Demand(demand_id="1", weight=6, size_area=4, destination=a, available_time=at(0, 8), due_time=at(0, 20), travel_days=1),
+        Demand(demand_id="2", weight=5, size_area=3, destination=b, available_time=at(0, 8), due_time=at(0, 20), travel_days=1),
+        Demand(demand_id="3", weight=3, size_area=2, destination=a, available_time=at(1, 8), due_time=at(1, 20), travel_days=1),
+        Demand(demand_id="4", weight=4, size_area=3, destination=b, available_time=at(1, 8), due_time=at(1, 20), travel_days=1),
+        Demand(demand_id="5", weight=7, size_area=5, destination=a, available_time=at(2, 8), due_time=at(3, 20), travel_days=1),
+        Demand(demand_id="6", weight=2, size_area=1, destination=b, available_time=at(2, 8), due_time=at(3, 20), travel_days=1),
+    ]
+    trucks = [
+        Truck(id=1, capacity=10, inner_size=8, speed=40, cost=2, type=50),
+        Truck(id=2, capacity=8, inner_size=6, speed=40, cost=1, type=40),
+    ]
+    return AssignmentInput(
+        demands=demands,
+        trucks=trucks,
+        planning_horizon=planning_horizon,
+        w_balance=1,
+        w_slack=10,
+    )
+
+
+def test_day_waves_group_days_without_shared_demands(input_data):
+    table = DemandTable.from_demands(input_data.demands, planning_horizon)
+
+    assert day_waves(table) == [[0, 1, 2], [3]]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_day_heuristic_assigns_each_demand_once(workers, input_data):
+    output = assignment_orders_to_trucks_days(input_data, workers=workers)
+
+    ids = [oa.demand.demand_id for oa in output.assignments]
+    assert sorted(ids) == ["1", "2", "3", "4", "5", "6"]
+    loads = {}
+    for oa in output.assignments:
+        assert oa.assigned_date in oa.demand.feasible_dates(planning_horizon)
+        key = (oa.truck.id, oa.assigned_date)
+        loads[key] = loads.get(key, 0) + oa.demand.weight
+    capacity = {t.id: t.capacity for t in input_data.trucks}
+    assert all(load <= capacity[k] for (k, _), load in loads.items())
@@ -0,0 +1,72 @@
+import pytest
+
+from src.data_model.cvrp_input import CVRPInput
+from src.data_model.demand import Demand
+from src.data_model.distance import DistanceMatrix
+from src.data_model.factory import Factory
+from src.data_model.route_table import RouteTable
+from src.data_model.truck import Truck
+from src.business_model.heuristic.local_search import improve_cvrp_output
+from src.serializer.serialize_cvrp_output import create_cvrp_output_from_routes
+import config
+
+# the depot at 0 on a line, customers 1 and 2 east of it, 3 and 4 west
+position = {config.DEPOT_ID: 0, 1: 10, 2: 12, 3: -10, 4: -11}
+weight = {1: 4, 2: 5, 3: 3, 4: 6}
+
+
+def cvrp_input(capacity: float, n_trucks: int = 2) -> CVRPInput:
+    ids = list(position)
+    distances = DistanceMatrix(
+        ids, [[abs(position[i] - position[j]) for j in ids] for i in ids]
+    )
+    demands = [
+        Demand(
+            demand_id=str(f),
+            weight=w,
+            size_area=1,
+            destination=Factory(id=f, name=f"City_{f}"),
+            available_time="2025-10-10T08:00:00",
+            due_time="2025-10-10T20:00:00",
+        )
+        for f, w in weight.items()
+    ]
+    trucks = [
+        Truck(id=t, capacity=capacity, inner_size=10, speed=40, cost=1, type=50)
+        for t in range(1, n_trucks + 1)
+    ]
+    return CVRPInput(demands=demands, trucks=trucks, distance_matrix=distances)
+
+
+def zigzag(input_data: CVRPInput):
+    # both trucks cross the depot: 1 -> 3 and 2 -> 4, positions being 1-4
+    table = RouteTable.from_cvrp_input(input_data)
+    return create_cvrp_output_from_routes(table, [(0, [1, 3]), (1, [2, 4])], best_bound=1.0, mip_gap=0.5)
+
+
+def test_local_search_untangles_crossing_routes():
+    input_data = cvrp_input(capacity=10)
+    before = zigzag(input_data)
+
+    after = improve_cvrp_output(input_data, before)
+
+    assert sorted(sorted(f.id for f in r.route[1:-1]) for r in after.routes) == [[1, 2], [3, 4]]
+    assert after.travel_cost == pytest.approx(46)
+    assert after.total_cost < before.total_cost
+    assert after.best_bound == 1.0 and after.mip_gap is None
+
+
+def test_local_search_keeps_capacity():
+    # 1 and 2, as 3 and 4, weigh 9 together
+    input_data = cvrp_input(capacity=8, n_trucks=3)
+    table = RouteTable.from_cvrp_input(input_data)
+    before = create_cvrp_output_from_routes(table, [(0, [1, 3]), (1, [2]), (2, [4])])
+
+    after = improve_cvrp_output(input_data, before)
+
+    for r in after.routes:
+        assert sum(weight[f.id] for f in r.route[1:-1]) <= 8
+    assert sorted(f.id for r in after.routes for f in r.route[1:-1]) == [1, 2, 3, 4]
+    assert after.total_cost == pytest.approx(
+        sum(r.total_travel_cost + r.total_handling_cost for r in after.routes)
+    )
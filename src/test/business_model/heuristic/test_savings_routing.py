@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from src.data_model.cvrp_input import CVRPInput
+from src.data_model.demand import Demand
+from src.data_model.distance import DistanceMatrix
+from src.data_model.factory import Factory
+from src.data_model.truck import Truck
+from src.business_model.heuristic.savings_routing import solve_cvrp_savings
+from src.business_model.mip.capacited_vrp_model.capacited_vrp_model import solve_cvrp_gg
+import config
+
+# the depot at 0 on a line, customers 1 and 2 east of it, 3 and 4 west
+position = {config.DEPOT_ID: 0, 1: 10, 2: 12, 3: -10, 4: -11}
+weight = {1: 4, 2: 5, 3: 3, 4: 6}
+
+
+def cvrp_input(capacity: float) -> CVRPInput:
+    ids = list(position)
+    distances = DistanceMatrix(
+        ids, [[abs(position[i] - position[j]) for j in ids] for i in ids]
+    )
+    demands = [
+        Demand(
+            demand_id=str(f),
+            weight=w,
+            size_area=1,
+            destination=Factory(id=f, name=f"City_{f}"),
+            available_time="2025-10-10T08:00:00",
+            due_time="2025-10-10T20:00:00",
+        )
+        for f, w in weight.items()
+    ]
+    trucks = [
+        Truck(id=t, capacity=capacity, inner_size=10, speed=40, cost=1, type=50)
+        for t in (1, 2)
+    ]
+    return CVRPInput(demands=demands, trucks=trucks, distance_matrix=distances)
+
+
+def test_savings_join_the_customers_on_each_side():
+    output = solve_cvrp_savings(cvrp_input(capacity=10))
+
+    assert output.is_success
+    assert sorted([f.id for f in r.route] for r in output.routes) == [
+        [config.DEPOT_ID, 1, 2, config.DEPOT_ID],
+        [config.DEPOT_ID, 3, 4, config.DEPOT_ID],
+    ]
+    # 24 + 22 km at cost 1, and 4 stops
+    assert output.total_cost == pytest.approx(50)
+
+
+def test_savings_leave_out_what_the_fleet_cannot_carry():
+    output = solve_cvrp_savings(cvrp_input(capacity=8))
+
+    assert not output.is_success
+    served = [f.id for r in output.routes for f in r.route[1:-1]]
+    assert sorted(served) == [1, 3, 4]
+    assert all(np.sum([weight[f.id] for f in r.route[1:-1]]) <= 8 for r in output.routes)
+
+
+@pytest.mark.parametrize("aggregate_trucks", [False, True])
+def test_savings_start_keeps_the_optimum(aggregate_trucks):
+    # the two trucks are identical, so aggregate_trucks makes them one type
+    input_data = cvrp_input(capacity=10)
+    warm = solve_cvrp_gg(input_data, aggregate_trucks=aggregate_trucks, warm_start=True)
+    cold = solve_cvrp_gg(input_data)
+
+    assert warm.is_success
+    assert warm.total_cost == pytest.approx(cold.total_cost)
+    assert len({r.truck.id for r in warm.routes}) == len(warm.routes)
@@ -0,0 +1,25 @@
+import gurobipy as gp
+from gurobipy import GRB
+
+from src.business_model.solution_values import nonzero_values, successor_map
+
+
+def test_nonzero_values_keeps_chosen_keys_in_key_order():
+    m = gp.Model("pick")
+    m.Params.OutputFlag = 0
+    x = m.addVars(4, 3, vtype=GRB.BINARY)
+    for i in range(4):
+        m.addConstr(x.sum(i, "*") == 1)
+    m.setObjective(gp.quicksum(((i + j) % 3) * x[i, j] for i in range(4) for j in range(3)))
+    m.optimize()
+
+    assert nonzero_values(m, x) == {(0, 0): 1.0, (1, 2): 1.0, (2, 1): 1.0, (3, 0): 1.0}
+
+
+def test_successor_map_groups_heads_by_vehicle_and_tail():
+    arcs = [(0, 3, 0), (0, 1, 1), (3, 0, 0), (0, 2, 1), (1, 0, 1), (2, 0, 1)]
+
+    assert successor_map(arcs) == {
+        0: {0: [3], 3: [0]},
+        1: {0: [1, 2], 1: [0], 2: [0]},
+    }
@@ -0,0 +1,44 @@
+import gurobipy as gp
+from gurobipy import GRB
+
+from src.business_model.solve_control import SolveControl
+
+
+def knapsack(n: int = 30) -> gp.Model:
+    m = gp.Model("knapsack")
+    m.Params.OutputFlag = 0
+    x = m.addVars(n, vtype=GRB.BINARY)
+    m.addConstr(gp.quicksum((7 + (i * 13) % 11) * x[i] for i in range(n)) <= 5 * n)
+    m.setObjective(gp.quicksum((5 + (i * 7) % 9) * x[i] for i in range(n)), GRB.MAXIMIZE)
+    return m
+
+
+def test_solve_returns_incumbent_bound_and_gap():
+    result = SolveControl(time_limit=10).optimize(knapsack())
+
+    assert result.is_optimal
+    assert result.has_solution
+    assert result.best_bound >= result.objective_value - 1e-6
+    assert result.mip_gap <= 1e-4
+
+
+def test_solve_without_solution_has_no_incumbent():
+    m = gp.Model("infeasible")
+    m.Params.OutputFlag = 0
+    x = m.addVar(vtype=GRB.BINARY)
+    m.addConstr(x >= 2)
+
+    result = SolveControl().optimize(m)
+
+    assert not result.has_solution
+    assert result.objective_value is None and result.mip_gap is None
+
+
+def test_gap_target_and_stall_rule_still_return_the_incumbent():
+    m = knapsack(200)
+    m.Params.Heuristics = 0
+
+    result = SolveControl(mip_gap=0.5, stall_time=0.0).optimize(m)
+
+    assert result.has_solution
+    assert result.mip_gap <= 0.5
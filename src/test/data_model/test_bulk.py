@@ -0,0 +1,61 @@
+import pytest
+from datetime import datetime
+from src.data_model.demand import Demand
+from src.data_model.factory import Factory
+from src.data_model.truck import Truck
+from src.data_model.bulk import build_models
+
+
+def test_build_models_matches_validated_models():
+    factory = Factory(id=2, name="City_2")
+    demands = build_models(
+        Demand,
+        demand_id=["a", "b"],
+        weight=[1.0, 2.0],
+        size_area=[0.5, 0.25],
+        destination=[factory, factory],
+        available_time=[datetime(2022, 5, 1), datetime(2022, 5, 2)],
+        due_time=[datetime(2022, 5, 10), datetime(2022, 5, 12)],
+    )
+
+    expected = Demand(
+        demand_id="b",
+        weight=2.0,
+        size_area=0.25,
+        destination=factory,
+        available_time=datetime(2022, 5, 2),
+        due_time=datetime(2022, 5, 12),
+    )
+    assert demands[1] == expected
+    assert demands[1].model_dump() == expected.model_dump()
+    assert demands[0].travel_days == 0
+    assert demands[0].model_fields_set == {
+        "demand_id", "weight", "size_area", "destination", "available_time", "due_time"
+    }
+
+
+def test_build_models_rejects_unknown_and_missing_fields():
+    with pytest.raises(ValueError):
+        build_models(Truck, id=[1], type=[1.0], capacity=[1.0], cost=[1.0], speed=[1.0], colour=["red"])
+    with pytest.raises(ValueError):
+        build_models(Truck, id=[1], type=[1.0])
+
+
+def test_build_models_validates_and_keeps_shared_instances():
+    factory = Factory(id=2, name="City_2")
+    trucks = build_models(Truck, id=["1"], type=[1.0], capacity=["2.5"], cost=[1.0], speed=[1.0])
+    assert trucks[0].id == 1 and trucks[0].capacity == 2.5
+
+    with pytest.raises(ValueError):
+        build_models(Truck, id=[1], type=[1.0], capacity=["heavy"], cost=[1.0], speed=[1.0])
+
+    demands = build_models(
+        Demand,
+        demand_id=["a"],
+        weight=[1.0],
+        size_area=[0.5],
+        destination=[factory],
+        available_time=[datetime(2022, 5, 1)],
+        due_time=[datetime(2022, 5, 10)],
+    )
+    assert demands[0].destination is factory
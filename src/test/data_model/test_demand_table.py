@@ -0,0 +1,122 @@
+import pandas as pd
+import pytest
+from datetime import date, datetime, timedelta
+from src.data_model.demand import Demand
+from src.data_model.demand_table import DemandTable
+from src.data_model.factory import Factory
+from src.serializer.serialize_order import (
+    create_demand_table_from_normalized_data_frame,
+    get_demands_from_order_data_frame,
+    get_factory_list_from_order_data_frame,
+    normalize_order_data_frame,
+)
+
+start = date(2022, 5, 1)
+planning_horizon = [start + timedelta(days=i) for i in range(6)]
+
+
+@pytest.fixture
+def demands():
+    a = Factory(id=1, name="City_1")
+    b = Factory(id=2, name="City_2")
+    return [
+        Demand(demand_id="D1", weight=5, size_area=2, destination=a, available_time=datetime(2022, 5, 2, 8), due_time=datetime(2022, 5, 4, 20), travel_days=2),
+        Demand(demand_id="D2", weight=3, size_area=1, destination=b, available_time=datetime(2022, 4, 20, 8), due_time=datetime(2022, 5, 1, 20), travel_days=1),
+        Demand(demand_id="D3", weight=4, size_area=3, destination=a, available_time=datetime(2022, 5, 5, 8), due_time=datetime(2022, 5, 5, 20), travel_days=3),
+        Demand(demand_id="D4", weight=1, size_area=1, destination=b, available_time=datetime(2022, 5, 4, 8), due_time=datetime(2022, 6, 1, 20), travel_days=0),
+    ]
+
+
+def test_demand_table_columns(demands):
+    table = DemandTable.from_demands(demands, planning_horizon)
+
+    assert len(table) == 4
+    assert table.weight.tolist() == [5, 3, 4, 1]
+    assert table.area.tolist() == [2, 1, 3, 1]
+    assert table.destination.tolist() == [0, 1, 0, 1]
+    assert table.destination_ids.tolist() == [1, 2]
+    assert table.travel_days.tolist() == [2, 1, 3, 0]
+    assert table.is_feasible.tolist() == [True, True, False, True]
+    assert table.to_demands() == demands
+
+
+def test_demand_table_windows_match_feasible_dates(demands):
+    table = DemandTable.from_demands(demands, planning_horizon)
+
+    for i, d in enumerate(demands):
+        expected = d.feasible_dates(planning_horizon)
+        assert [planning_horizon[s] for s in table.feasible_starts(i)] == expected
+
+
+def test_demand_table_day_buckets_match_scan(demands):
+    table = DemandTable.from_demands(demands, planning_horizon)
+
+    for day in range(len(planning_horizon)):
+        starting = [i for i in range(len(demands)) if day in table.feasible_starts(i)]
+        active = [
+            i
+            for i in range(len(demands))
+            if any(s <= day < s + table.travel_days[i] for s in table.feasible_starts(i))
+        ]
+        assert table.rows_starting_on(day) == starting
+        assert table.rows_active_on(day) == active
+        assert table.pairs_active_on(day) == [
+            (i, s)
+            for i in range(len(demands))
+            for s in table.feasible_starts(i)
+            if s <= day < s + table.travel_days[i]
+        ]
+
+
+def test_demand_table_aggregate_groups_identical_demands(demands):
+    items = demands + [
+        demands[0].model_copy(update={"demand_id": "D1b"}),
+        demands[1].model_copy(update={"demand_id": "D2b"}),
+        demands[0].model_copy(update={"demand_id": "D1c"}),
+    ]
+    table = DemandTable.from_demands(items, planning_horizon)
+    classes = table.aggregate()
+
+    assert classes.is_aggregated and not table.is_aggregated
+    assert classes.members == [[0, 4, 6], [1, 5], [2], [3]]
+    assert classes.count.tolist() == [3, 2, 1, 1]
+    assert classes.weight.tolist() == [5, 3, 4, 1]
+    assert classes.total_weight == table.total_weight
+    assert classes.items_per_destination().tolist() == table.items_per_destination().tolist()
+    assert classes.available_idx.tolist() == table.available_idx[[0, 1, 2, 3]].tolist()
+
+
+def test_demand_table_rejects_unsorted_horizon(demands):
+    with pytest.raises(ValueError):
+        DemandTable.from_demands(demands, list(reversed(planning_horizon)))
+
+
+def test_demand_table_from_order_frame():
+    order_df = pd.DataFrame(
+        {
+            "Order_ID": ["A1", "A2"],
+            "Material_ID": ["B-1", "B-2"],
+            "Item_ID": ["P-1", "P-2"],
+            "Source": ["City_61", "City_61"],
+            "Destination": ["City_2", "City_3"],
+            "Available_Time": ["1/5/2022 10.00", "2/5/2022 10.00"],
+            "Deadline": ["4/5/2022 10.00", "5/5/2022 10.00"],
+            "Danger_Type": ["type_1", "type_2"],
+            "Area": [10000.0, 20000.0],
+            "Weight": [1000000.0, 2000000.0],
+        }
+    )
+    distances = {61: {2: 100.0, 3: 1000.0}}
+    factories = get_factory_list_from_order_data_frame(order_df)
+
+    table = create_demand_table_from_normalized_data_frame(
+        normalize_order_data_frame(order_df), factories, distances, planning_horizon
+    )
+
+    assert table.weight.tolist() == [1.0, 2.0]
+    assert table.travel_days.tolist() == [1, 2]
+    assert table.available_idx.tolist() == [0, 1]
+    assert table.last_start_idx.tolist() == [3, 3]
+    assert [d.model_dump() for d in table.to_demands()] == [
+        d.model_dump() for d in get_demands_from_order_data_frame(order_df, distances)
+    ]
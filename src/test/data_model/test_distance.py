@@ -1,6 +1,7 @@
 import pytest
 from src.data_model.factory import Factory
-from src.data_model.distance import Distance
+import numpy as np
+from src.data_model.distance import Distance, DistanceMatrix, build_distance_matrix
 
 
 def test_distance_initialization():
@@ -22,3 +23,39 @@ def test_distance_in_km():
     assert Distance.distance_in_km(0.0) == 0.0
     assert Distance.distance_in_km(10000.0) == 10.0
 
+
+def test_build_distance_matrix():
+    a = Factory(id=1, name="Factory A")
+    b = Factory(id=5, name="Factory B")
+    matrix = build_distance_matrix(
+        [Distance(source=a, destination=b, distance_m=1500.0)], [a, b]
+    )
+
+    assert isinstance(matrix, DistanceMatrix)
+    assert matrix[1][5] == 1.5
+    assert matrix[1][1] == 0.0
+    assert np.isinf(matrix.row(5)[0])
+    with pytest.raises(KeyError):
+        matrix[5][1]
+    assert 1 not in matrix[5]
+    assert dict(matrix[5]) == {5: 0.0}
+
+
+def test_distance_matrix_slicing_and_dict_view():
+    matrix = DistanceMatrix.from_dict({61: {2: 10.0, 7: 20.0}, 2: {7: 5.0, 61: 10.0}, 7: {61: 20.0}})
+
+    assert list(matrix.ids) == [2, 7, 61]
+    np.testing.assert_array_equal(matrix.row(61), [10.0, 20.0, 0.0])
+    np.testing.assert_array_equal(matrix.column(7), [5.0, 0.0, 20.0])
+    np.testing.assert_array_equal(matrix.submatrix([61, 2]), [[0.0, 10.0], [10.0, 0.0]])
+    assert matrix.max_distance() == 20.0
+    assert 61 in matrix and 3 not in matrix
+    assert matrix.to_dict()[2] == {2: 0.0, 7: 5.0, 61: 10.0}
+
+
+def test_distance_matrix_float32():
+    matrix = DistanceMatrix([1, 2], [[0, 1.5], [2.5, 0]], dtype=np.float32)
+
+    assert matrix.values.dtype == np.float32
+    assert matrix.values.flags["C_CONTIGUOUS"]
+    assert matrix[2][1] == 2.5
@@ -0,0 +1,31 @@
+from src.data_model.truck import Truck
+from src.data_model.truck_type import group_truck_types
+
+
+def make_truck(id: int, capacity: float, inner_size: float | None = 10.0) -> Truck:
+    return Truck(id=id, type=12.5, inner_size=inner_size, capacity=capacity, cost=2.0, speed=40.0)
+
+
+def test_group_truck_types_groups_identical_trucks_in_fleet_order():
+    trucks = [make_truck(4, 5000), make_truck(2, 2000), make_truck(7, 5000)]
+
+    types = group_truck_types(trucks)
+
+    assert [t.id for t in types] == [4, 2]
+    assert [[truck.id for truck in t.trucks] for t in types] == [[4, 7], [2]]
+    assert [t.count for t in types] == [2, 1]
+    assert types[0].capacity == 5000
+
+
+def test_group_truck_types_treats_missing_inner_sizes_as_equal():
+    trucks = [make_truck(1, 5000, float("nan")), make_truck(2, 5000, float("nan"))]
+
+    assert [t.count for t in group_truck_types(trucks)] == [2]
+
+
+def test_group_truck_types_without_aggregation_keeps_every_truck():
+    trucks = [make_truck(4, 5000), make_truck(7, 5000)]
+
+    types = group_truck_types(trucks, aggregate=False)
+
+    assert [(t.id, t.count) for t in types] == [(4, 1), (7, 1)]
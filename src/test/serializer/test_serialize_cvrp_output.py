@@ -0,0 +1,58 @@
+import pytest
+
+from src.data_model.cvrp_input import CVRPInput
+from src.data_model.demand import Demand
+from src.data_model.distance import DistanceMatrix
+from src.data_model.factory import Factory
+from src.data_model.route_table import RouteTable
+from src.data_model.truck import Truck
+from src.serializer.serialize_cvrp_output import (
+    create_cvrp_output_from_routes,
+    routes_from_cvrp_output,
+)
+import config
+
+
+@pytest.fixture
+def table():
+    ids = [config.DEPOT_ID, 1, 2]
+    distances = DistanceMatrix(ids, [[0, 10, 20], [10, 0, 15], [20, 15, 0]])
+    demands = [
+        Demand(
+            demand_id=str(f),
+            weight=w,
+            size_area=1,
+            destination=Factory(id=f, name=f"City_{f}"),
+            available_time="2025-10-10T08:00:00",
+            due_time="2025-10-10T20:00:00",
+        )
+        for f, w in [(2, 3), (1, 5)]
+    ]
+    trucks = [
+        Truck(id=7, capacity=10, inner_size=10, speed=30, cost=2, type=50),
+        Truck(id=8, capacity=10, inner_size=10, speed=30, cost=1, type=50),
+    ]
+    return RouteTable.from_cvrp_input(
+        CVRPInput(demands=demands, trucks=trucks, distance_matrix=distances)
+    )
+
+
+def test_route_costs_and_loads(table):
+    # truck 8 goes depot -> 1 -> 2 -> depot, i.e. positions 2 then 1
+    output = create_cvrp_output_from_routes(table, [(0, []), (1, [2, 1])])
+
+    (route,) = output.routes
+    assert route.truck.id == 8
+    assert [f.id for f in route.route] == [config.DEPOT_ID, 1, 2, config.DEPOT_ID]
+    assert route.unload_at_node == [0.0, 8.0, 3.0, 0.0]
+    assert route.travel_distance == 45
+    assert route.travel_time == pytest.approx(1.5)
+    assert route.total_stops == 2
+    assert output.travel_cost == 45
+    assert output.total_cost == 45 + 2 * config.SERVICE_COST_PER_STOP
+
+
+def test_routes_round_trip(table):
+    routes = [(0, [1]), (1, [2])]
+
+    assert routes_from_cvrp_output(table, create_cvrp_output_from_routes(table, routes)) == routes
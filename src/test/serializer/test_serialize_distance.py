@@ -2,7 +2,7 @@ import pandas as pd
 import pytest
 from src.data_model.factory import Factory
 from src.data_model.distance import Distance
-from src.serializer.serialize_distance import serialize_distance_from_data_frame
+from src.serializer.serialize_distance import serialize_distance_from_data_frame, serialize_distance_matrix_from_data_frame
 
 
 @pytest.fixture
@@ -41,3 +41,25 @@ def test_serialize_distance_from_data_frame(distance_df, factories):
         factories.get(distances[k].destination.name) is not None
         for k in distances.keys()
     )
+
+
+def test_serialize_distance_matrix_from_data_frame(distance_df):
+    factories = {
+        1: Factory(id=1, name="Factory_1"),
+        2: Factory(id=2, name="Factory_2"),
+        3: Factory(id=3, name="Factory_3"),
+    }
+    distance_df.loc[len(distance_df)] = ["Factory_9", "Factory_1", 700]
+    distance_df.loc[len(distance_df)] = ["Factory_2", None, 700]
+
+    matrix = serialize_distance_matrix_from_data_frame(distance_df, factories)
+
+    assert list(matrix.ids) == [1, 2, 3]
+    assert matrix[1][2] == 1.0
+    assert matrix[3][1] == 3.0
+    assert matrix[2][2] == 0.0
+    assert matrix.to_dict() == {
+        1: {1: 0.0, 2: 1.0, 3: 2.0},
+        2: {2: 0.0, 3: 1.5},
+        3: {1: 3.0, 2: 0.5, 3: 0.0},
+    }
@@ -0,0 +1,79 @@
+import os
+import pandas as pd
+import pytest
+import config
+from src.serializer.serialize_input_cache import input_cache_key
+from src.serializer.serialize_problem_data import load_problem_data
+
+
+@pytest.fixture
+def source_files(tmp_path):
+    orders = pd.DataFrame(
+        {
+            "Order_ID": ["A1", "A2"],
+            "Material_ID": ["B-101", "B-102"],
+            "Item_ID": ["P-500", "P-501"],
+            "Source": ["City_61", "City_61"],
+            "Destination": ["City_2", "City_3"],
+            "Available_Time": ["4/5/2022 23.59", "5/5/2022 10.00"],
+            "Deadline": ["4/11/2022 23.59", "9/5/2022 10.00"],
+            "Danger_Type": ["type_1", "non_danger"],
+            "Area": [15.5, 20.0],
+            "Weight": [120.0, 80.0],
+        }
+    )
+    trucks = pd.DataFrame(
+        {
+            "Id": [0, 1],
+            "TruckTypeMeter": [16.5, 12.5],
+            "TruckSizeMeterSquared": [40.25, 30.25],
+            "CapacityPerKg": [10000, 5000],
+            "CostPerKg": [3, 2],
+            "SpeedKmPerH": [40.0, 40.0],
+        }
+    )
+    distances = pd.DataFrame(
+        {
+            "Source": ["City_61", "City_61", "City_2"],
+            "Destination": ["City_2", "City_3", "City_3"],
+            "Distance(M)": [100000, 1200000, 1500],
+        }
+    )
+    paths = {
+        "order_csv": str(tmp_path / "orders.csv"),
+        "truck_csv": str(tmp_path / "trucks.csv"),
+        "distance_csv": str(tmp_path / "distances.csv"),
+    }
+    orders.to_csv(paths["order_csv"], index=False)
+    trucks.to_csv(paths["truck_csv"], index=False)
+    distances.to_csv(paths["distance_csv"], index=False)
+    return paths
+
+
+def test_load_problem_data_from_cache(source_files, tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    parsed = load_problem_data(**source_files, cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 1
+
+    def fail_read_csv(*args, **kwargs):
+        raise AssertionError("cache hit must not parse the CSV files")
+
+    monkeypatch.setattr(pd, "read_csv", fail_read_csv)
+    cached = load_problem_data(**source_files, cache_dir=cache_dir)
+
+    assert [d.model_dump() for d in cached.demands] == [d.model_dump() for d in parsed.demands]
+    assert [o.model_dump() for o in cached.orders] == [o.model_dump() for o in parsed.orders]
+    assert [t.model_dump() for t in cached.trucks] == [t.model_dump() for t in parsed.trucks]
+    assert cached.factories == parsed.factories
+    assert cached.distances.to_dict() == parsed.distances.to_dict()
+
+
+def test_input_cache_key_changes_with_content_and_time_format(source_files):
+    key = input_cache_key(**source_files, time_format=config.ORDER_LARGE_DATE)
+
+    assert key == input_cache_key(**source_files, time_format=config.ORDER_LARGE_DATE)
+    assert key != input_cache_key(**source_files, time_format=config.ORDER_SMALL_DATE)
+
+    with open(source_files["truck_csv"], "a") as file:
+        file.write("2,9.6,20.93,2000,1,40.0\n")
+    assert key != input_cache_key(**source_files, time_format=config.ORDER_LARGE_DATE)
@@ -0,0 +1,62 @@
+import pandas as pd
+import pytest
+import config
+from src.data_model.problem_data import ProblemData
+from src.serializer.serialize_problem_data import create_problem_data_from_data_frames
+
+
+@pytest.fixture
+def order_df():
+    data = {
+        "Order_ID": ["1", "2"],
+        "Material_ID": ["101", "102"],
+        "Item_ID": ["500", "501"],
+        "Source": ["City_61", "City_61"],
+        "Destination": ["City_2", "City_3"],
+        "Available_Time": ["4/5/2022 23.59", "5/5/2022 23.59"],
+        "Deadline": ["4/11/2022 23.59", "3/5/2022 23.59"],
+        "Danger_Type": ["type_1", "non_danger"],
+        "Area": [15.5, 20.0],
+        "Weight": [120.0, 80.0],
+    }
+    return pd.DataFrame(data)
+
+
+@pytest.fixture
+def truck_df():
+    data = {
+        "Id": [0, 1],
+        "TruckTypeMeter": [16.5, 12.5],
+        "TruckSizeMeterSquared": [40.25, 30.25],
+        "CapacityPerKg": [10000, 5000],
+        "CostPerKg": [3, 2],
+        "SpeedKmPerH": [40.0, 40.0],
+    }
+    return pd.DataFrame(data)
+
+
+@pytest.fixture
+def distance_df():
+    data = {
+        "Source": ["City_61", "City_61", "City_2", "City_3"],
+        "Destination": ["City_2", "City_3", "City_3", "City_2"],
+        "Distance(M)": [100000, 1200000, 1500, 1500],
+    }
+    return pd.DataFrame(data)
+
+
+def test_create_problem_data_from_data_frames(order_df, truck_df, distance_df):
+    problem = create_problem_data_from_data_frames(order_df, truck_df, distance_df)
+
+    assert isinstance(problem, ProblemData)
+    assert set(problem.factories) == {61, 2, 3}
+    assert problem.factories[config.DEPOT_ID].is_depot
+
+    # the second row has its deadline before its available time
+    assert [o.item_id for o in problem.orders] == ["500"]
+    assert [d.demand_id for d in problem.demands] == ["500"]
+    assert problem.demands[0].destination is problem.factories[2]
+    assert problem.demands[0].travel_days == 1
+
+    assert [t.id for t in problem.trucks] == [0, 1]
+    assert problem.distances[config.DEPOT_ID][3] == 1200.0
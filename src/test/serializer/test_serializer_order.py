@@ -3,7 +3,9 @@ from datetime import datetime
 import pytest
 from src.data_model.order import Order, DangerType
 from src.data_model.factory import Factory
-from src.serializer.serialize_order import create_order_from_data_frame,get_factory_list_from_order_data_frame
+from src.serializer.serialize_order import create_order_from_data_frame,get_factory_list_from_order_data_frame,normalize_order_data_frame
+from src.serializer.serialize_order import get_demands_from_order_data_frame, stream_demand_batches, stream_demand_batches_by_date, stream_demands
+from src.serializer.serialize_order import create_factory_from_order_data
 
 
 @pytest.fixture
@@ -83,3 +85,75 @@ def test_get_factory_list_from_order_data_frame():
 
     assert min(ids) == 1
     assert max(ids) == 4
+
+
+def test_normalize_order_data_frame_drops_invalid_rows(order_df):
+    df = pd.concat([order_df] * 3, ignore_index=True)
+    df.loc[1, "Available_Time"] = "not a date"
+    df.loc[2, "Deadline"] = "3/5/2022 23.59"
+
+    normalized = normalize_order_data_frame(df)
+
+    assert len(normalized) == 1
+    row = normalized.iloc[0]
+    assert row["available_time"] == datetime(2022, 5, 4, 23, 59)
+    assert row["destination_id"] == 2
+    assert row["danger_type"] == DangerType.TYPE_1
+    assert row["area_size"] == 15.5 / 10000
+    assert row["weight"] == 120.0 / 1000000
+
+
+def test_normalize_order_data_frame_invalid_danger_type(order_df):
+    order_df.loc[0, "Danger_Type"] = "radioactive"
+
+    with pytest.raises(ValueError):
+        normalize_order_data_frame(order_df)
+
+
+@pytest.fixture
+def order_csv(tmp_path):
+    data = {
+        "Order_ID": ["A1", "A2", "A3", "A4", "A5"],
+        "Material_ID": ["B-1", "B-2", "B-3", "B-4", "B-5"],
+        "Item_ID": ["P-1", "P-2", "P-3", "P-4", "P-5"],
+        "Source": ["City_61"] * 5,
+        "Destination": ["City_2", "City_3", "City_2", "City_3", "City_2"],
+        "Available_Time": ["5/5/2022 10.00", "4/5/2022 10.00", "bad", "5/5/2022 12.00", "4/5/2022 08.00"],
+        "Deadline": ["9/5/2022 10.00"] * 5,
+        "Danger_Type": ["type_1", "type_2", "type_1", "non_danger", "type_1"],
+        "Area": [10.0, 20.0, 30.0, 40.0, 50.0],
+        "Weight": [100.0, 200.0, 300.0, 400.0, 500.0],
+    }
+    path = tmp_path / "orders.csv"
+    pd.DataFrame(data).to_csv(path, index=False)
+    return str(path)
+
+
+def test_stream_demands_matches_full_read(order_csv):
+    distances = {61: {2: 100.0, 3: 1000.0}}
+    expected = get_demands_from_order_data_frame(pd.read_csv(order_csv), distances)
+
+    batches = list(stream_demand_batches(order_csv, distances, chunksize=2))
+    streamed = list(stream_demands(order_csv, distances, chunksize=2))
+
+    assert [len(b) for b in batches] == [2, 1, 1]
+    assert [d.model_dump() for d in streamed] == [d.model_dump() for d in expected]
+    # the factories are those of the ProblemData ingest
+    factories = create_factory_from_order_data(pd.read_csv(order_csv))
+    assert [d.destination for d in streamed] == [factories[d.destination.id] for d in streamed]
+    assert {d.destination for d in streamed} == {d.destination for d in expected}
+    # factories are shared across chunks
+    assert streamed[0].destination is streamed[3].destination
+
+
+def test_stream_demand_batches_by_date(order_csv):
+    distances = {61: {2: 100.0, 3: 1000.0}}
+
+    batches = list(stream_demand_batches_by_date(order_csv, distances, chunksize=2))
+
+    assert [(day.day, [d.demand_id for d in demands]) for day, demands in batches] == [
+        (4, ["P-2"]),
+        (5, ["P-1"]),
+        (5, ["P-4"]),
+        (4, ["P-5"]),
+    ]
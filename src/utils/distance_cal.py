@@ -1,4 +1,5 @@
 import math
+import numpy as np
 def compute_travel_days(distance_km: float, truck_speed_kmph: float,
                         load_hours: float = 0.5, unload_hours: float = 0.5,
                         work_hours_per_day: float = 24.0) -> int:
@@ -7,4 +8,14 @@ def compute_travel_days(distance_km: float, truck_speed_kmph: float,
     """
     travel_time_hours = distance_km / truck_speed_kmph
     total_hours = travel_time_hours + load_hours + unload_hours
-    return max(1, int(math.ceil(total_hours / work_hours_per_day)))
\ No newline at end of file
+    return max(1, int(math.ceil(total_hours / work_hours_per_day)))
+
+
+def compute_travel_days_array(distance_km: np.ndarray, truck_speed_kmph: float,
+                              load_hours: float = 0.5, unload_hours: float = 0.5,
+                              work_hours_per_day: float = 24.0) -> np.ndarray:
+    """
+    Vectorized compute_travel_days over an array of distances.
+    """
+    total_hours = np.asarray(distance_km, dtype=np.float64) / truck_speed_kmph + load_hours + unload_hours
+    return np.maximum(1, np.ceil(total_hours / work_hours_per_day)).astype(np.int64)